@@ -0,0 +1,113 @@
+"""
+Offline benchmark for the http acquisition backend (ACQUISITION_BACKEND=http): runs every fixture
+scenario against the DMM and Real-Debrid stand-ins, with as many movies in flight as the backend has
+queue workers, and reports throughput, per-movie latency (p50/p95), Real-Debrid calls per movie and
+whether each movie ended with the expected outcome.
+
+    python benchmarks/bench_acquisition.py --iterations 20
+    python benchmarks/bench_acquisition.py --rd-response-delay 0.2 --rate-limit 250 --concurrency 8
+    python benchmarks/bench_acquisition.py --no-instant-availability   # Real-Debrid's current behaviour
+
+Needs the packages from requirements.txt but neither Chrome nor network access. Exits with status 1
+if any movie ended with an unexpected outcome.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from bench_search import percentile
+from benchenv import import_seerrbridge
+from dmm_stub import load_scenarios, start_stub as start_dmm_stub
+from rd_stub import start_stub as start_rd_stub
+
+
+async def run(seerrbridge, movies, concurrency) -> list:
+    """Acquires every (scenario, iteration) with `concurrency` workers, like the queue's processing tasks."""
+    queue = asyncio.Queue()
+    for movie in movies:
+        queue.put_nowait(movie)
+    results = []
+
+    async def worker():
+        while not queue.empty():
+            iteration, scenario = queue.get_nowait()
+            started = time.perf_counter()
+            outcome = await seerrbridge.acquisition_backend.acquire(
+                scenario["movie_title"], imdb_id=(scenario.get("movie") or {}).get("id")
+            )
+            results.append({
+                "iteration": iteration,
+                "scenario": scenario["name"],
+                "seconds": time.perf_counter() - started,
+                "outcome": outcome.value,
+                "expected": scenario["expected"],
+                "correct": outcome.value == scenario["expected"],
+            })
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        await seerrbridge.http_clients.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10, help="Runs per scenario.")
+    parser.add_argument("--concurrency", type=int, default=4, help="RD_API_CONCURRENCY: movies in flight at once.")
+    parser.add_argument("--delay-scale", type=float, default=0.25, help="Multiplier for the DMM stand-in's delays.")
+    parser.add_argument("--rd-response-delay", type=float, default=0.05, help="Seconds before every Real-Debrid response.")
+    parser.add_argument("--rate-limit", type=int, default=250, help="Real-Debrid calls allowed per minute (0 for no limit).")
+    parser.add_argument("--no-instant-availability", action="store_true", help="Real-Debrid answers instantAvailability with nothing.")
+    parser.add_argument("--verbose", action="store_true", help="Show SeerrBridge's own log output.")
+    args = parser.parse_args()
+
+    scenarios = load_scenarios()
+    dmm = start_dmm_stub(delay_scale=args.delay_scale, scenarios=scenarios)
+    rd = start_rd_stub(
+        response_delay=args.rd_response_delay, rate_limit=args.rate_limit,
+        instant_availability=not args.no_instant_availability, scenarios=scenarios
+    )
+    seerrbridge = import_seerrbridge(
+        verbose=args.verbose, ACQUISITION_BACKEND="http", BROWSER_POOL_SIZE="0", RD_API_CONCURRENCY=args.concurrency,
+        DMM_BASE_URL=dmm.base_url, RD_API_BASE_URL=rd.base_url
+    )
+
+    movies = [(iteration, scenario) for iteration in range(args.iterations) for scenario in scenarios["scenarios"]]
+    print(f"DMM stand-in on {dmm.base_url} (delay scale {args.delay_scale:g}), Real-Debrid stand-in on {rd.base_url} "
+          f"({args.rd_response_delay:g}s per call, {args.rate_limit or 'no'} calls/min limit), "
+          f"{len(movies)} movies, concurrency {args.concurrency}\n")
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(run(seerrbridge, movies, seerrbridge.acquisition_backend.concurrency))
+    finally:
+        dmm.shutdown()
+        rd.shutdown()
+    elapsed = time.perf_counter() - started
+
+    header = f"{'scenario':<20}{'runs':>6}{'p50 s':>9}{'p95 s':>9}{'correct':>10}"
+    print(header)
+    print("-" * len(header))
+    for name in [scenario["name"] for scenario in scenarios["scenarios"]] + ["all"]:
+        runs = [result for result in results if name in ("all", result["scenario"])]
+        seconds = [result["seconds"] for result in runs]
+        correct = sum(result["correct"] for result in runs)
+        if name == "all":
+            print("-" * len(header))
+        print(f"{name:<20}{len(runs):>6}{percentile(seconds, 50):>9.2f}{percentile(seconds, 95):>9.2f}{f'{correct}/{len(runs)}':>10}")
+
+    print(f"\nThroughput: {len(results) / elapsed * 60:.1f} movies/min ({elapsed:.1f}s for {len(results)} movies)")
+    print("Real-Debrid calls per movie:")
+    for call, count in sorted(rd.calls.items()):
+        print(f"  {call:<36}{count / len(results):>6.2f}")
+
+    for result in results:
+        if not result["correct"]:
+            print(f"\nUnexpected outcome for {result['scenario']} (iteration {result['iteration']}): "
+                  f"{result['outcome']}, expected {result['expected']}")
+    return 0 if all(result["correct"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Micro-benchmark for the title normalization helpers and the matching decisions built on them.
+
+Runs extract_year, clean_title, normalize_title, replace_numbers_with_words and
+replace_words_with_numbers over every string of fixtures/title_corpus.jsonl and reports their
+throughput, then replays every request of the corpus through TitleMatcher and compares:
+
+  * the decisions with fixtures/title_golden.jsonl (which search result is clicked, which torrents
+    match and in which order, which red buttons count), so a faster pipeline can be shown to pick
+    exactly the same torrents, and
+  * the decisions with the corpus labels, as accuracy per title category. The corpus is generated by
+    build_title_corpus.py, so this measures the matcher on the generator's naming patterns rather
+    than on release names seen on DMM.
+
+    python benchmarks/bench_normalization.py
+    python benchmarks/bench_normalization.py --update-golden   # after an intended behaviour change
+
+Translations come from the corpus, so no network access is needed. Exits with status 1 if any
+decision differs from the golden file.
+"""
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from benchenv import import_seerrbridge
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+CORPUS = FIXTURES_DIR / "title_corpus.jsonl"
+GOLDEN = FIXTURES_DIR / "title_golden.jsonl"
+
+
+def load_jsonl(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def use_corpus_translations(seerrbridge, cases):
+    """Serves translations from the corpus instead of Google; unknown strings translate to themselves."""
+    translations = {}
+    for case in cases:
+        translations.update(case["translations"])
+    seerrbridge.title_translator._translate_chunk = lambda titles, target_lang: {
+        title: translations.get(title, title) for title in titles
+    }
+
+
+def decide(seerrbridge, case) -> dict:
+    """The matching decisions search_on_debrid would take for one request of the corpus."""
+    matcher = seerrbridge.TitleMatcher(case["request"])
+    search = matcher.rank_search_results([(result["title"], result["year_text"]) for result in case["search_results"]])
+    torrents = matcher.rank_torrents([release["title"] for release in case["releases"]])
+    red_buttons = matcher.rank_red_buttons([button["title"] for button in case["red_buttons"]])
+    return {
+        "request": case["request"],
+        "search": [match.index for match in search if match.matched][:1],
+        "torrents": [match.index for match in torrents if match.matched],
+        "red_buttons": sorted(match.index for match in red_buttons if match.matched),
+    }
+
+
+def measure(function, inputs, repeat):
+    """Calls function on every input repeat times; returns calls per second."""
+    for value in inputs:
+        function(value)  # Warm caches (translations) so only the normalization itself is timed
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for value in inputs:
+            function(value)
+    return len(inputs) * repeat / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per function.")
+    parser.add_argument("--update-golden", action="store_true", help="Record the current decisions as the golden file.")
+    parser.add_argument("--verbose", action="store_true", help="Show SeerrBridge's own log output.")
+    args = parser.parse_args()
+
+    seerrbridge = import_seerrbridge(verbose=args.verbose)
+    cases = load_jsonl(CORPUS)
+    use_corpus_translations(seerrbridge, cases)
+
+    releases = [release["title"] for case in cases for release in case["releases"]]
+    titles = list(dict.fromkeys(
+        [case["request"].split("(")[0].strip() for case in cases]
+        + [result["title"] for case in cases for result in case["search_results"]]
+        + [release.split(str(seerrbridge.extract_year(release)))[0].strip() for release in releases]
+    ))
+    cleaned = [seerrbridge.clean_title(title) for title in titles]
+    print(f"Corpus: {len(cases)} requests, {len(releases)} release names, {len(titles)} distinct titles\n")
+
+    functions = [
+        ("extract_year", seerrbridge.extract_year, releases),
+        ("clean_title", seerrbridge.clean_title, titles),
+        ("normalize_title", seerrbridge.normalize_title, titles),
+        ("replace_numbers_with_words", seerrbridge.replace_numbers_with_words, cleaned),
+        ("replace_words_with_numbers", seerrbridge.replace_words_with_numbers, cleaned),
+        ("TitleMatcher.title_variants", seerrbridge.TitleMatcher.title_variants, titles),
+    ]
+    print(f"{'function':<30}{'calls/s':>14}{'µs/call':>10}")
+    for name, function, inputs in functions:
+        rate = measure(function, inputs, args.repeat)
+        print(f"{name:<30}{rate:>14,.0f}{1e6 / rate:>10.1f}")
+
+    started = time.perf_counter()
+    decisions = [decide(seerrbridge, case) for case in cases]
+    elapsed = time.perf_counter() - started
+    print(f"{'full match per request':<30}{len(cases) / elapsed:>14,.0f}{1e6 * elapsed / len(cases):>10.1f}\n")
+
+    # Accuracy against the labels, per title category and candidate kind
+    tallies = defaultdict(lambda: [0, 0])
+    for case, decision in zip(cases, decisions):
+        for kind, candidates in (("search", case["search_results"]), ("torrents", case["releases"]), ("red_buttons", case["red_buttons"])):
+            matched = set(decision[kind])
+            for index, candidate in enumerate(candidates):
+                # For search results only the clicked one counts as matched
+                correct = (index in matched) == candidate["same_movie"]
+                for key in (case["category"], "all"):
+                    tallies[(key, kind)][0] += correct
+                    tallies[(key, kind)][1] += 1
+
+    categories = sorted({case["category"] for case in cases}) + ["all"]
+    print(f"{'accuracy':<16}{'search':>10}{'torrents':>10}{'red buttons':>13}")
+    for category in categories:
+        row = [tallies[(category, kind)] for kind in ("search", "torrents", "red_buttons")]
+        print(f"{category:<16}" + "".join(
+            f"{(correct / total if total else 1):>{width}.1%}" for (correct, total), width in zip(row, (10, 10, 13))
+        ))
+
+    if args.update_golden:
+        with open(GOLDEN, "w", encoding="utf-8") as file:
+            for decision in decisions:
+                file.write(json.dumps(decision, ensure_ascii=False) + "\n")
+        print(f"\nRecorded {len(decisions)} decisions in {GOLDEN}")
+        return 0
+
+    golden = load_jsonl(GOLDEN)
+    if len(golden) != len(decisions):
+        print(f"\nThe golden file has {len(golden)} requests but the corpus {len(decisions)}; run with --update-golden.")
+        return 1
+    changed = [(expected, actual) for expected, actual in zip(golden, decisions) if expected != actual]
+    picks_changed = sum(expected["torrents"][:1] != actual["torrents"][:1] for expected, actual in changed)
+    print(f"\nDecisions differing from golden: {len(changed)}/{len(decisions)} requests "
+          f"({picks_changed} with a different torrent picked)")
+    for expected, actual in changed[:10]:
+        print(f"  {actual['request']}: expected {expected}, got {actual}")
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
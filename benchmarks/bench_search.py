@@ -0,0 +1,168 @@
+"""
+Offline benchmark for search_on_debrid: runs every fixture scenario against the local DMM stand-in
+in headless Chrome and reports per-movie latency (p50/p95), WebDriver round trips, time per search
+stage, blocked requests and downloaded bytes, and whether each search ended with the expected outcome.
+
+    python benchmarks/bench_search.py --iterations 5
+    python benchmarks/bench_search.py --scenario many_boxes --delay-scale 0.5 --json results.json
+    python benchmarks/bench_search.py --block-profile off   # compare page loads without resource blocking
+    python benchmarks/bench_search.py --navigation search   # compare with always going through the title search
+    python benchmarks/bench_search.py --candidate-source network   # read DMM's API responses instead of the rendered page
+
+Needs Chrome and the packages from requirements.txt, but no network access (apart from the first
+ChromeDriver download by webdriver-manager). Exits with status 1 if any search ended with an
+unexpected outcome.
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from collections import defaultdict
+
+from benchenv import import_seerrbridge
+from dmm_stub import load_scenarios, start_stub
+
+
+class RoundTripCounter:
+    """Counts the WebDriver commands sent by a driver (element commands included)."""
+
+    def __init__(self, driver):
+        self.count = 0
+        execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.count += 1
+            return execute(driver_command, params)
+
+        driver.execute = counting_execute
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def stage_totals(histogram) -> dict:
+    """Returns {stage: (sum of seconds, number of samples)} from the SEARCH_STAGE_SECONDS histogram."""
+    totals = defaultdict(lambda: [0.0, 0])
+    for metric in histogram.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_sum"):
+                totals[sample.labels["stage"]][0] = sample.value
+            elif sample.name.endswith("_count"):
+                totals[sample.labels["stage"]][1] = sample.value
+    return {stage: tuple(values) for stage, values in totals.items()}
+
+
+def counter_total(counter) -> float:
+    """Sum of a Prometheus counter over all its label values."""
+    return sum(
+        sample.value for metric in counter.collect() for sample in metric.samples if sample.name.endswith("_total")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5, help="Runs per scenario.")
+    parser.add_argument("--scenario", action="append", help="Only run the named scenario (repeatable).")
+    parser.add_argument("--delay-scale", type=float, default=1.0, help="Multiplier for every delay in the fixtures.")
+    parser.add_argument("--response-delay", type=float, default=0.0, help="Extra seconds before every stand-in response.")
+    parser.add_argument("--block-profile", choices=("off", "media", "strict"), default="media",
+                        help="BROWSER_BLOCK_PROFILE of the browser under test.")
+    parser.add_argument("--navigation", choices=("imdb", "search"), default="imdb",
+                        help="Open movie pages directly by IMDb ID (when the scenario has one) or through the title search.")
+    parser.add_argument("--candidate-source", choices=("dom", "network"), default="dom",
+                        help="DMM_CANDIDATE_SOURCE of the browser under test.")
+    parser.add_argument("--json", help="Also write the raw results to this file.")
+    parser.add_argument("--verbose", action="store_true", help="Show SeerrBridge's own log output.")
+    args = parser.parse_args()
+
+    scenarios = load_scenarios()
+    selected = [scenario for scenario in scenarios["scenarios"] if not args.scenario or scenario["name"] in args.scenario]
+    if not selected:
+        parser.error(f"Unknown scenario; choose from {', '.join(s['name'] for s in scenarios['scenarios'])}")
+
+    stub = start_stub(delay_scale=args.delay_scale, response_delay=args.response_delay, scenarios=scenarios)
+    seerrbridge = import_seerrbridge(
+        verbose=args.verbose, DMM_BASE_URL=stub.base_url, HEADLESS_MODE="true", BROWSER_BLOCK_PROFILE=args.block_profile,
+        DMM_CANDIDATE_SOURCE=args.candidate_source
+    )
+
+    print(f"DMM stand-in on {stub.base_url}, delay scale {args.delay_scale:g}, blocking profile "
+          f"'{args.block_profile}', {args.navigation} navigation, candidates from {args.candidate_source}, "
+          f"{args.iterations} iteration(s)")
+    started = time.perf_counter()
+    driver = seerrbridge.create_browser_session()
+    print(f"Browser session ready in {time.perf_counter() - started:.2f}s\n")
+
+    seerrbridge.record_network_activity(driver)  # Leave the session's startup traffic out of the totals
+    blocked_before = counter_total(seerrbridge.BROWSER_BLOCKED_REQUESTS)
+    received_before = counter_total(seerrbridge.BROWSER_RECEIVED_BYTES)
+    counter = RoundTripCounter(driver)
+    results = []
+    stage_seconds = defaultdict(float)
+    try:
+        for iteration in range(args.iterations):
+            for scenario in selected:
+                before_stages = stage_totals(seerrbridge.SEARCH_STAGE_SECONDS)
+                counter.count = 0
+                started = time.perf_counter()
+                imdb_id = (scenario.get("movie") or {}).get("id") if args.navigation == "imdb" else None
+                outcome = seerrbridge.search_on_debrid(scenario["movie_title"], driver, imdb_id=imdb_id)
+                elapsed = time.perf_counter() - started
+                round_trips = counter.count
+                seerrbridge.record_network_activity(driver)
+                for stage, (seconds, _) in stage_totals(seerrbridge.SEARCH_STAGE_SECONDS).items():
+                    stage_seconds[stage] += seconds - before_stages.get(stage, (0.0, 0))[0]
+
+                outcome = getattr(outcome, "value", outcome)
+                results.append({
+                    "iteration": iteration,
+                    "scenario": scenario["name"],
+                    "seconds": elapsed,
+                    "round_trips": round_trips,
+                    "outcome": outcome,
+                    "expected": scenario["expected"],
+                    "correct": outcome == scenario["expected"],
+                })
+    finally:
+        driver.quit()
+        stub.shutdown()
+
+    header = f"{'scenario':<20}{'runs':>6}{'p50 s':>9}{'p95 s':>9}{'round trips':>13}{'correct':>10}"
+    print(header)
+    print("-" * len(header))
+    for name in [scenario["name"] for scenario in selected] + ["all"]:
+        runs = [result for result in results if name in ("all", result["scenario"])]
+        seconds = [result["seconds"] for result in runs]
+        round_trips = sum(result["round_trips"] for result in runs) / len(runs)
+        correct = sum(result["correct"] for result in runs)
+        if name == "all":
+            print("-" * len(header))
+        print(f"{name:<20}{len(runs):>6}{percentile(seconds, 50):>9.2f}{percentile(seconds, 95):>9.2f}"
+              f"{round_trips:>13.1f}{f'{correct}/{len(runs)}':>10}")
+
+    blocked = counter_total(seerrbridge.BROWSER_BLOCKED_REQUESTS) - blocked_before
+    received = counter_total(seerrbridge.BROWSER_RECEIVED_BYTES) - received_before
+    print(f"\nPer search: {blocked / len(results):.1f} blocked requests, {received / len(results) / 1024:.0f} KiB downloaded")
+
+    print("\nMean seconds per search by stage:")
+    for stage, seconds in sorted(stage_seconds.items(), key=lambda item: -item[1]):
+        print(f"  {stage:<22}{seconds / len(results):>8.3f}")
+
+    for result in results:
+        if not result["correct"]:
+            print(f"\nUnexpected outcome for {result['scenario']} (iteration {result['iteration']}): "
+                  f"{result['outcome']}, expected {result['expected']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"delay_scale": args.delay_scale, "navigation": args.navigation, "candidate_source": args.candidate_source, "results": results}, file, indent=2)
+
+    return 0 if all(result["correct"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""Imports seerrbridge for the benchmarks with a throwaway database and placeholder credentials."""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_seerrbridge(verbose=False, **environment):
+    """
+    Configures the environment SeerrBridge reads at import time, imports it and returns the module.
+    Keyword arguments are set as environment variables; real credentials already in the environment
+    are kept. Logs go to stderr (errors only unless verbose) and seerbridge.log to a temporary directory.
+    """
+    workdir = tempfile.mkdtemp(prefix="seerrbridge-bench-")
+    os.environ["DATABASE_PATH"] = os.path.join(workdir, "seerrbridge.db")
+    os.environ.update({name: str(value) for name, value in environment.items()})
+    for name, value in {
+        "RD_ACCESS_TOKEN": json.dumps({"value": "benchmark", "expiry": 4102444800}),
+        "OVERSEERR_BASE": "http://127.0.0.1:9",
+        "OVERSEERR_API_KEY": "benchmark",
+        "TRAKT_API_KEY": "benchmark",
+        "REFRESH_INTERVAL_MINUTES": "120",
+        "TORRENT_FILTER_REGEX": "^(?!.*【.*?】)(?!.*[\\u0400-\\u04FF])(?!.*\\[esp\\]).*",
+    }.items():
+        os.environ.setdefault(name, value)
+
+    sys.path.insert(0, str(REPO_ROOT))
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import seerrbridge
+    finally:
+        os.chdir(cwd)
+
+    from loguru import logger
+    if not verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="ERROR")
+    return seerrbridge
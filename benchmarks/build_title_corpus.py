@@ -0,0 +1,273 @@
+"""
+Builds benchmarks/fixtures/title_corpus.jsonl, the corpus for bench_normalization.py.
+
+Every line is one request ("Title (Year)") with the DMM search results, torrent release names and
+red-button titles a search for it could run into, each labelled with whether it is the requested
+movie. The corpus is synthetic: release names are generated from templates that follow the usual
+scene/P2P naming schemes, not collected from DMM, and cover non-English, numeric, sequel, ellipsis
+and year-in-title cases. Non-ASCII strings come with their English translation so
+the benchmark runs offline.
+
+The output is deterministic for a given --seed; regenerate the golden file after changing it:
+
+    python benchmarks/build_title_corpus.py
+    python benchmarks/bench_normalization.py --update-golden
+"""
+import argparse
+import json
+import random
+import re
+from pathlib import Path
+
+OUTPUT = Path(__file__).resolve().parent / "fixtures" / "title_corpus.jsonl"
+
+# (request title, year, category, alternative names used by releases, English translation of non-ASCII names)
+MOVIES = [
+    ("Inception", 2010, "plain", [], {}),
+    ("Interstellar", 2014, "plain", [], {}),
+    ("The Matrix", 1999, "plain", [], {}),
+    ("Gladiator", 2000, "plain", [], {}),
+    ("Heat", 1995, "plain", [], {}),
+    ("Arrival", 2016, "plain", [], {}),
+    ("Parasite", 2019, "non_english", ["기생충", "Gisaengchung"], {"기생충": "Parasite"}),
+    ("Amélie", 2001, "non_english", ["Le Fabuleux Destin d'Amélie Poulain", "Amelie"],
+     {"Amélie": "Amelie", "Le Fabuleux Destin d'Amélie Poulain": "The Fabulous Destiny of Amélie Poulain"}),
+    ("Spirited Away", 2001, "non_english", ["千と千尋の神隠し", "Sen to Chihiro no Kamikakushi"], {"千と千尋の神隠し": "Spirited Away"}),
+    ("Crouching Tiger, Hidden Dragon", 2000, "non_english", ["卧虎藏龙", "Wo Hu Cang Long"], {"卧虎藏龙": "Crouching Tiger, Hidden Dragon"}),
+    ("Life Is Beautiful", 1997, "non_english", ["La vita è bella"], {"La vita è bella": "Life is beautiful"}),
+    ("Pan's Labyrinth", 2006, "non_english", ["El laberinto del fauno"], {}),
+    ("Das Boot", 1981, "non_english", ["The Boat"], {}),
+    ("The Lives of Others", 2006, "non_english", ["Das Leben der Anderen"], {}),
+    ("Léon: The Professional", 1994, "non_english", ["Leon The Professional", "Léon"],
+     {"Léon: The Professional": "Leon: The Professional", "Léon": "Leon"}),
+    ("Oldboy", 2003, "non_english", ["올드보이", "Oldeuboi"], {"올드보이": "Oldboy"}),
+    ("Shoplifters", 2018, "non_english", ["万引き家族", "Manbiki Kazoku"], {"万引き家族": "Shoplifters"}),
+    ("Leviathan", 2014, "non_english", ["Левиафан"], {"Левиафан": "Leviathan"}),
+    ("The Intouchables", 2011, "non_english", ["Intouchables"], {}),
+    ("Roma", 2018, "non_english", [], {}),
+    ("Cidade de Deus", 2002, "non_english", ["City of God"], {}),
+    ("Y Tu Mamá También", 2001, "non_english", ["Y Tu Mama Tambien", "And Your Mother Too"],
+     {"Y Tu Mamá También": "And Your Mom Too"}),
+    ("Ocean's Eleven", 2001, "numeric", ["Oceans 11", "Ocean's 11"], {}),
+    ("Ocean's Twelve", 2004, "numeric", ["Oceans 12"], {}),
+    ("Ocean's Thirteen", 2007, "numeric", ["Oceans 13"], {}),
+    ("2 Fast 2 Furious", 2003, "numeric", ["Two Fast Two Furious"], {}),
+    ("12 Monkeys", 1995, "numeric", ["Twelve Monkeys"], {}),
+    ("Three Billboards Outside Ebbing, Missouri", 2017, "numeric", ["3 Billboards Outside Ebbing Missouri"], {}),
+    ("Se7en", 1995, "numeric", ["Seven"], {}),
+    ("The Hateful Eight", 2015, "numeric", ["The Hateful 8"], {}),
+    ("District 9", 2009, "numeric", ["District Nine"], {}),
+    ("10 Things I Hate About You", 1999, "numeric", ["Ten Things I Hate About You"], {}),
+    ("13 Going on 30", 2004, "numeric", ["Thirteen Going on Thirty"], {}),
+    ("Apollo 13", 1995, "numeric", [], {}),
+    ("8 Mile", 2002, "numeric", ["Eight Mile"], {}),
+    ("Fantastic Four", 2005, "numeric", ["Fantastic 4"], {}),
+    ("One Flew Over the Cuckoo's Nest", 1975, "numeric", ["1 Flew Over the Cuckoos Nest"], {}),
+    ("Seven Samurai", 1954, "numeric", ["7 Samurai", "Shichinin no Samurai"], {}),
+    ("The Magnificent Seven", 2016, "numeric", ["The Magnificent 7"], {}),
+    ("Toy Story 3", 2010, "sequel", ["Toy Story Three"], {}),
+    ("Toy Story 4", 2019, "sequel", [], {}),
+    ("Rocky II", 1979, "sequel", ["Rocky 2"], {}),
+    ("The Godfather Part II", 1974, "sequel", ["The Godfather Part 2", "The Godfather 2"], {}),
+    ("Terminator 2: Judgment Day", 1991, "sequel", ["Terminator 2 Judgement Day", "T2 Judgment Day"], {}),
+    ("Dune: Part Two", 2024, "sequel", ["Dune Part 2", "Dune 2"], {}),
+    ("Mission: Impossible - Fallout", 2018, "sequel", ["Mission Impossible Fallout", "Mission Impossible 6"], {}),
+    ("John Wick: Chapter 4", 2023, "sequel", ["John Wick 4", "John Wick Chapter Four"], {}),
+    ("Shrek 2", 2004, "sequel", ["Shrek Two"], {}),
+    ("Alien 3", 1992, "sequel", ["Alien³"], {"Alien³": "Alien 3"}),
+    ("Spider-Man 2", 2004, "sequel", ["Spider Man 2", "SpiderMan 2"], {}),
+    ("The Dark Knight Rises", 2012, "sequel", [], {}),
+    ("Back to the Future Part III", 1990, "sequel", ["Back to the Future 3", "Back to the Future Part 3"], {}),
+    ("Avengers: Endgame", 2019, "sequel", ["Avengers Endgame"], {}),
+    ("Guardians of the Galaxy Vol. 2", 2017, "sequel", ["Guardians of the Galaxy Vol 2", "Guardians of the Galaxy 2"], {}),
+    ("Kill Bill: Vol. 1", 2003, "sequel", ["Kill Bill Vol 1", "Kill Bill Volume 1"], {}),
+    ("Kill Bill: Vol. 2", 2004, "sequel", ["Kill Bill Vol 2", "Kill Bill Volume 2"], {}),
+    ("...And Justice for All", 1979, "ellipsis", ["And Justice for All"], {}),
+    ("Tick, Tick... Boom!", 2021, "ellipsis", ["Tick Tick Boom"], {}),
+    ("Dr. Strangelove or: How I Learned to Stop Worrying and Love the Bomb", 1964, "ellipsis", ["Dr Strangelove"], {}),
+    ("What's Eating Gilbert Grape", 1993, "ellipsis", ["Whats Eating Gilbert Grape"], {}),
+    ("Once Upon a Time… in Hollywood", 2019, "ellipsis", ["Once Upon a Time in Hollywood", "Once Upon a Time... in Hollywood"],
+     {}),
+    ("Crazy, Stupid, Love.", 2011, "ellipsis", ["Crazy Stupid Love"], {}),
+    ("Everything Everywhere All at Once", 2022, "ellipsis", [], {}),
+    ("Borat", 2006, "ellipsis", ["Borat Cultural Learnings of America for Make Benefit Glorious Nation of Kazakhstan"], {}),
+    ("Birdman or (The Unexpected Virtue of Ignorance)", 2014, "ellipsis", ["Birdman"], {}),
+    ("1917", 2019, "year_in_title", [], {}),
+    ("2012", 2009, "year_in_title", [], {}),
+    ("1984", 1984, "year_in_title", ["Nineteen Eighty-Four"], {}),
+    ("Blade Runner 2049", 2017, "year_in_title", [], {}),
+    ("Wonder Woman 1984", 2020, "year_in_title", ["WW84"], {}),
+    ("2001: A Space Odyssey", 1968, "year_in_title", ["2001 A Space Odyssey"], {}),
+    ("2010: The Year We Make Contact", 1984, "year_in_title", ["2010 The Year We Make Contact", "2010"], {}),
+    ("Escape from New York", 1981, "plain", [], {}),
+    ("Summer of 84", 2018, "year_in_title", ["Summer of '84"], {}),
+    ("The Purge: Election Year", 2016, "year_in_title", [], {}),
+    ("1408", 2007, "year_in_title", [], {}),
+    ("Freddy vs. Jason", 2003, "punctuation", ["Freddy vs Jason"], {}),
+    ("WALL·E", 2008, "punctuation", ["WALL-E", "Wall E"], {"WALL·E": "WALL-E"}),
+    ("Mr. & Mrs. Smith", 2005, "punctuation", ["Mr and Mrs Smith", "Mr & Mrs Smith"], {}),
+    ("Face/Off", 1997, "punctuation", ["Face Off", "FaceOff"], {}),
+    ("Schindler's List", 1993, "punctuation", ["Schindlers List"], {}),
+    ("Harry Potter and the Sorcerer's Stone", 2001, "punctuation",
+     ["Harry Potter and the Philosopher's Stone", "Harry Potter and the Sorcerers Stone"], {}),
+    ("Star Wars: Episode IV - A New Hope", 1977, "punctuation", ["Star Wars", "Star Wars A New Hope"], {}),
+    ("Pokémon Detective Pikachu", 2019, "punctuation", ["Pokemon Detective Pikachu"],
+     {"Pokémon Detective Pikachu": "Pokemon Detective Pikachu"}),
+    ("Fast & Furious 6", 2013, "punctuation", ["Fast and Furious 6", "Furious 6"], {}),
+    ("Monsters, Inc.", 2001, "punctuation", ["Monsters Inc"], {}),
+    ("The Lord of the Rings: The Return of the King", 2003, "punctuation", ["LOTR The Return of the King"], {}),
+    ("Dune", 2021, "remake", [], {}),
+    ("Dune", 1984, "remake", [], {}),
+    ("The Thing", 1982, "remake", [], {}),
+    ("The Thing", 2011, "remake", [], {}),
+    ("A Star Is Born", 2018, "remake", [], {}),
+    ("Ghostbusters", 2016, "remake", ["Ghostbusters Answer the Call"], {}),
+    ("Total Recall", 1990, "remake", [], {}),
+    ("Total Recall", 2012, "remake", [], {}),
+    ("The Lion King", 2019, "remake", [], {}),
+    ("RoboCop", 1987, "remake", ["Robocop"], {}),
+    ("Up", 2009, "short", [], {}),
+    ("It", 2017, "short", [], {}),
+    ("Us", 2019, "short", [], {}),
+    ("M", 1931, "short", [], {}),
+    ("Her", 2013, "short", [], {}),
+    ("Elf", 2003, "short", [], {}),
+    ("Jaws", 1975, "short", [], {}),
+    ("Coco", 2017, "short", [], {}),
+    ("Alien", 1979, "plain", [], {}),
+    ("Aliens", 1986, "sequel", [], {}),
+    ("Jurassic Park", 1993, "plain", [], {}),
+    ("The Lost World: Jurassic Park", 1997, "sequel", ["Jurassic Park 2", "The Lost World"], {}),
+    ("No Country for Old Men", 2007, "plain", [], {}),
+    ("There Will Be Blood", 2007, "plain", [], {}),
+    ("Eternal Sunshine of the Spotless Mind", 2004, "plain", [], {}),
+    ("Mad Max: Fury Road", 2015, "plain", ["Mad Max Fury Road"], {}),
+    ("Everything Must Go", 2010, "plain", [], {}),
+    ("Knives Out", 2019, "plain", [], {}),
+    ("Glass Onion: A Knives Out Mystery", 2022, "sequel", ["Glass Onion"], {}),
+]
+
+RESOLUTIONS = ["2160p", "1080p", "720p", "480p"]
+SOURCES = ["BluRay", "WEB-DL", "WEBRip", "BDRip", "HDTV", "UHD.BluRay", "AMZN.WEB-DL", "NF.WEB-DL", "DVDRip", "REMUX"]
+CODECS = ["x264", "x265", "HEVC", "H.264", "H.265", "AV1", "XviD"]
+AUDIO = ["DTS", "DDP5.1", "AAC", "TrueHD.7.1.Atmos", "AC3", "FLAC", "DTS-HD.MA.5.1"]
+GROUPS = ["SPARKS", "RARBG", "YIFY", "FGT", "EVO", "TERMINAL", "AMIABLE", "GECKOS", "NTb", "CtrlHD", "DON", "FLUX", "TGx", "PSA"]
+EXTRAS = ["", "", "", "EXTENDED", "REMASTERED", "Directors.Cut", "UNRATED", "IMAX", "PROPER", "REPACK", "MULTi", "iTALiAN", "FRENCH"]
+
+
+def dotted(title):
+    title = re.sub(r"[:,!?/]", "", title).replace("&", "and").replace(" - ", " ")
+    return re.sub(r"\s+", ".", title.strip())
+
+
+def release_name(rng, title, year):
+    """One release name for a title and year in a random naming scheme."""
+    resolution = rng.choice(RESOLUTIONS)
+    source = rng.choice(SOURCES)
+    codec = rng.choice(CODECS)
+    group = rng.choice(GROUPS)
+    extra = rng.choice(EXTRAS)
+    scheme = rng.randrange(5)
+    if scheme == 0:
+        parts = [dotted(title), str(year), extra, resolution, source, codec]
+        return ".".join(part for part in parts if part) + f"-{group}"
+    if scheme == 1:
+        return f"{title} ({year}) [{resolution}] [{source.replace('.', ' ')}] [YTS.MX]"
+    if scheme == 2:
+        return f"{title} {year} {resolution} {source} {rng.choice(AUDIO)} {codec}-{group}"
+    if scheme == 3:
+        return f"{dotted(title).lower()}.{year}.{resolution}.{codec.lower()}-{group.lower()}"
+    return f"[{group}] {title} - {year} - {resolution} {codec} {rng.choice(AUDIO)}"
+
+
+def red_button_name(rng, title, year):
+    """Red-button boxes show the library entry, usually as 'Title (Year) ...'."""
+    return f"{title} ({year}) {rng.choice(RESOLUTIONS)} {rng.choice(SOURCES)}"
+
+
+def base_of(name, year):
+    """The part of a release name the matcher translates (everything before the year)."""
+    return name.split(str(year))[0].strip()
+
+
+def build_case(rng, movie, others):
+    title, year, category, aliases, translations = movie
+    names = [title] + aliases
+    case_translations = {}
+
+    releases = []
+    for _ in range(rng.randint(14, 20)):
+        name = rng.choice(names)
+        releases.append({"title": release_name(rng, name, year), "same_movie": True})
+    # Off-by-one years are common (festival vs. theatrical release) and still the same movie
+    releases.append({"title": release_name(rng, title, year + rng.choice((-1, 1))), "same_movie": True})
+
+    negatives = []
+    negatives.append(release_name(rng, title, year + rng.choice((-7, -4, 3, 5, 9))))  # remake or different movie
+    negatives.append(release_name(rng, f"{title} {rng.choice(('2', 'II', 'Part Two', 'Returns'))}", year + rng.randint(2, 5)))
+    negatives.append(release_name(rng, f"{title} Making Of", year + rng.randint(2, 6)))
+    for other in rng.sample(others, 6):
+        other_title, other_year = other[0], other[1]
+        if other_title == title and abs(other_year - year) <= 1:
+            continue
+        negatives.append(release_name(rng, rng.choice([other_title] + other[3]), other_year))
+    releases += [{"title": name, "same_movie": False} for name in negatives]
+    rng.shuffle(releases)
+
+    search_results = [{"title": title, "year_text": str(year), "same_movie": True}]
+    search_results.append({"title": f"{title} 2", "year_text": str(year + rng.randint(2, 4)), "same_movie": False})
+    search_results.append({"title": title, "year_text": str(year + rng.choice((-12, -5, 6, 15))), "same_movie": False})
+    for other in rng.sample(others, 3):
+        if other[0] == title:
+            continue
+        search_results.append({"title": other[0], "year_text": str(other[1]), "same_movie": False})
+    rng.shuffle(search_results)
+
+    red_buttons = [{"title": red_button_name(rng, rng.choice(names), year), "same_movie": True}]
+    other = rng.choice(others)
+    if other[0] != title:
+        red_buttons.append({"title": red_button_name(rng, other[0], other[1]), "same_movie": False})
+
+    # English translations for every non-ASCII string the matcher will translate
+    for source, english in translations.items():
+        case_translations[source] = english
+    for entry in releases:
+        base = base_of(entry["title"], year)
+        for source, english in translations.items():
+            if source in base and not base.isascii():
+                case_translations[base] = base.replace(source, english)
+    for entry in red_buttons:
+        base = entry["title"].split("(")[0].strip()
+        for source, english in translations.items():
+            if source in base and not base.isascii():
+                case_translations[base] = base.replace(source, english)
+
+    return {
+        "request": f"{title} ({year})",
+        "category": category,
+        "search_results": search_results,
+        "releases": releases,
+        "red_buttons": red_buttons,
+        "translations": case_translations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=1409)
+    parser.add_argument("--rounds", type=int, default=2, help="Cases generated per movie.")
+    parser.add_argument("--output", default=str(OUTPUT))
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = [build_case(rng, movie, MOVIES) for _ in range(args.rounds) for movie in MOVIES]
+    with open(args.output, "w", encoding="utf-8") as file:
+        for case in cases:
+            file.write(json.dumps(case, ensure_ascii=False) + "\n")
+
+    releases = sum(len(case["releases"]) for case in cases)
+    print(f"Wrote {len(cases)} requests with {releases} release names to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
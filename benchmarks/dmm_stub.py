@@ -0,0 +1,187 @@
+"""
+Local stand-in for debridmediamanager.com, serving the recorded pages in fixtures/ so search_on_debrid
+can be benchmarked without network access.
+
+    python benchmarks/dmm_stub.py --port 8778 --delay-scale 1.0
+
+Point SeerrBridge at it with DMM_BASE_URL=http://127.0.0.1:8778. Like DMM, /api/torrents/movie only answers
+requests that carry a valid dmmProblemKey/solution pair and answers 403 otherwise.
+"""
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+# Stand-in payload for posters and fonts; its size is what a blocked request saves
+ASSET_BODY = bytes(48 * 1024)
+PROBLEM_SALT = "debridmediamanager.com%%fe7#td00rA3vHz%VmI"
+PROBLEM_MAX_AGE = 300  # Seconds a dmmProblemKey stays valid
+
+
+def cyrb53(text) -> str:
+    mask = 0xFFFFFFFF
+    h1, h2 = 0xDEADBEEF, 0x41C6CE57
+    for char in text:
+        h1 = ((h1 ^ ord(char)) * 2654435761) & mask
+        h2 = ((h2 ^ ord(char)) * 1597334677) & mask
+    h1 = (((h1 ^ (h1 >> 16)) * 2246822507) & mask) ^ (((h2 ^ (h2 >> 13)) * 3266489909) & mask)
+    h2 = (((h2 ^ (h2 >> 16)) * 2246822507) & mask) ^ (((h1 ^ (h1 >> 13)) * 3266489909) & mask)
+    return format(4294967296 * (0x1FFFFF & h2) + h1, "x")
+
+
+def valid_solution(problem_key, solution) -> bool:
+    """DMM's check: the key is '<token>-<unix time>', recent, and solved against the salted token."""
+    token, _, timestamp = problem_key.rpartition("-")
+    if not token or not timestamp.isdigit() or abs(time.time() - int(timestamp)) > PROBLEM_MAX_AGE:
+        return False
+    first, second = cyrb53(problem_key), cyrb53(f"{PROBLEM_SALT}-{token}")
+    half = len(first) // 2
+    expected = "".join(a + b for a, b in zip(first[:half], second[:half])) + second[half:][::-1] + first[half:][::-1]
+    return solution == expected
+
+
+def load_scenarios(path=FIXTURES_DIR / "scenarios.json") -> dict:
+    with open(path, encoding="utf-8") as file:
+        scenarios = json.load(file)
+    # Torrents without a recorded hash get a stable made-up one
+    for scenario in scenarios["scenarios"]:
+        for torrent in (scenario.get("movie") or {}).get("torrents", []):
+            torrent.setdefault("hash", hashlib.sha1(torrent["title"].encode("utf-8")).hexdigest())
+    return scenarios
+
+
+def size_in_mb(size) -> float:
+    """'10.9 GB' -> 11161.6; DMM's API reports torrent sizes in MB."""
+    number, unit = re.match(r"([\d.]+)\s*([KMGT]?B)", size).groups()
+    return round(float(number) * 1024 ** ("KMGT".index(unit[0]) - 1 if unit != "B" else -2), 1)
+
+
+class DMMStubServer(ThreadingHTTPServer):
+    """Serves the fixture pages; every delay in the fixtures is multiplied by delay_scale."""
+
+    daemon_threads = True
+
+    def __init__(self, address, scenarios, delay_scale=1.0, response_delay=0.0):
+        super().__init__(address, DMMStubHandler)
+        self.scenarios = scenarios
+        self.delay_scale = delay_scale
+        self.response_delay = response_delay
+        self.by_title = {scenario["movie_title"]: scenario for scenario in scenarios["scenarios"]}
+        self.by_movie_id = {
+            scenario["movie"]["id"]: scenario for scenario in scenarios["scenarios"] if scenario.get("movie")
+        }
+        self.page_template = (FIXTURES_DIR / "page.html").read_text(encoding="utf-8")
+        self.script = (FIXTURES_DIR / "dmm.js").read_bytes()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delays(self, scenario=None) -> dict:
+        delays = dict(self.scenarios.get("delays", {}))
+        if scenario:
+            delays.update(scenario.get("delays", {}))
+        return {name: seconds * self.delay_scale for name, seconds in delays.items()}
+
+    def render(self, page, scenario=None, **data) -> bytes:
+        fixture = {"page": page, "delays": self.delays(scenario), **data}
+        # Keep "</script>" in fixture data from closing the inline script
+        payload = json.dumps(fixture, ensure_ascii=False).replace("</", "<\\/")
+        return self.page_template.replace("{{FIXTURE}}", payload).encode("utf-8")
+
+
+class DMMStubHandler(BaseHTTPRequestHandler):
+    server: DMMStubServer
+
+    def do_GET(self):
+        if self.server.response_delay:
+            time.sleep(self.server.response_delay)
+
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == "/dmm.js":
+            return self.respond(200, self.server.script, "application/javascript")
+        if url.path in ("/", "/library"):
+            return self.respond(200, self.server.render(url.path.strip("/") or "home"))
+        if url.path == "/search":
+            query = urllib.parse.parse_qs(url.query).get("query", [""])[0]
+            scenario = self.server.by_title.get(query)
+            results = scenario["results"] if scenario else []
+            return self.respond(200, self.server.render("search", scenario, results=results))
+        if url.path.startswith(("/posters/", "/fonts/")):
+            # Static assets arrive after the fixture's asset delay, like posters from a slow image CDN
+            time.sleep(self.server.delays().get("asset", 0))
+            content_type = "font/woff2" if url.path.endswith(".woff2") else "image/jpeg"
+            return self.respond(200, ASSET_BODY, content_type)
+        if url.path == "/api/torrents/movie":
+            # DMM's torrent list for a movie; the time DMM takes before it shows its "Checking RD availability" status
+            query = urllib.parse.parse_qs(url.query)
+            if not valid_solution(query.get("dmmProblemKey", [""])[0], query.get("solution", [""])[0]):
+                return self.respond_json({"errorMessage": "Authentication not provided"}, 403)
+            scenario = self.server.by_movie_id.get(query.get("imdbId", [""])[0])
+            time.sleep(self.server.delays(scenario).get("movie_status", 0))
+            torrents = scenario["movie"]["torrents"] if scenario else []
+            results = [{"title": torrent["title"], "fileSize": size_in_mb(torrent["size"]), "hash": torrent["hash"]} for torrent in torrents]
+            return self.respond_json({"results": results, "errorMessage": ""})
+        if url.path.startswith("/movie/"):
+            scenario = self.server.by_movie_id.get(url.path.rsplit("/", 1)[-1])
+            if scenario is None:
+                return self.respond(404, b"Not found", "text/plain")
+            return self.respond(200, self.server.render("movie", scenario, movie=scenario["movie"]))
+        return self.respond(404, b"Not found", "text/plain")
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        if url.path == "/api/availability/check":
+            # Which of the asked hashes Real-Debrid has cached, after the fixture's availability delay
+            scenario = self.server.by_movie_id.get(body.get("imdbId"))
+            time.sleep(self.server.delays(scenario).get("availability", 0))
+            asked = set(body.get("hashes") or [])
+            torrents = scenario["movie"]["torrents"] if scenario else []
+            available = [{"hash": torrent["hash"]} for torrent in torrents if torrent.get("cached") and torrent["hash"] in asked]
+            return self.respond_json({"available": available})
+        return self.respond(404, b"Not found", "text/plain")
+
+    def respond_json(self, data, status=200):
+        return self.respond(status, json.dumps(data).encode("utf-8"), "application/json")
+
+    def respond(self, status, body, content_type="text/html; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+def start_stub(host="127.0.0.1", port=0, delay_scale=1.0, response_delay=0.0, scenarios=None) -> DMMStubServer:
+    """Starts the stand-in on a background thread and returns the running server (port 0 picks a free port)."""
+    server = DMMStubServer((host, port), scenarios or load_scenarios(), delay_scale, response_delay)
+    threading.Thread(target=server.serve_forever, name="dmm-stub", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8778)
+    parser.add_argument("--delay-scale", type=float, default=1.0, help="Multiplier for every delay in the fixtures.")
+    parser.add_argument("--response-delay", type=float, default=0.0, help="Extra seconds before every response.")
+    args = parser.parse_args()
+
+    stub = DMMStubServer((args.host, args.port), load_scenarios(), args.delay_scale, args.response_delay)
+    print(f"Serving DMM fixtures on {stub.base_url}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,179 @@
+// Stand-in for the parts of the Debrid Media Manager UI that SeerrBridge drives.
+// Markup, texts and class names mirror debridmediamanager.com; window.FIXTURE is injected by dmm_stub.py.
+(function () {
+    const fixture = window.FIXTURE || {};
+    const delays = fixture.delays || {};
+    const app = () => document.getElementById('app');
+
+    function later(seconds, callback) {
+        setTimeout(callback, (seconds || 0) * 1000);
+    }
+
+    function element(tag, attributes, children) {
+        const node = document.createElement(tag);
+        Object.entries(attributes || {}).forEach(([name, value]) => node.setAttribute(name, value));
+        (children || []).forEach((child) => node.append(child));
+        return node;
+    }
+
+    // DMM's API wants a dmmProblemKey and its solution on every call
+    function cyrb53(text) {
+        let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+        for (let i = 0; i < text.length; i++) {
+            const code = text.charCodeAt(i);
+            h1 = Math.imul(h1 ^ code, 2654435761);
+            h2 = Math.imul(h2 ^ code, 1597334677);
+        }
+        h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+        h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+        return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(16);
+    }
+
+    function proofOfWork() {
+        const token = Math.random().toString(16).slice(2, 14);
+        const problemKey = token + '-' + Math.floor(Date.now() / 1000);
+        const first = cyrb53(problemKey);
+        const second = cyrb53('debridmediamanager.com%%fe7#td00rA3vHz%VmI-' + token);
+        const half = Math.floor(first.length / 2);
+        let solution = '';
+        for (let i = 0; i < half; i++) solution += first[i] + second[i];
+        solution += second.slice(half).split('').reverse().join('') + first.slice(half).split('').reverse().join('');
+        return 'dmmProblemKey=' + encodeURIComponent(problemKey) + '&solution=' + solution;
+    }
+
+    function setStatus(text) {
+        let status = document.querySelector("div[role='status']");
+        if (!status) {
+            status = element('div', {role: 'status', 'aria-live': 'polite', class: 'fixed top-2 right-2 text-sm'});
+            document.body.append(status);
+        }
+        status.textContent = text;
+    }
+
+    function renderHome() {
+        const settings = element('div', {id: 'settings', class: 'hidden p-2 bg-gray-800'}, [
+            element('label', {for: 'dmm-default-torrents-filter'}, ['Default torrents filter']),
+            element('input', {id: 'dmm-default-torrents-filter', type: 'text'})
+        ]);
+        const input = settings.querySelector('input');
+        input.value = localStorage.getItem('settings:defaultTorrentsFilter') || '';
+        input.addEventListener('input', () => localStorage.setItem('settings:defaultTorrentsFilter', input.value));
+
+        const toggle = element('span', {class: 'cursor-pointer'}, ['⚙️ Settings']);
+        toggle.addEventListener('click', () => settings.classList.toggle('hidden'));
+
+        const login = element('button', {class: 'px-4 py-2 bg-blue-900/30'}, ['Login with Real Debrid']);
+        login.addEventListener('click', () => login.remove());
+
+        const style = element('style', {}, ['.hidden { display: none; }']);
+        app().append(style, login, element('nav', {}, [toggle]), settings);
+    }
+
+    function renderLibrary() {
+        later(delays.library, () => app().append(element('div', {id: 'library-content'}, ['Library'])));
+    }
+
+    function renderSearch() {
+        later(delays.search_results, () => {
+            if (!fixture.results || fixture.results.length === 0) {
+                setStatus('No results found');
+                return;
+            }
+            const grid = element('div', {class: 'grid grid-cols-6 gap-4'});
+            fixture.results.forEach((result) => {
+                grid.append(element('a', {href: '/movie/' + result.id, class: 'block'}, [
+                    element('img', {alt: result.title, src: '/posters/' + result.id + '.jpg'}),
+                    element('h3', {class: 'text-lg font-bold'}, [result.title]),
+                    element('div', {class: 'text-sm text-gray-600'}, [result.year])
+                ]));
+            });
+            app().append(grid);
+        });
+    }
+
+    function rdButton(button, percent) {
+        button.className = 'px-2 py-1 rounded bg-red-900/30';
+        button.textContent = 'RD (' + percent + '%)';
+    }
+
+    function torrentBox(torrent) {
+        const buttons = element('div', {class: 'flex gap-1'});
+        const box = element('div', {class: 'border-2 border-black rounded-lg p-1 bg-gray-800'}, [
+            element('h2', {class: 'text-sm font-bold break-words'}, [torrent.title]),
+            element('div', {class: 'text-xs text-gray-300'}, ['Total size: ' + torrent.size]),
+            buttons
+        ]);
+
+        const action = element('button', {class: 'px-2 py-1 rounded'});
+        if (torrent.in_library) {
+            rdButton(action, 100);
+        } else if (torrent.cached) {
+            action.className = 'px-2 py-1 rounded bg-green-900/30';
+            action.textContent = '⚡Instant RD';
+        } else {
+            action.className = 'px-2 py-1 rounded bg-blue-900/30';
+            action.textContent = 'DL with RD';
+        }
+        action.addEventListener('click', () => {
+            if (action.textContent.startsWith('RD (')) {
+                // Clicking an RD button deletes the torrent from the library again
+                later(delays.click, () => {
+                    action.className = 'px-2 py-1 rounded ' + (torrent.cached ? 'bg-green-900/30' : 'bg-blue-900/30');
+                    action.textContent = torrent.cached ? '⚡Instant RD' : 'DL with RD';
+                });
+                return;
+            }
+            later(delays.click, () => rdButton(action, torrent.cached ? (torrent.progress ?? 100) : 0));
+        });
+        buttons.append(action, element('button', {class: 'px-2 py-1 rounded bg-gray-700'}, ['🧲Magnet']));
+        return box;
+    }
+
+    function renderMovie() {
+        const movie = fixture.movie || {id: '', torrents: []};
+        const torrents = movie.torrents || [];
+        app().append(
+            element('img', {alt: movie.title, src: '/posters/' + movie.id + '.jpg'}),
+            element('img', {alt: '', src: '/posters/' + movie.id + '-backdrop.jpg'}),
+            element('h1', {class: 'text-2xl'}, [movie.title + ' (' + movie.year + ')'])
+        );
+        const list = element('div', {class: 'grid grid-cols-4 gap-2'});
+        app().append(list);
+
+        // Torrents already in the library show up before the availability check finishes
+        torrents.filter((torrent) => torrent.in_library).forEach((torrent) => list.append(torrentBox(torrent)));
+        const byHash = Object.fromEntries(torrents.map((torrent) => [torrent.hash, torrent]));
+
+        // Like DMM: load the torrent list from the API, then ask which of the torrents are cached in RD
+        fetch('/api/torrents/movie?imdbId=' + encodeURIComponent(movie.id) + '&' + proofOfWork())
+            .then((response) => response.json())
+            .then((data) => {
+                const results = data.results || [];
+                if (results.length === 0) {
+                    setStatus('No results found');
+                    return;
+                }
+                setStatus('Checking RD availability...');
+                const hashes = results.map((result) => result.hash);
+                return fetch('/api/availability/check', {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/json'},
+                    body: JSON.stringify({imdbId: movie.id, hashes: hashes})
+                }).then((response) => response.json()).then((availability) => {
+                    const cached = new Set((availability.available || []).map((item) => item.hash));
+                    results.filter((result) => !(byHash[result.hash] || {}).in_library).forEach((result) => {
+                        list.append(torrentBox({...byHash[result.hash], title: result.title, cached: cached.has(result.hash)}));
+                    });
+                    setStatus('Found ' + cached.size + ' available torrents in RD');
+                });
+            });
+    }
+
+    // Posters and the web font are what a resource-blocking profile saves on every page load
+    document.head.append(element('style', {}, [
+        "@font-face { font-family: 'Inter'; src: url('/fonts/inter-var.woff2') format('woff2'); } body { font-family: 'Inter', sans-serif; }"
+    ]));
+
+    const renderers = {home: renderHome, library: renderLibrary, search: renderSearch, movie: renderMovie};
+    document.addEventListener('DOMContentLoaded', () => (renderers[fixture.page] || (() => {}))());
+})();
@@ -0,0 +1,187 @@
+"""
+Local stand-in for the parts of the Real-Debrid REST API that the http acquisition backend uses, so it
+can be benchmarked (and tried out) without a Real-Debrid account. Torrents marked cached in
+fixtures/scenarios.json are finished as soon as their files are selected; all others stay downloading.
+
+    python benchmarks/rd_stub.py --port 8779 --rate-limit 250
+
+Point SeerrBridge at it with RD_API_BASE_URL=http://127.0.0.1:8779/rest/1.0.
+"""
+import argparse
+import collections
+import json
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dmm_stub import load_scenarios, size_in_mb
+
+API_PREFIX = "/rest/1.0"
+
+
+class RDStubServer(ThreadingHTTPServer):
+    """
+    Keeps a torrent library in memory. rate_limit calls per minute are allowed (429 with Retry-After
+    beyond that); instant_availability=False answers instantAvailability with nothing, like the real
+    API does since Real-Debrid switched the endpoint off.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, scenarios, response_delay=0.0, rate_limit=250, instant_availability=True):
+        super().__init__(address, RDStubHandler)
+        self.response_delay = response_delay
+        self.rate_limit = rate_limit
+        self.instant_availability = instant_availability
+        self.known = {
+            torrent["hash"]: torrent
+            for scenario in scenarios["scenarios"]
+            for torrent in (scenario.get("movie") or {}).get("torrents", [])
+        }
+        self.library = {}
+        self.calls = collections.Counter()
+        self.lock = threading.Lock()
+        self._next_id = 1
+        self._window = collections.deque()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def over_rate_limit(self) -> float:
+        """Records a call; returns the seconds until the next slot if it is over the limit, else 0."""
+        now = time.monotonic()
+        with self.lock:
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+            if self.rate_limit and len(self._window) >= self.rate_limit:
+                return 60 - (now - self._window[0])
+            self._window.append(now)
+        return 0.0
+
+    def add_magnet(self, magnet) -> dict:
+        torrent_hash = urllib.parse.parse_qs(urllib.parse.urlsplit(magnet).query)["xt"][0].rsplit(":", 1)[-1].lower()
+        fixture = self.known.get(torrent_hash, {})
+        with self.lock:
+            torrent_id = f"STUB{self._next_id:06d}"
+            self._next_id += 1
+            self.library[torrent_id] = {
+                "id": torrent_id,
+                "filename": fixture.get("title", torrent_hash),
+                "hash": torrent_hash,
+                "bytes": int(size_in_mb(fixture["size"]) * 1024 * 1024) if fixture.get("size") else 0,
+                "status": "waiting_files_selection",
+                "progress": 0,
+                "added": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            }
+        return self.library[torrent_id]
+
+
+class RDStubHandler(BaseHTTPRequestHandler):
+    server: RDStubServer
+
+    def handle_call(self, method):
+        if self.server.response_delay:
+            time.sleep(self.server.response_delay)
+        url = urllib.parse.urlsplit(self.path)
+        if not url.path.startswith(API_PREFIX + "/"):
+            return self.respond(404, {"error": "unknown_ressource"})
+        parts = url.path[len(API_PREFIX):].strip("/").split("/")
+        self.server.calls[f"{method} /{'/'.join(parts[:2])}"] += 1
+
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self.respond(401, {"error": "bad_token", "error_code": 8})
+        retry_after = self.server.over_rate_limit()
+        if retry_after:
+            return self.respond(429, {"error": "too_many_requests", "error_code": 34}, {"Retry-After": f"{retry_after:.0f}"})
+
+        library = self.server.library
+        if method == "GET" and parts[:2] == ["torrents", "instantAvailability"]:
+            answer = {}
+            for torrent_hash in parts[2:]:
+                fixture = self.server.known.get(torrent_hash.lower(), {})
+                cached = self.server.instant_availability and fixture.get("cached")
+                answer[torrent_hash] = {"rd": [{"1": {"filename": f"{fixture.get('title')}.mkv", "filesize": 1}}]} if cached else []
+            return self.respond(200, answer if self.server.instant_availability else {})
+        if method == "POST" and parts == ["torrents", "addMagnet"]:
+            form = urllib.parse.parse_qs(self.read_body())
+            if not form.get("magnet"):
+                return self.respond(400, {"error": "parameter_missing", "error_code": 2})
+            torrent = self.server.add_magnet(form["magnet"][0])
+            return self.respond(201, {"id": torrent["id"], "uri": f"{self.server.base_url}/torrents/info/{torrent['id']}"})
+        if method == "POST" and parts[:2] == ["torrents", "selectFiles"] and len(parts) == 3:
+            self.read_body()
+            torrent = library.get(parts[2])
+            if torrent is None:
+                return self.respond(404, {"error": "unknown_ressource", "error_code": 7})
+            if self.server.known.get(torrent["hash"], {}).get("cached"):
+                torrent.update(status="downloaded", progress=100)
+            else:
+                torrent.update(status="downloading", progress=0)
+            return self.respond(204)
+        if method == "GET" and parts[:2] == ["torrents", "info"] and len(parts) == 3:
+            torrent = library.get(parts[2])
+            return self.respond(200, torrent) if torrent else self.respond(404, {"error": "unknown_ressource", "error_code": 7})
+        if method == "DELETE" and parts[:2] == ["torrents", "delete"] and len(parts) == 3:
+            return self.respond(204) if library.pop(parts[2], None) else self.respond(404, {"error": "unknown_ressource", "error_code": 7})
+        if method == "GET" and parts == ["torrents"]:
+            # Newest first, paginated like the real endpoint; X-Total-Count carries the library size
+            query = urllib.parse.parse_qs(url.query)
+            page, limit = int(query.get("page", ["1"])[0]), int(query.get("limit", ["100"])[0])
+            torrents = sorted(library.values(), key=lambda torrent: torrent["added"], reverse=True)
+            chunk = torrents[(page - 1) * limit:page * limit]
+            return self.respond(200 if chunk else 204, chunk or None, {"X-Total-Count": str(len(torrents))})
+        return self.respond(404, {"error": "unknown_ressource", "error_code": 7})
+
+    def do_GET(self):
+        self.handle_call("GET")
+
+    def do_POST(self):
+        self.handle_call("POST")
+
+    def do_DELETE(self):
+        self.handle_call("DELETE")
+
+    def read_body(self) -> str:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8")
+
+    def respond(self, status, data=None, headers=None):
+        body = json.dumps(data).encode("utf-8") if data is not None else b""
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+def start_stub(host="127.0.0.1", port=0, response_delay=0.0, rate_limit=250, instant_availability=True, scenarios=None) -> RDStubServer:
+    """Starts the stand-in on a background thread and returns the running server (port 0 picks a free port)."""
+    server = RDStubServer((host, port), scenarios or load_scenarios(), response_delay, rate_limit, instant_availability)
+    threading.Thread(target=server.serve_forever, name="rd-stub", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8779)
+    parser.add_argument("--response-delay", type=float, default=0.0, help="Seconds before every response.")
+    parser.add_argument("--rate-limit", type=int, default=250, help="Calls allowed per minute (0 for no limit).")
+    parser.add_argument("--no-instant-availability", action="store_true", help="Answer instantAvailability with nothing.")
+    args = parser.parse_args()
+
+    stub = RDStubServer((args.host, args.port), load_scenarios(), args.response_delay, args.rate_limit, not args.no_instant_availability)
+    print(f"Serving the Real-Debrid API stand-in on {stub.base_url}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -7,9 +7,9 @@
 #              /
 # © 2024
 # -----------------------------------------------------------------------------
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
 from pydantic import BaseModel, Field, ValidationError, field_validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple
 import asyncio
 import json
 import time
@@ -18,8 +18,17 @@ import sys
 import urllib.parse
 import re
 import inflect
-import requests
+import httpx
 import platform
+import sqlite3
+import threading
+import psutil
+from abc import ABC, abstractmethod
+from contextlib import aclosing, contextmanager
+from dataclasses import dataclass, replace
+from enum import Enum
+from functools import lru_cache, partial
+import random
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
@@ -28,13 +37,15 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from dotenv import load_dotenv
-from selenium.common.exceptions import StaleElementReferenceException, NoSuchElementException, TimeoutException
+from selenium.common.exceptions import StaleElementReferenceException, NoSuchElementException, TimeoutException, WebDriverException, SessionNotCreatedException
 from asyncio import Queue
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from collections import deque
 from deep_translator import GoogleTranslator
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
 from loguru import logger
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 
 
 # Configure loguru
@@ -69,6 +80,165 @@ except (TypeError, ValueError):
     logger.error("REFRESH_INTERVAL_MINUTES environment variable is not a valid number.")
     exit(1)
 
+# Local SQLite database used for caches and persistent state.
+DATABASE_PATH = os.getenv("DATABASE_PATH", "seerrbridge.db")
+
+# Trakt lookups are cached on disk; titles and years rarely change once published.
+try:
+    TRAKT_CACHE_TTL_HOURS = float(os.getenv("TRAKT_CACHE_TTL_HOURS", "168"))
+    TRAKT_CACHE_MAX_ENTRIES = int(os.getenv("TRAKT_CACHE_MAX_ENTRIES", "5000"))
+except ValueError:
+    logger.error("TRAKT_CACHE_TTL_HOURS and TRAKT_CACHE_MAX_ENTRIES must be valid numbers.")
+    exit(1)
+
+# Timeouts and retries for the Trakt, Overseerr and Real-Debrid HTTP clients.
+try:
+    HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+except ValueError:
+    logger.error("HTTP_TIMEOUT_SECONDS and HTTP_MAX_RETRIES must be valid numbers.")
+    exit(1)
+
+# Persistent job queue: how long a running job may go without finishing before it is handed out again,
+# and how often/when a job that raised an error is retried.
+try:
+    JOB_VISIBILITY_TIMEOUT_MINUTES = float(os.getenv("JOB_VISIBILITY_TIMEOUT_MINUTES", "15"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_DELAY_MINUTES = float(os.getenv("JOB_RETRY_DELAY_MINUTES", "5"))
+except ValueError:
+    logger.error("JOB_VISIBILITY_TIMEOUT_MINUTES, JOB_MAX_ATTEMPTS and JOB_RETRY_DELAY_MINUTES must be valid numbers.")
+    exit(1)
+
+# A movie whose search finished less than this long ago is not searched again.
+try:
+    DEDUP_WINDOW_MINUTES = float(os.getenv("DEDUP_WINDOW_MINUTES", "60"))
+except ValueError:
+    logger.error("DEDUP_WINDOW_MINUTES must be a valid number.")
+    exit(1)
+
+# Overseerr is synced incrementally; a full pass over all approved requests runs at this interval.
+try:
+    OVERSEERR_PAGE_SIZE = int(os.getenv("OVERSEERR_PAGE_SIZE", "100"))
+    OVERSEERR_FULL_SYNC_HOURS = float(os.getenv("OVERSEERR_FULL_SYNC_HOURS", "24"))
+except ValueError:
+    logger.error("OVERSEERR_PAGE_SIZE and OVERSEERR_FULL_SYNC_HOURS must be valid numbers.")
+    exit(1)
+
+# Movies DMM can't fulfil are retried with exponential backoff (with jitter) by the periodic scan.
+try:
+    SEARCH_BACKOFF_BASE_MINUTES = float(os.getenv("SEARCH_BACKOFF_BASE_MINUTES", "120"))
+    SEARCH_BACKOFF_MAX_HOURS = float(os.getenv("SEARCH_BACKOFF_MAX_HOURS", "168"))
+except ValueError:
+    logger.error("SEARCH_BACKOFF_BASE_MINUTES and SEARCH_BACKOFF_MAX_HOURS must be valid numbers.")
+    exit(1)
+
+# Upper bound for a DMM page to settle (search results, "No results found" or the RD availability check).
+try:
+    PAGE_STATE_TIMEOUT_SECONDS = float(os.getenv("PAGE_STATE_TIMEOUT_SECONDS", "30"))
+    if PAGE_STATE_TIMEOUT_SECONDS <= 0:
+        raise ValueError
+except ValueError:
+    logger.error("PAGE_STATE_TIMEOUT_SECONDS must be a positive number.")
+    exit(1)
+
+# Debrid Media Manager instance driven by the browser (overridable, e.g. for the offline benchmarks).
+DMM_BASE_URL = os.getenv("DMM_BASE_URL", "https://debridmediamanager.com").rstrip("/")
+
+# Resources the automation browser never downloads: "off", "media" (images, fonts, video) or
+# "strict" (media plus analytics and other third-party scripts). Hosts on the allowlist are never blocked.
+BROWSER_BLOCK_PROFILE = os.getenv("BROWSER_BLOCK_PROFILE", "media").lower()
+BROWSER_BLOCK_ALLOWLIST = [
+    host.strip().lower() for host in os.getenv("BROWSER_BLOCK_ALLOWLIST", "debridmediamanager.com,real-debrid.com").split(",")
+    if host.strip()
+] + [urllib.parse.urlsplit(DMM_BASE_URL).hostname or ""]
+if BROWSER_BLOCK_PROFILE not in ("off", "media", "strict"):
+    logger.error("BROWSER_BLOCK_PROFILE must be one of off, media or strict.")
+    exit(1)
+
+# ChromeDriver binary to use instead of resolving one with WebDriver Manager on startup (e.g. baked into an image).
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+if CHROMEDRIVER_PATH and not os.access(CHROMEDRIVER_PATH, os.X_OK):
+    logger.error(f"CHROMEDRIVER_PATH {CHROMEDRIVER_PATH} is not an executable file.")
+    exit(1)
+
+# Where search_on_debrid learns about the torrents of a movie page: "dom" reads the rendered result boxes and
+# status messages, "network" reads DMM's torrent and availability API responses from the browser's network log.
+DMM_CANDIDATE_SOURCE = os.getenv("DMM_CANDIDATE_SOURCE", "dom").lower()
+if DMM_CANDIDATE_SOURCE not in ("dom", "network"):
+    logger.error("DMM_CANDIDATE_SOURCE must be either dom or network.")
+    exit(1)
+
+# How the matching torrents of a movie are ranked before one is added (see RANKING_PROFILES), and the
+# largest torrent that may be added at all (0 keeps the profile's limit).
+TORRENT_RANKING_PROFILE = os.getenv("TORRENT_RANKING_PROFILE", "balanced").lower()
+try:
+    TORRENT_MAX_SIZE_GB = float(os.getenv("TORRENT_MAX_SIZE_GB", "0"))
+    if TORRENT_RANKING_PROFILE not in ("balanced", "quality", "compact") or TORRENT_MAX_SIZE_GB < 0:
+        raise ValueError
+except ValueError:
+    logger.error("TORRENT_RANKING_PROFILE must be balanced, quality or compact, and TORRENT_MAX_SIZE_GB a non-negative number.")
+    exit(1)
+
+# Points rank_candidates gives or takes per ranking signal (see RankingWeights), e.g. "cached=80,resolution=30".
+# Weights that are not listed keep their defaults.
+try:
+    TORRENT_RANKING_WEIGHTS = {}
+    for pair in filter(None, os.getenv("TORRENT_RANKING_WEIGHTS", "").replace(" ", "").split(",")):
+        name, value = pair.split("=")
+        TORRENT_RANKING_WEIGHTS[name] = float(value)
+        if TORRENT_RANKING_WEIGHTS[name] < 0:
+            raise ValueError
+except ValueError:
+    logger.error("TORRENT_RANKING_WEIGHTS must be comma-separated name=value pairs with non-negative numbers.")
+    exit(1)
+
+# How movies are added to Real-Debrid: "selenium" drives DMM in the browser pool, "http" picks a torrent from
+# DMM's torrent list and adds it through the Real-Debrid API, and uses the browser pool (if any) as a fallback.
+ACQUISITION_BACKEND = os.getenv("ACQUISITION_BACKEND", "selenium").lower()
+RD_API_BASE_URL = os.getenv("RD_API_BASE_URL", "https://api.real-debrid.com/rest/1.0").rstrip("/")
+try:
+    RD_API_CONCURRENCY = int(os.getenv("RD_API_CONCURRENCY", "4"))
+    if ACQUISITION_BACKEND not in ("selenium", "http") or RD_API_CONCURRENCY < 1:
+        raise ValueError
+except ValueError:
+    logger.error("ACQUISITION_BACKEND must be selenium or http, and RD_API_CONCURRENCY a positive integer.")
+    exit(1)
+
+# The local index of the Real-Debrid library, checked before a movie is searched at all, is refreshed with the
+# torrents added since the last refresh at this interval (0 turns it off), and rebuilt in full at the longer one.
+try:
+    RD_LIBRARY_REFRESH_MINUTES = float(os.getenv("RD_LIBRARY_REFRESH_MINUTES", "15"))
+    RD_LIBRARY_FULL_SYNC_HOURS = float(os.getenv("RD_LIBRARY_FULL_SYNC_HOURS", "24"))
+    if RD_LIBRARY_REFRESH_MINUTES < 0 or RD_LIBRARY_FULL_SYNC_HOURS <= 0:
+        raise ValueError
+except ValueError:
+    logger.error("RD_LIBRARY_REFRESH_MINUTES must be a non-negative number and RD_LIBRARY_FULL_SYNC_HOURS a positive number.")
+    exit(1)
+
+# Number of independent Chrome sessions used to work through the request queue in parallel.
+# The http acquisition backend can run without any (0).
+try:
+    BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+    BROWSER_MAX_CONSECUTIVE_FAILURES = int(os.getenv("BROWSER_MAX_CONSECUTIVE_FAILURES", "3"))
+    if BROWSER_POOL_SIZE < (0 if ACQUISITION_BACKEND == "http" else 1) or BROWSER_MAX_CONSECUTIVE_FAILURES < 1:
+        raise ValueError
+except ValueError:
+    logger.error("BROWSER_POOL_SIZE (at least 1 with the selenium backend) and BROWSER_MAX_CONSECUTIVE_FAILURES must be positive integers.")
+    exit(1)
+
+# Browser sessions are recycled (replacement started first, then swapped in) after this many searches, above this
+# memory use or after this many timed out searches in a row. 0 disables the search and memory limits.
+try:
+    BROWSER_RECYCLE_AFTER_SEARCHES = int(os.getenv("BROWSER_RECYCLE_AFTER_SEARCHES", "200"))
+    BROWSER_MAX_RSS_MB = float(os.getenv("BROWSER_MAX_RSS_MB", "1500"))
+    BROWSER_MAX_CONSECUTIVE_TIMEOUTS = int(os.getenv("BROWSER_MAX_CONSECUTIVE_TIMEOUTS", "3"))
+    BROWSER_HEALTH_CHECK_SECONDS = float(os.getenv("BROWSER_HEALTH_CHECK_SECONDS", "60"))
+    if min(BROWSER_RECYCLE_AFTER_SEARCHES, BROWSER_MAX_RSS_MB) < 0 or BROWSER_MAX_CONSECUTIVE_TIMEOUTS < 1 or BROWSER_HEALTH_CHECK_SECONDS <= 0:
+        raise ValueError
+except ValueError:
+    logger.error("BROWSER_RECYCLE_AFTER_SEARCHES, BROWSER_MAX_RSS_MB, BROWSER_MAX_CONSECUTIVE_TIMEOUTS and BROWSER_HEALTH_CHECK_SECONDS must be valid positive numbers.")
+    exit(1)
+
 if not OVERSEERR_API_BASE_URL:
     logger.error("OVERSEERR_API_BASE_URL environment variable is not set.")
     exit(1)
@@ -81,12 +251,163 @@ if not TRAKT_API_KEY:
     logger.error("TRAKT_API_KEY environment variable is not set.")
     exit(1)
 
-# Global driver variable to hold the Selenium WebDriver
-driver = None
+### Prometheus metrics (served on /metrics)
+SEARCH_STAGE_SECONDS = Histogram(
+    "seerrbridge_search_stage_seconds", "Time spent in each phase of search_on_debrid", ["stage"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 15, 20, 30, 60)
+)
+SEARCH_SECONDS = Histogram(
+    "seerrbridge_search_seconds", "Total time of a search_on_debrid run",
+    buckets=(1, 2, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+)
+SEARCH_OUTCOMES = Counter("seerrbridge_search_outcomes_total", "Finished movie requests by outcome, for every acquisition backend", ["outcome"])
+HTTP_REQUEST_SECONDS = Histogram(
+    "seerrbridge_http_request_seconds", "Latency of Trakt, Overseerr and Real-Debrid API calls", ["upstream", "method", "status"]
+)
+BROWSER_BLOCKED_REQUESTS = Counter(
+    "seerrbridge_browser_blocked_requests_total", "Requests the automation browser blocked by resource type", ["resource_type"]
+)
+BROWSER_RECEIVED_BYTES = Counter("seerrbridge_browser_received_bytes_total", "Bytes downloaded by the automation browser")
+BROWSER_RESTARTS = Counter("seerrbridge_browser_restarts_total", "Browser sessions restarted by the pool")
+BROWSER_RECYCLES = Counter("seerrbridge_browser_recycles_total", "Browser sessions replaced by a pre-warmed one", ["reason"])
+BROWSER_RSS_BYTES = Gauge("seerrbridge_browser_rss_bytes", "Resident memory of each browser session", ["worker"])
+QUEUE_DEPTH = Gauge("seerrbridge_jobs", "Jobs in the persistent queue by state", ["state"])
+BROWSERS_BUSY = Gauge("seerrbridge_browsers_busy", "Browser sessions currently running a search")
+TRAKT_RATE_LIMIT_REMAINING = Gauge("seerrbridge_trakt_rate_limit_remaining", "Trakt calls left in the current rate limit window")
+TRAKT_CACHE_LOOKUPS = Counter("seerrbridge_trakt_cache_lookups_total", "Trakt cache lookups by result", ["result"])
+RD_LIBRARY_LOOKUPS = Counter("seerrbridge_rd_library_lookups_total", "Real-Debrid library index lookups by result", ["result"])
+
+
+class StageTimer:
+    """Records the time between consecutive lap() calls as samples of SEARCH_STAGE_SECONDS."""
+
+    def __init__(self):
+        self._last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        SEARCH_STAGE_SECONDS.labels(stage).observe(now - self._last)
+        self._last = now
+
+
+class StartupReport:
+    """
+    Wall-clock time of each startup step, logged once startup is done and shown on /health.
+    Steps run by several browsers in parallel keep their slowest run; later restarts are not counted.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps: Dict[str, float] = {}
+        self.finished = False
+
+    def record(self, step, seconds):
+        if not self.finished:
+            self.steps[step] = max(seconds, self.steps.get(step, 0.0))
+
+    @contextmanager
+    def measure(self, step):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(step, time.perf_counter() - started)
+
+    def finish(self):
+        self.record("total", time.perf_counter() - self.started)
+        self.finished = True
+        logger.info("Startup took " + ", ".join(f"{step} {seconds:.2f}s" for step, seconds in self.steps.items()) + ".")
+
+    def summary(self) -> Dict[str, Any]:
+        return {"finished": self.finished, "seconds": {step: round(seconds, 3) for step, seconds in self.steps.items()}}
+
+
+startup_report = StartupReport()
+
+
+# Shared SQLite connection. Browser searches run in worker threads, so all access goes through db_lock.
+db_lock = threading.RLock()
+db = sqlite3.connect(DATABASE_PATH, check_same_thread=False, isolation_level=None)
+db.execute("PRAGMA journal_mode=WAL")
+db.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)")
+
+def get_sync_state(key, default=None):
+    with db_lock:
+        row = db.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+def set_sync_state(key, value):
+    with db_lock:
+        db.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, str(value)))
+
+### Shared async HTTP clients: one keep-alive connection pool per upstream service
+class HttpClients:
+    """
+    Lazily creates one httpx.AsyncClient per upstream ('trakt', 'overseerr', 'real-debrid')
+    so connections are reused between calls.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, upstream) -> httpx.AsyncClient:
+        if upstream not in self._clients:
+            self._clients[upstream] = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+        return self._clients[upstream]
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+http_clients = HttpClients()
 
-# Initialize a global queue with a maximum size of 500
-request_queue = Queue(maxsize=500)
-processing_task = None  # To track the current processing task
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+async def http_request(upstream, method, url, retry=None, **kwargs) -> httpx.Response:
+    """
+    Sends a request through the upstream's pooled client. Timeouts, dropped connections and
+    5xx responses are retried with exponential backoff; the last response or error is returned/raised.
+    Only idempotent methods are retried unless retry says otherwise, so a POST that did reach the
+    upstream is never sent twice.
+    """
+    client = http_clients.get(upstream)
+    retries = HTTP_MAX_RETRIES if (method in IDEMPOTENT_METHODS if retry is None else retry) else 0
+    for attempt in range(retries + 1):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            HTTP_REQUEST_SECONDS.labels(upstream, method, str(response.status_code)).observe(time.perf_counter() - start)
+            if response.status_code < 500 or attempt == retries:
+                return response
+            logger.warning(f"{upstream} returned {response.status_code} for {method} {url}. Retrying...")
+        except httpx.TransportError as e:
+            HTTP_REQUEST_SECONDS.labels(upstream, method, "error").observe(time.perf_counter() - start)
+            if attempt == retries:
+                raise
+            logger.warning(f"{upstream} request {method} {url} failed: {e!r}. Retrying...")
+        await asyncio.sleep(0.5 * 2 ** attempt)
+
+processing_tasks = []  # To track the queue worker tasks, as many as the acquisition backend can keep busy
+startup_tasks = set()  # Background startup work that nothing awaits
+
+def track_task(task: asyncio.Task, tasks: set, description) -> asyncio.Task:
+    """
+    Keeps a fire-and-forget task in tasks until it is done, since the event loop only holds weak
+    references to tasks, and logs the exception it ended with.
+    """
+    def done(finished: asyncio.Task):
+        tasks.discard(finished)
+        if not finished.cancelled() and finished.exception() is not None:
+            logger.opt(exception=finished.exception()).error(f"{description} failed: {finished.exception()!r}")
+
+    tasks.add(task)
+    task.add_done_callback(done)
+    return task
 
 class MediaInfo(BaseModel):
     media_type: str
@@ -140,8 +461,8 @@ class WebhookPayload(BaseModel):
     comment: Optional[CommentInfo] = None  # Allow comment to be None
     extra: List[Dict[str, Any]] = []
 
-def refresh_access_token():
-    global RD_REFRESH_TOKEN, RD_ACCESS_TOKEN, driver
+async def refresh_access_token():
+    global RD_REFRESH_TOKEN, RD_ACCESS_TOKEN
 
     TOKEN_URL = "https://api.real-debrid.com/oauth/v2/token"
     data = {
@@ -153,7 +474,7 @@ def refresh_access_token():
 
     try:
         logger.info("Requesting a new access token with the refresh token.")
-        response = requests.post(TOKEN_URL, data=data)
+        response = await http_request("real-debrid", "POST", TOKEN_URL, data=data)
         response.encoding = 'utf-8'  # Explicitly set UTF-8 encoding for the response
         response_data = response.json()
 
@@ -167,18 +488,18 @@ def refresh_access_token():
             
             update_env_file()
 
-            if driver:
-                driver.execute_script(f"""
-                    localStorage.setItem('rd:accessToken', '{RD_ACCESS_TOKEN}');
-                """)
-                logger.info("Updated Real-Debrid credentials in local storage after token refresh.")
-                driver.refresh()
-                logger.success("Refreshed the page after updating local storage with the new token.")
+            # Sessions pick the new token up on their next lease instead of being interrupted mid-search
+            browser_pool.queue_browser_task("rd_access_token", partial(inject_access_token, token=RD_ACCESS_TOKEN))
+            logger.info("Queued the new token for injection into every browser session.")
         else:
             logger.error(f"Failed to refresh access token: {response_data.get('error_description', 'Unknown error')}")
     except Exception as e:
         logger.error(f"Error refreshing access token: {e}")
 
+def inject_access_token(driver, token):
+    """Writes the Real-Debrid token into DMM's local storage. The next page DMM loads uses it."""
+    driver.execute_script("localStorage.setItem('rd:accessToken', arguments[0]);", token)
+
 def update_env_file():
     """Update the .env file with the new access token."""
     with open('.env', 'r', encoding='utf-8') as file:
@@ -192,7 +513,7 @@ def update_env_file():
                 file.write(line)
 
 
-def check_and_refresh_access_token():
+async def check_and_refresh_access_token():
     """Check if the access token is expired or about to expire and refresh it if necessary."""
     global RD_ACCESS_TOKEN
     RD_ACCESS_TOKEN = None  # Reset before reloading
@@ -212,35 +533,38 @@ def check_and_refresh_access_token():
         # Check if the token is about to expire in the next 10 minutes (600000 milliseconds)
         if current_time >= expiry_time - 600000:  # 600000 milliseconds = 10 minutes
             logger.info("Access token is about to expire. Refreshing...")
-            refresh_access_token()
+            await refresh_access_token()
         else:
             logger.info("Access token is still valid.")
     else:
         logger.error("Access token is not set. Requesting a new token.")
-        refresh_access_token()
+        await refresh_access_token()
 
 ### Helper function to handle login
+LOGIN_BUTTON_XPATH = "//button[contains(text(),'Login with Real Debrid')]"
+SETTINGS_LINK_XPATH = "//span[contains(text(),'⚙️ Settings')]"
+
 def login(driver):
+    """Clicks 'Login with Real Debrid' if DMM shows it. Returns as soon as DMM shows either that button or its menu."""
     logger.info("Initiating login process.")
 
+    def login_button_or_menu(driver):
+        login_buttons = driver.find_elements(By.XPATH, LOGIN_BUTTON_XPATH)
+        if login_buttons:
+            return login_buttons[0]
+        return "logged_in" if driver.find_elements(By.XPATH, SETTINGS_LINK_XPATH) else False
+
     try:
-        # Check if the "Login with Real Debrid" button exists and is clickable
-        login_button = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(),'Login with Real Debrid')]"))
-        )
-        if login_button:
+        login_button = WebDriverWait(driver, 5, poll_frequency=0.1).until(login_button_or_menu)
+        if login_button == "logged_in":
+            logger.info("'Login with Real Debrid' button was not shown. Already logged in.")
+        else:
             login_button.click()
             logger.info("Clicked on 'Login with Real Debrid' button.")
-        else:
-            logger.info("'Login with Real Debrid' button was not found. Skipping this step.")
 
     except TimeoutException:
         # Handle case where the button was not found before the timeout
         logger.warning("'Login with Real Debrid' button not found or already bypassed. Proceeding...")
-    
-    except NoSuchElementException:
-        # Handle case where the element is not in the DOM
-        logger.warning("'Login with Real Debrid' button not present in the DOM. Proceeding...")
 
     except Exception as ex:
         # Log any other unexpected exception
@@ -249,303 +573,1622 @@ def login(driver):
 
 scheduler = AsyncIOScheduler()
 
-### Browser Initialization and Persistent Session
-async def initialize_browser():
-    global driver
-    if driver is None:
-        logger.info("Starting persistent browser session.")
-
-        # Detect the current operating system
-        current_os = platform.system().lower()  # Returns 'windows', 'linux', or 'darwin' (macOS)
-        logger.info(f"Detected operating system: {current_os}")
-
-        options = Options()
-
-        ### Handle Docker/Linux-specific configurations
-        if current_os == "linux" and os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true":
-            logger.info("Detected Linux environment inside Docker. Applying Linux-specific configurations.")
-
-            # Explicitly set the Chrome binary location
-            options.binary_location = os.getenv("CHROME_BIN", "/usr/bin/google-chrome")
-
-            # Enable headless mode for Linux/Docker environments
-            options.add_argument("--headless=new")  # Updated modern headless flag
-            options.add_argument("--no-sandbox")  # Required for running as root in Docker
-            options.add_argument("--disable-dev-shm-usage")  # Handle shared memory limitations
-            options.add_argument("--disable-gpu")  # Disable GPU rendering for headless environments
-            options.add_argument("--disable-setuid-sandbox")  # Bypass setuid sandbox
-
-        ### Handle Windows-specific configurations
-        elif current_os == "windows":
-            logger.info("Detected Windows environment. Applying Windows-specific configurations.")
-
-        if HEADLESS_MODE:
-            options.add_argument("--headless=new")  # Modern headless mode for Chrome
-        options.add_argument("--disable-gpu")  # Disable GPU for Docker compatibility
-        options.add_argument("--no-sandbox")  # Required for running browser as root
-        options.add_argument("--disable-dev-shm-usage")  # Disable shared memory usage restrictions
-        options.add_argument("--disable-setuid-sandbox")  # Disable sandboxing for root permissions
-        options.add_argument("--enable-logging")
-        options.add_argument("--window-size=1920,1080")  # Set explicit window size to avoid rendering issues
-
-        # WebDriver options to suppress infobars and disable automation detection
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-infobars")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36")
-
-
-        # Log initialization method
-        logger.info("Using WebDriver Manager for dynamic ChromeDriver downloads.")
+### Resource blocking for the automation browser
+# Network.setBlockedURLs only takes block patterns ('*' matches anything), so the allowlist is applied
+# by dropping every host pattern that names an allowed host. The file type patterns only match static
+# assets and never the JSON API calls DMM makes to itself and Real-Debrid.
+BLOCKED_RESOURCE_PATTERNS = {
+    "media": [
+        f"*.{extension}{suffix}"
+        for extension in ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "woff", "woff2", "ttf", "otf", "mp4", "webm")
+        for suffix in ("", "?*")
+    ] + ["*/_next/image?*", "*image.tmdb.org*", "*m.media-amazon.com*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "third_party": [
+        "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*", "*googlesyndication.com*",
+        "*static.cloudflareinsights.com*", "*plausible.io*", "*hotjar.com*", "*clarity.ms*", "*sentry.io*",
+        "*youtube.com*", "*ytimg.com*", "*facebook.net*",
+    ],
+}
+
+def blocked_url_patterns(profile=BROWSER_BLOCK_PROFILE, allowlist=BROWSER_BLOCK_ALLOWLIST) -> List[str]:
+    """Returns the URL patterns blocked by a profile, minus the ones aimed at an allowlisted host."""
+    groups = {"off": [], "media": ["media"], "strict": ["media", "third_party"]}[profile]
+    patterns = [pattern for group in groups for pattern in BLOCKED_RESOURCE_PATTERNS[group]]
+    return [pattern for pattern in patterns if not any(host and host in pattern for host in allowlist)]
+
+def read_performance_log(driver) -> list[dict]:
+    """
+    Drains the browser's performance log and returns its DevTools messages. Every caller goes
+    through here, so the requests the blocking profile stopped and the bytes that were downloaded
+    are counted exactly once, whoever reads the log.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except WebDriverException as e:
+        logger.debug(f"Could not read the browser performance log: {e}")
+        return []
 
+    messages = []
+    for entry in entries:
         try:
-            # Use webdriver-manager to install the appropriate ChromeDriver version
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-            # Suppress 'webdriver' detection
-            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-                "source": """
-                Object.defineProperty(navigator, 'webdriver', {
-                  get: () => undefined
-                })
-                """
-            })
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        params = message.get("params", {})
+        if message.get("method") == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+            BROWSER_BLOCKED_REQUESTS.labels(params.get("type", "Other")).inc()
+        elif message.get("method") == "Network.loadingFinished":
+            BROWSER_RECEIVED_BYTES.inc(params.get("encodedDataLength", 0))
+        messages.append(message)
+    return messages
 
-            logger.success("Initialized Selenium WebDriver with WebDriver Manager.")
-            # Navigate to an initial page to confirm browser works
-            driver.get("https://debridmediamanager.com")
-            logger.success("Navigated to Debrid Media Manager page.")
-        except Exception as e:
-            logger.error(f"Failed to initialize Selenium WebDriver: {e}")
-            raise e
+def record_network_activity(driver):
+    """Counts the blocked requests and downloaded bytes since the log was last read, so the effect of a profile shows up in the metrics."""
+    read_performance_log(driver)
 
-        # Inject Real-Debrid access token and other credentials into local storage
-        driver.execute_script(f"""
-            localStorage.setItem('rd:accessToken', '{RD_ACCESS_TOKEN}');
-        """)
-        logger.info("Set Real-Debrid credentials in local storage.")
 
-        # Refresh the page to apply the local storage values
-        driver.refresh()
-        login(driver)
-        logger.success("Refreshed the page to apply local storage values.")
-        # After refreshing, call the login function to click the login button
-        # After successful login, click on "⚙️ Settings" to open the settings popup
-        try:
+### Browser Initialization and Persistent Session
+_chromedriver_lock = threading.Lock()
+_chromedriver_path = None
 
-            logger.info("Attempting to click the '⚙️ Settings' link.")
-            settings_link = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//span[contains(text(),'⚙️ Settings')]"))
-            )
-            settings_link.click()
-            logger.info("Clicked on '⚙️ Settings' link.")
+def chromedriver_path(refresh=False):
+    """
+    Path of the ChromeDriver binary. webdriver-manager looks up the matching version online, so the
+    path it returns is remembered in the database and reused by later sessions and restarts; refresh
+    forces a new lookup (e.g. after Chrome updated). CHROMEDRIVER_PATH skips the lookup entirely.
+    """
+    global _chromedriver_path
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH
+    with _chromedriver_lock:
+        if not refresh:
+            path = _chromedriver_path or get_sync_state("chromedriver_path")
+            if path and os.access(path, os.X_OK):
+                _chromedriver_path = path
+                return path
+        logger.info("Resolving ChromeDriver with WebDriver Manager.")
+        _chromedriver_path = ChromeDriverManager().install()
+        set_sync_state("chromedriver_path", _chromedriver_path)
+        return _chromedriver_path
+
+def launch_browser():
+    """
+    Starts Chrome with the automation options, detection suppression and resource blocking applied.
+    Does not need the Real-Debrid token, so it can run while the token is still being refreshed.
+    """
+    logger.info("Starting browser session.")
 
-            # Locate the "Default torrents filter" input box and insert the regex
-            logger.info("Attempting to insert regex into 'Default torrents filter' box.")
-            default_filter_input = WebDriverWait(driver, 10).until(
+    # Detect the current operating system
+    current_os = platform.system().lower()  # Returns 'windows', 'linux', or 'darwin' (macOS)
+    logger.info(f"Detected operating system: {current_os}")
 
-                EC.presence_of_element_located((By.ID, "dmm-default-torrents-filter"))
-            )
-            default_filter_input.clear()  # Clear any existing filter
+    options = Options()
 
-            # Use the regex from .env
-            default_filter_input.send_keys(TORRENT_FILTER_REGEX)
+    ### Handle Docker/Linux-specific configurations
+    if current_os == "linux" and os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true":
+        logger.info("Detected Linux environment inside Docker. Applying Linux-specific configurations.")
 
-            logger.info(f"Inserted regex into 'Default torrents filter' input box: {TORRENT_FILTER_REGEX}")
+        # Explicitly set the Chrome binary location
+        options.binary_location = os.getenv("CHROME_BIN", "/usr/bin/google-chrome")
 
-            settings_link.click()
-            logger.success("Closed 'Settings' to save settings.")
+        # Enable headless mode for Linux/Docker environments
+        options.add_argument("--headless=new")  # Updated modern headless flag
+        options.add_argument("--no-sandbox")  # Required for running as root in Docker
+        options.add_argument("--disable-dev-shm-usage")  # Handle shared memory limitations
+        options.add_argument("--disable-gpu")  # Disable GPU rendering for headless environments
+        options.add_argument("--disable-setuid-sandbox")  # Bypass setuid sandbox
 
-        except (TimeoutException, NoSuchElementException) as ex:
-            logger.error(f"Error while interacting with the settings: {ex}")
-            logger.error(f"Continuing without TORRENT_FILTER_REGEX")
+    ### Handle Windows-specific configurations
+    elif current_os == "windows":
+        logger.info("Detected Windows environment. Applying Windows-specific configurations.")
 
+    if HEADLESS_MODE:
+        options.add_argument("--headless=new")  # Modern headless mode for Chrome
+    options.add_argument("--disable-gpu")  # Disable GPU for Docker compatibility
+    options.add_argument("--no-sandbox")  # Required for running browser as root
+    options.add_argument("--disable-dev-shm-usage")  # Disable shared memory usage restrictions
+    options.add_argument("--disable-setuid-sandbox")  # Disable sandboxing for root permissions
+    options.add_argument("--enable-logging")
+    options.add_argument("--window-size=1920,1080")  # Set explicit window size to avoid rendering issues
 
-        # Navigate to the library section
-        logger.info("Navigating to the library section.")
-        driver.get("https://debridmediamanager.com/library")
+    # WebDriver options to suppress infobars and disable automation detection
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--disable-infobars")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36")
+
+    # Network events feed the blocked request and downloaded bytes metrics (see record_network_activity)
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+    try:
+        with startup_report.measure("chromedriver"):
+            driver_path = chromedriver_path()
+        with startup_report.measure("chrome_launch"):
+            try:
+                driver = webdriver.Chrome(service=Service(driver_path), options=options)
+            except SessionNotCreatedException as e:
+                if CHROMEDRIVER_PATH:
+                    raise
+                # Chrome was probably updated since the cached ChromeDriver was downloaded
+                logger.warning(f"Cached ChromeDriver could not start Chrome ({e.msg}). Resolving it again.")
+                driver = webdriver.Chrome(service=Service(chromedriver_path(refresh=True)), options=options)
+
+        # Suppress 'webdriver' detection
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+            "source": """
+            Object.defineProperty(navigator, 'webdriver', {
+              get: () => undefined
+            })
+            """
+        })
+
+        # Skip the images, fonts and scripts the automation never looks at
+        blocked_patterns = blocked_url_patterns()
+        if blocked_patterns or DMM_CANDIDATE_SOURCE == "network":
+            driver.execute_cdp_cmd("Network.enable", {})  # Also needed to read response bodies
+        if blocked_patterns:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_patterns})
+            logger.info(f"Blocking {len(blocked_patterns)} resource patterns (profile '{BROWSER_BLOCK_PROFILE}').")
+
+        logger.success("Initialized Selenium WebDriver.")
+        return driver
+    except Exception as e:
+        logger.error(f"Failed to initialize Selenium WebDriver: {e}")
+        raise e
+
+def dmm_settings_storage() -> Optional[Dict[str, str]]:
+    """The localStorage entries DMM wrote for TORRENT_FILTER_REGEX the last time it was set through the Settings UI."""
+    stored = json.loads(get_sync_state("dmm_settings_storage", "null") or "null")
+    if stored and stored.get("regex") == TORRENT_FILTER_REGEX:
+        return stored["items"]
+    return None
+
+def apply_settings_through_ui(driver):
+    """Types TORRENT_FILTER_REGEX into DMM's Settings and remembers what DMM stored for it."""
+    try:
+        logger.info("Attempting to click the '⚙️ Settings' link.")
+        settings_link = WebDriverWait(driver, 10).until(
+            EC.element_to_be_clickable((By.XPATH, SETTINGS_LINK_XPATH))
+        )
+        settings_link.click()
+        logger.info("Clicked on '⚙️ Settings' link.")
+
+        # Locate the "Default torrents filter" input box and insert the regex
+        logger.info("Attempting to insert regex into 'Default torrents filter' box.")
+        default_filter_input = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.ID, "dmm-default-torrents-filter"))
+        )
+        default_filter_input.clear()  # Clear any existing filter
+
+        # Use the regex from .env
+        default_filter_input.send_keys(TORRENT_FILTER_REGEX)
+
+        logger.info(f"Inserted regex into 'Default torrents filter' input box: {TORRENT_FILTER_REGEX}")
+
+        settings_link.click()
+        logger.success("Closed 'Settings' to save settings.")
+
+        # Later sessions write the same entries straight into localStorage
+        items = driver.execute_script("""
+            return Object.fromEntries(Object.keys(localStorage)
+                .filter((key) => key.startsWith('settings:'))
+                .map((key) => [key, localStorage.getItem(key)]));
+        """)
+        if items:
+            set_sync_state("dmm_settings_storage", json.dumps({"regex": TORRENT_FILTER_REGEX, "items": items}))
+
+    except (TimeoutException, NoSuchElementException) as ex:
+        logger.error(f"Error while interacting with the settings: {ex}")
+        logger.error(f"Continuing without TORRENT_FILTER_REGEX")
+
+def prepare_dmm_session(driver):
+    """
+    Logs a launched browser in to DMM: writes the Real-Debrid token and the stored DMM settings into
+    localStorage, opens the library so DMM syncs it, and clicks through the Settings UI only if the
+    settings were never captured for the current TORRENT_FILTER_REGEX.
+    """
+    with startup_report.measure("dmm_login"):
+        # Any page of the DMM origin gives access to its localStorage; a missing one is the lightest
+        driver.get(f"{DMM_BASE_URL}/robots.txt")
+        settings_items = dmm_settings_storage() or {}
+        driver.execute_script(
+            "Object.entries(arguments[0]).forEach(([key, value]) => localStorage.setItem(key, value));",
+            {"rd:accessToken": RD_ACCESS_TOKEN, **settings_items}
+        )
+        logger.info("Set Real-Debrid credentials in local storage.")
+        if settings_items:
+            logger.info(f"Applied the DMM torrent filter through local storage: {TORRENT_FILTER_REGEX}")
+
+        driver.get(DMM_BASE_URL)
+        login(driver)
+        logger.success("Navigated to Debrid Media Manager page.")
 
-        # Wait for 2 seconds on the library page before further processing
+    if not settings_items:
+        with startup_report.measure("dmm_settings_ui"):
+            apply_settings_through_ui(driver)
+
+    # Navigate to the library section
+    with startup_report.measure("dmm_library"):
+        logger.info("Navigating to the library section.")
+        driver.get(f"{DMM_BASE_URL}/library")
         try:
             # Ensure the library page has loaded correctly (e.g., wait for a specific element on the library page)
-            library_element = WebDriverWait(driver, 2).until(
+            WebDriverWait(driver, 2, poll_frequency=0.1).until(
                 EC.presence_of_element_located((By.XPATH, "//div[@id='library-content']"))  # Adjust the XPath as necessary
             )
             logger.success("Library section loaded successfully.")
         except TimeoutException:
             logger.info("Library loading.")
 
-        # Wait for at least 2 seconds on the library page
-        logger.info("Waiting for 2 seconds on the library page.")
-        time.sleep(2)
-        logger.success("Completed waiting on the library page.")
+def create_browser_session():
+    """
+    Launches a Chrome session, injects the Real-Debrid token into local storage and applies
+    the torrent filter. Blocking; call it through asyncio.to_thread from async code.
 
-async def shutdown_browser():
-    global driver
-    if driver:
+    Returns:
+        WebDriver: The ready-to-use Selenium WebDriver.
+    """
+    driver = launch_browser()
+    try:
+        prepare_dmm_session(driver)
+    except Exception:
         driver.quit()
-        logger.warning("Selenium WebDriver closed.")
-        driver = None
+        raise
+    return driver
+
+
+def browser_rss_bytes(driver) -> Optional[int]:
+    """Resident memory of a session's chromedriver and every Chrome process started under it."""
+    try:
+        process = psutil.Process(driver.service.process.pid)
+        return sum(child.memory_info().rss for child in [process, *process.children(recursive=True)])
+    except (AttributeError, psutil.Error):
+        return None
+
+
+class BrowserWorker:
+    """
+    A single Chrome session in the browser pool together with its health counters.
+    """
+
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+        self.driver = None
+        self.searches = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.restarts = 0
+        self.last_error = None
+        self.last_used = None
+        self.busy = False
+        self.leased_by = None  # What holds the exclusive lease on the session ("search: <title>", "liveness probe")
+        # Browser tasks (e.g. injecting a refreshed token) waiting for the next lease, by name; a newer task replaces an older one
+        self.queued_tasks: Dict[str, Any] = {}
+        # Lifecycle of the current session
+        self.session_searches = 0
+        self.consecutive_timeouts = 0
+        self.rss_bytes = None
+        self.recycles = 0
+        self.recycling = None  # Reason while a replacement session is being started
+        self.pending_driver = None  # Replacement that is ready but waits for the current search to finish
+
+    @property
+    def healthy(self):
+        return self.driver is not None and self.consecutive_failures < BROWSER_MAX_CONSECUTIVE_FAILURES
+
+    def record_success(self, outcome=None):
+        self.searches += 1
+        self.session_searches += 1
+        self.consecutive_failures = 0
+        self.consecutive_timeouts = self.consecutive_timeouts + 1 if outcome == SearchOutcome.TIMEOUT else 0
+        self.last_used = time.time()
+
+    def record_failure(self, error):
+        self.searches += 1
+        self.session_searches += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = str(error)
+        self.last_used = time.time()
+
+    def mark_unresponsive(self, error):
+        """Takes the session out of service; the pool restarts it on release."""
+        self.failures += 1
+        self.consecutive_failures = BROWSER_MAX_CONSECUTIVE_FAILURES
+        self.last_error = str(error)
+
+    def record_rss(self, rss_bytes):
+        self.rss_bytes = rss_bytes
+        if rss_bytes is not None:
+            BROWSER_RSS_BYTES.labels(str(self.worker_id)).set(rss_bytes)
+
+    def recycle_reason(self) -> Optional[str]:
+        """Why the session should be replaced by a fresh one, or None while it is fine."""
+        if BROWSER_RECYCLE_AFTER_SEARCHES and self.session_searches >= BROWSER_RECYCLE_AFTER_SEARCHES:
+            return "searches"
+        if BROWSER_MAX_RSS_MB and self.rss_bytes and self.rss_bytes > BROWSER_MAX_RSS_MB * 1024 * 1024:
+            return "memory"
+        if self.consecutive_timeouts >= BROWSER_MAX_CONSECUTIVE_TIMEOUTS:
+            return "timeouts"
+        return None
+
+    def new_session(self, driver):
+        """Puts a fresh session in place and returns the one it replaces."""
+        old_driver, self.driver = self.driver, driver
+        self.session_searches = 0
+        self.consecutive_timeouts = 0
+        self.consecutive_failures = 0
+        self.rss_bytes = None
+        self.recycling = None
+        self.pending_driver = None
+        self.queued_tasks.clear()  # A fresh session starts from the current state (e.g. the current token)
+        return old_driver
+
+    def status(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "healthy": self.healthy,
+            "busy": self.busy,
+            "leased_by": self.leased_by,
+            "queued_tasks": list(self.queued_tasks),
+            "searches": self.searches,
+            "session_searches": self.session_searches,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "consecutive_timeouts": self.consecutive_timeouts,
+            "rss_mb": round(self.rss_bytes / 1024 / 1024, 1) if self.rss_bytes else None,
+            "restarts": self.restarts,
+            "recycles": self.recycles,
+            "recycling": self.recycling,
+            "last_error": self.last_error,
+            "last_used": datetime.fromtimestamp(self.last_used).isoformat() if self.last_used else None,
+        }
+
+
+class BrowserPool:
+    """
+    Pool of independent browser sessions and the only way to reach them: callers lease an idle
+    worker with acquire() and hand it back with release(), so no two callers ever drive the same
+    session at once. Work that has to touch every session (e.g. injecting a refreshed token) is
+    queued with queue_browser_task() and runs at the start of each session's next lease. Workers that keep failing or stop responding to the liveness probe are
+    restarted before they are reused; workers that grew old, large or slow are recycled: a
+    replacement session is started while the old one keeps serving, and swapped in once ready.
+    """
+
+    RESTART_RETRY_SECONDS = 30
+    PROBE_TIMEOUT_SECONDS = 15
+
+    def __init__(self, size):
+        self.size = size
+        self.workers: List[BrowserWorker] = []
+        self._idle: Queue = Queue()
+        self._tasks = set()  # Restarts, prewarms and quits running in the background
+
+    async def start(self, credentials_ready=None):
+        """
+        Launches every browser at once; the DMM sessions are prepared once credentials_ready (e.g. the
+        token refresh) is done, so Chrome starts up while the Real-Debrid token is still being checked.
+        """
+        if not self.size:
+            logger.info("Browser pool is disabled (BROWSER_POOL_SIZE=0).")
+            if credentials_ready is not None:
+                await credentials_ready
+            return
+        logger.info(f"Starting browser pool with {self.size} session(s).")
+        self.workers = [BrowserWorker(worker_id) for worker_id in range(1, self.size + 1)]
+        with startup_report.measure("browser_launch"):
+            browsers = await asyncio.gather(*(asyncio.to_thread(launch_browser) for _ in self.workers), return_exceptions=True)
+        if credentials_ready is not None:
+            try:
+                await credentials_ready
+            except Exception:
+                await asyncio.gather(*(asyncio.to_thread(browser.quit) for browser in browsers if not isinstance(browser, Exception)))
+                raise
+
+        async def prepare(browser):
+            if isinstance(browser, Exception):
+                return browser
+            try:
+                await asyncio.to_thread(prepare_dmm_session, browser)
+            except Exception as e:
+                await asyncio.to_thread(browser.quit)
+                return e
+            return browser
+
+        with startup_report.measure("dmm_session"):
+            sessions = await asyncio.gather(*(prepare(browser) for browser in browsers))
+
+        for worker, session in zip(self.workers, sessions):
+            if isinstance(session, Exception):
+                logger.error(f"Browser {worker.worker_id} failed to start: {session}")
+                worker.last_error = str(session)
+                self._spawn(self._restart_until_ready(worker), f"Restarting browser {worker.worker_id}")
+                continue
+            worker.driver = session
+            self._idle.put_nowait(worker)
+            logger.success(f"Browser {worker.worker_id} is ready.")
+
+        if self._idle.empty():
+            raise RuntimeError("None of the browser sessions could be started.")
+        self._spawn(self._monitor(), "Browser pool monitor")
+
+    def _spawn(self, coro, description) -> asyncio.Task:
+        return track_task(asyncio.create_task(coro), self._tasks, description)
+
+    async def acquire(self, holder) -> BrowserWorker:
+        while True:
+            worker = await self._idle.get()
+            worker.busy = True
+            worker.leased_by = holder
+            if await self._run_queued_tasks(worker):
+                return worker
+            self.release(worker)  # The session broke while running its queued tasks; it is restarted
+
+    def release(self, worker: BrowserWorker):
+        worker.busy = False
+        worker.leased_by = None
+        if worker.pending_driver is not None and worker.driver is not None:
+            self._swap_in(worker, worker.pending_driver)
+
+        if not worker.healthy:
+            logger.warning(f"Browser {worker.worker_id} is unhealthy ({worker.last_error}). Restarting it.")
+            self._spawn(self._restart_until_ready(worker), f"Restarting browser {worker.worker_id}")
+            return
+
+        reason = worker.recycle_reason()
+        if reason and not worker.recycling:
+            worker.recycling = reason
+            self._spawn(self._prewarm(worker, reason), f"Recycling browser {worker.worker_id}")
+        self._idle.put_nowait(worker)
+
+    async def _prewarm(self, worker: BrowserWorker, reason):
+        logger.info(f"Recycling browser {worker.worker_id} ({reason}). Starting its replacement.")
+        try:
+            driver = await asyncio.to_thread(create_browser_session)
+        except Exception as e:
+            logger.error(f"Failed to start a replacement for browser {worker.worker_id}: {e}. Keeping the current session.")
+            worker.recycling = None
+            return
+
+        if worker.recycling is None:
+            await self._quit(worker, driver)  # A restart already replaced the session meanwhile
+        elif worker.driver is None:
+            # The session died meanwhile and is being restarted; that restart takes the fresh session
+            worker.pending_driver = driver
+        elif worker.busy:
+            worker.pending_driver = driver  # Swapped in by release() once the running search is done
+        else:
+            self._swap_in(worker, driver)
+
+    def _swap_in(self, worker: BrowserWorker, driver):
+        reason = worker.recycling or "unknown"
+        old_driver = worker.new_session(driver)
+        worker.recycles += 1
+        BROWSER_RECYCLES.labels(reason).inc()
+        logger.success(f"Browser {worker.worker_id} recycled ({reason}); the replacement session took over.")
+        if old_driver is not None:
+            self._spawn(self._quit(worker, old_driver), f"Closing browser {worker.worker_id}")
+
+    @staticmethod
+    async def _quit(worker: BrowserWorker, driver):
+        try:
+            await asyncio.to_thread(driver.quit)
+        except Exception as e:
+            logger.warning(f"Error while closing browser {worker.worker_id}: {e}")
+
+    async def _restart_until_ready(self, worker: BrowserWorker):
+        while True:
+            old_driver, worker.driver = worker.driver, None
+            if old_driver:
+                await self._quit(worker, old_driver)
+
+            try:
+                driver = worker.pending_driver or await asyncio.to_thread(create_browser_session)
+            except Exception as e:
+                worker.last_error = str(e)
+                logger.error(f"Failed to restart browser {worker.worker_id}: {e}. Retrying in {self.RESTART_RETRY_SECONDS} seconds.")
+                await asyncio.sleep(self.RESTART_RETRY_SECONDS)
+                continue
+
+            if worker.pending_driver is not None and worker.pending_driver is not driver:
+                await self._quit(worker, worker.pending_driver)  # A replacement finished while this restart ran
+            worker.new_session(driver)
+            worker.restarts += 1
+            BROWSER_RESTARTS.inc()
+            self._idle.put_nowait(worker)
+            logger.success(f"Browser {worker.worker_id} restarted.")
+            return
+
+    def queue_browser_task(self, name, task):
+        """
+        Queues task(driver) for every session; each runs it when it is next leased (idle sessions at
+        the latest on the next liveness probe). Queuing a task under a pending name replaces it.
+        """
+        for worker in self.workers:
+            worker.queued_tasks[name] = task
+
+    @staticmethod
+    async def _run_queued_tasks(worker: BrowserWorker) -> bool:
+        """Runs the worker's queued tasks under the current lease; returns whether the session is still usable."""
+        while worker.queued_tasks and worker.driver is not None:
+            name = next(iter(worker.queued_tasks))
+            task = worker.queued_tasks.pop(name)
+            try:
+                await asyncio.to_thread(task, worker.driver)
+                logger.info(f"Ran browser task '{name}' on browser {worker.worker_id}.")
+            except Exception as e:
+                logger.error(f"Browser task '{name}' failed on browser {worker.worker_id}: {e}")
+                if isinstance(e, WebDriverException):
+                    worker.mark_unresponsive(f"Browser task '{name}' failed: {e}")
+                    return False
+        return worker.healthy
+
+    @staticmethod
+    def _probe(driver) -> Optional[int]:
+        """Raises if the session does not answer; returns its memory use."""
+        driver.execute_script("return document.readyState")
+        return browser_rss_bytes(driver)
+
+    async def _monitor(self):
+        """Periodically probes every idle session for liveness and memory use."""
+        while True:
+            await asyncio.sleep(BROWSER_HEALTH_CHECK_SECONDS)
+            for _ in range(self._idle.qsize()):
+                try:
+                    worker = self._idle.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                worker.busy = True
+                worker.leased_by = "liveness probe"
+                if not await self._run_queued_tasks(worker):
+                    self.release(worker)
+                    continue
+                try:
+                    rss_bytes = await asyncio.wait_for(asyncio.to_thread(self._probe, worker.driver), self.PROBE_TIMEOUT_SECONDS)
+                    worker.record_rss(rss_bytes)
+                except Exception as e:
+                    logger.error(f"Browser {worker.worker_id} failed its liveness probe: {e!r}")
+                    worker.mark_unresponsive(f"Liveness probe failed: {e!r}")
+                self.release(worker)
+
+    async def shutdown(self):
+        for task in list(self._tasks):  # The monitor and any restart still retrying
+            task.cancel()
+        for worker in self.workers:
+            for driver in (worker.driver, worker.pending_driver):
+                if driver:
+                    await asyncio.to_thread(driver.quit)
+            if worker.driver:
+                logger.warning(f"Selenium WebDriver {worker.worker_id} closed.")
+            worker.driver = worker.pending_driver = None
+
+    def status(self) -> list[dict]:
+        return [worker.status() for worker in self.workers]
+
+
+browser_pool = BrowserPool(BROWSER_POOL_SIZE)
+
+async def initialize_browser(credentials_ready=None):
+    await browser_pool.start(credentials_ready)
+
+async def shutdown_browser():
+    await browser_pool.shutdown()
+
+### Run a search on the next idle browser of the pool
+async def run_search(movie_title, tmdb_id=None, imdb_id=None):
+    worker = await browser_pool.acquire(f"search: {movie_title}")
+    logger.info(f"Browser {worker.worker_id} picked up movie request: {movie_title}")
+    start = time.perf_counter()
+    try:
+        outcome = await asyncio.to_thread(search_on_debrid, movie_title, worker.driver, tmdb_id, imdb_id)
+        worker.record_success(outcome)
+        return outcome
+    except Exception as ex:
+        worker.record_failure(ex)
+        raise
+    finally:
+        SEARCH_SECONDS.observe(time.perf_counter() - start)
+        if worker.driver:
+            await asyncio.to_thread(record_network_activity, worker.driver)
+            worker.record_rss(await asyncio.to_thread(browser_rss_bytes, worker.driver))
+        browser_pool.release(worker)
+
+### Search outcomes and per-movie backoff
+class SearchOutcome(str, Enum):
+    """Result of a search_on_debrid run; everything but CONFIRMED is a reason the movie is not in RD."""
+    CONFIRMED = "confirmed"
+    NO_SEARCH_HIT = "no_search_hit"  # DMM found no matching movie or no torrents for it
+    NO_CACHED_TORRENT = "no_cached_torrent"  # Torrents exist but none matched or was cached in RD
+    TIMEOUT = "timeout"
+    ERROR = "error"
+    NO_DETAILS = "no_details"  # Trakt did not return the movie's title and year, so it was never searched
+
+
+class SearchBackoff:
+    """
+    Persisted attempt history per TMDB ID. Every unsuccessful search pushes the movie's next
+    attempt out exponentially (base * 2^(attempts - 1), capped, with ±20% jitter); transient
+    failures back off faster. A confirmed search clears the history. The Overseerr media ID is kept
+    with the history, so due() hands the movie back for another search even though its unchanged
+    request is not fetched again by incremental Overseerr syncs.
+    """
+
+    # Timeouts, errors and failed Trakt lookups say little about the movie itself, so they are retried sooner
+    REASON_FACTORS = {SearchOutcome.TIMEOUT: 0.25, SearchOutcome.ERROR: 0.25, SearchOutcome.NO_DETAILS: 0.25}
+    JITTER = 0.2
+
+    def __init__(self, base_seconds, max_seconds):
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        with db_lock:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS search_attempts (
+                    tmdb_id INTEGER PRIMARY KEY,
+                    attempts INTEGER NOT NULL,
+                    last_reason TEXT NOT NULL,
+                    last_attempt_at REAL NOT NULL,
+                    next_attempt_at REAL NOT NULL,
+                    media_id INTEGER
+                )
+            """)
+            # Histories recorded before the media ID was kept
+            if "media_id" not in [column[1] for column in db.execute("PRAGMA table_info(search_attempts)")]:
+                db.execute("ALTER TABLE search_attempts ADD COLUMN media_id INTEGER")
+
+    def record(self, tmdb_id, outcome: SearchOutcome, media_id=None):
+        if outcome is SearchOutcome.CONFIRMED:
+            with db_lock:
+                db.execute("DELETE FROM search_attempts WHERE tmdb_id = ?", (tmdb_id,))
+            return
+
+        now = time.time()
+        with db_lock:
+            row = db.execute("SELECT attempts, media_id FROM search_attempts WHERE tmdb_id = ?", (tmdb_id,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            if media_id is None and row:
+                media_id = row[1]
+            delay = min(self.max_seconds, self.base_seconds * self.REASON_FACTORS.get(outcome, 1) * 2 ** (attempts - 1))
+            delay *= random.uniform(1 - self.JITTER, 1 + self.JITTER)
+            db.execute(
+                "INSERT OR REPLACE INTO search_attempts (tmdb_id, attempts, last_reason, last_attempt_at, next_attempt_at, media_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (tmdb_id, attempts, outcome.value, now, now + delay, media_id)
+            )
+        logger.info(f"TMDB ID {tmdb_id} not fulfilled ({outcome.value}, attempt {attempts}). Next attempt in {delay / 3600:.1f} hour(s).")
+
+    def next_attempt_at(self, tmdb_id) -> Optional[float]:
+        """Returns when the movie may be searched again, or None if it is due now."""
+        with db_lock:
+            row = db.execute("SELECT next_attempt_at FROM search_attempts WHERE tmdb_id = ?", (tmdb_id,)).fetchone()
+        if row is None or row[0] <= time.time():
+            return None
+        return row[0]
+
+    def due(self) -> List[tuple]:
+        """(tmdb_id, media_id) of every movie whose backoff has run out, longest overdue first."""
+        with db_lock:
+            return db.execute(
+                "SELECT tmdb_id, media_id FROM search_attempts WHERE next_attempt_at <= ? ORDER BY next_attempt_at",
+                (time.time(),)
+            ).fetchall()
+
+    def prune(self, tmdb_ids):
+        """Forgets the movies that are not among tmdb_ids (the requests Overseerr still has processing)."""
+        tmdb_ids = list(tmdb_ids)
+        with db_lock:
+            removed = db.execute(
+                f"DELETE FROM search_attempts WHERE tmdb_id NOT IN ({', '.join('?' * len(tmdb_ids))})", tmdb_ids
+            ).rowcount
+        if removed:
+            logger.info(f"Forgot the search history of {removed} movie(s) that are no longer requested.")
+
+    def stats(self) -> dict:
+        with db_lock:
+            rows = db.execute(
+                "SELECT last_reason, COUNT(*) FROM search_attempts WHERE next_attempt_at > ? GROUP BY last_reason",
+                (time.time(),)
+            ).fetchall()
+        return {"waiting": dict(rows)}
+
+
+search_backoff = SearchBackoff(SEARCH_BACKOFF_BASE_MINUTES * 60, SEARCH_BACKOFF_MAX_HOURS * 3600)
+
+class DmmMoviePages:
+    """
+    Remembers the DMM movie page (e.g. /movie/tt1375666) a title search found for a TMDB ID, once the
+    page's heading matched the movie, so movies without a known IMDb ID are opened directly next time.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        with db_lock:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS dmm_movie_pages (
+                    tmdb_id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def get(self, tmdb_id) -> Optional[str]:
+        with db_lock:
+            row = db.execute("SELECT path FROM dmm_movie_pages WHERE tmdb_id = ?", (tmdb_id,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, tmdb_id, path):
+        with db_lock:
+            db.execute(
+                "INSERT OR REPLACE INTO dmm_movie_pages (tmdb_id, path, updated_at) VALUES (?, ?, ?)",
+                (tmdb_id, path, time.time())
+            )
+
+    def delete(self, tmdb_id):
+        with db_lock:
+            db.execute("DELETE FROM dmm_movie_pages WHERE tmdb_id = ?", (tmdb_id,))
+
+    def stats(self) -> dict:
+        with db_lock:
+            entries = db.execute("SELECT COUNT(*) FROM dmm_movie_pages").fetchone()[0]
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+
+dmm_movie_pages = DmmMoviePages()
+
+### Persistent job queue
+class JobStore:
+    """
+    SQLite-backed queue of movie searches that survives restarts.
+
+    Jobs move from 'pending' to 'running' when a worker claims them and end up 'succeeded' or
+    'failed'. A job that raised an error goes to 'retry' until its available_at time. Running jobs
+    are leased for a visibility timeout; if the lease expires (or the process died while running
+    them) they are handed out again.
+
+    Jobs are deduplicated by TMDB ID: a request for a movie that already has an active job is
+    attached to that job, and one that finished within the dedup window is suppressed.
+    """
+
+    POLL_INTERVAL_SECONDS = 5
+    HISTORY_RETENTION_SECONDS = 7 * 24 * 3600
+
+    def __init__(self, visibility_timeout, max_attempts, retry_delay, dedup_window):
+        self.visibility_timeout = visibility_timeout
+        self.dedup_window = dedup_window
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._wakeup = asyncio.Event()
+        with db_lock:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    movie_title TEXT NOT NULL,
+                    tmdb_id INTEGER,
+                    media_id INTEGER,
+                    imdb_id TEXT,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    lease_expires_at REAL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_state_available_at ON jobs (state, available_at)")
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_tmdb_id ON jobs (tmdb_id, state)")
+            # Queues created before jobs carried the IMDb ID
+            if "imdb_id" not in [column[1] for column in db.execute("PRAGMA table_info(jobs)")]:
+                db.execute("ALTER TABLE jobs ADD COLUMN imdb_id TEXT")
+
+    @staticmethod
+    def _to_dict(cursor, row) -> Optional[dict]:
+        if row is None:
+            return None
+        return {column[0]: value for column, value in zip(cursor.description, row)}
+
+    def enqueue(self, movie_title, tmdb_id=None, media_id=None, imdb_id=None, retry=False) -> tuple[dict, str]:
+        """
+        Adds a search job unless the movie already has one. Returns the job and how the request was
+        handled: 'created', 'attached' to an active job, or 'recent' if a job finished within the
+        dedup window. An attached request's media ID is recorded on the existing job, so the job's
+        result marks it completed as well. A retry (the movie's search backoff ran out) is not held
+        back by the dedup window, since the backoff already decided when to search again.
+        """
+        now = time.time()
+        with db_lock:
+            if tmdb_id is not None:
+                cursor = db.execute(
+                    "SELECT * FROM jobs WHERE tmdb_id = ? AND (state IN ('pending', 'retry', 'running') "
+                    "OR (state IN ('succeeded', 'failed') AND updated_at >= ?)) "
+                    "ORDER BY state IN ('succeeded', 'failed'), id DESC LIMIT 1",
+                    (tmdb_id, now if retry else now - self.dedup_window)
+                )
+                job = self._to_dict(cursor, cursor.fetchone())
+                if job is not None:
+                    if job["state"] in ("succeeded", "failed"):
+                        return job, "recent"
+                    if media_id is not None and job["media_id"] is None:
+                        db.execute("UPDATE jobs SET media_id = ?, updated_at = ? WHERE id = ?", (media_id, now, job["id"]))
+                        job["media_id"] = media_id
+                    if imdb_id is not None and job["imdb_id"] is None:
+                        db.execute("UPDATE jobs SET imdb_id = ?, updated_at = ? WHERE id = ?", (imdb_id, now, job["id"]))
+                        job["imdb_id"] = imdb_id
+                    return job, "attached"
+
+            job_id = db.execute(
+                "INSERT INTO jobs (movie_title, tmdb_id, media_id, imdb_id, state, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'pending', ?, ?, ?)",
+                (movie_title, tmdb_id, media_id, imdb_id, now, now, now)
+            ).lastrowid
+            cursor = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            job = self._to_dict(cursor, cursor.fetchone())
+        self._wakeup.set()
+        return job, "created"
+
+    def has_active_job(self, tmdb_id) -> bool:
+        with db_lock:
+            return db.execute(
+                "SELECT 1 FROM jobs WHERE tmdb_id = ? AND state IN ('pending', 'retry', 'running') LIMIT 1", (tmdb_id,)
+            ).fetchone() is not None
+
+    def get(self, job_id) -> Optional[dict]:
+        with db_lock:
+            cursor = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            return self._to_dict(cursor, cursor.fetchone())
+
+    def claim(self) -> Optional[dict]:
+        """Leases the oldest job that is due, or returns None if there is nothing to do."""
+        now = time.time()
+        with db_lock:
+            self._requeue_expired(now)
+            cursor = db.execute(
+                "SELECT * FROM jobs WHERE state IN ('pending', 'retry') AND available_at <= ? ORDER BY available_at, id LIMIT 1",
+                (now,)
+            )
+            job = self._to_dict(cursor, cursor.fetchone())
+            if job is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET state = 'running', attempts = attempts + 1, lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                (now + self.visibility_timeout, now, job["id"])
+            )
+        job["state"] = "running"
+        job["attempts"] += 1
+        return job
+
+    async def next_job(self) -> dict:
+        """Waits until a job can be claimed and returns it."""
+        while True:
+            job = self.claim()
+            if job:
+                return job
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def finish(self, job_id, succeeded, error=None):
+        with db_lock:
+            db.execute(
+                "UPDATE jobs SET state = ?, lease_expires_at = NULL, last_error = ?, updated_at = ? WHERE id = ?",
+                ("succeeded" if succeeded else "failed", error, time.time(), job_id)
+            )
+
+    def retry_or_fail(self, job_id, error):
+        """Schedules another attempt after retry_delay, or fails the job once max_attempts is reached."""
+        now = time.time()
+        with db_lock:
+            db.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'retry' END, "
+                "available_at = ?, lease_expires_at = NULL, last_error = ?, updated_at = ? WHERE id = ?",
+                (self.max_attempts, now + self.retry_delay, error, now, job_id)
+            )
+
+    def _requeue_expired(self, now):
+        db.execute(
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'retry' END, "
+            "available_at = ?, lease_expires_at = NULL, last_error = 'Visibility timeout expired', updated_at = ? "
+            "WHERE state = 'running' AND lease_expires_at < ?",
+            (self.max_attempts, now, now, now)
+        )
+
+    def recover(self):
+        """Puts jobs that were running when the process stopped back in the queue and prunes old history."""
+        now = time.time()
+        with db_lock:
+            recovered = db.execute(
+                "UPDATE jobs SET state = 'pending', available_at = ?, lease_expires_at = NULL, updated_at = ? WHERE state = 'running'",
+                (now, now)
+            ).rowcount
+            db.execute(
+                "DELETE FROM jobs WHERE state IN ('succeeded', 'failed') AND updated_at < ?",
+                (now - self.HISTORY_RETENTION_SECONDS,)
+            )
+            pending = db.execute("SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'retry')").fetchone()[0]
+        if recovered:
+            logger.warning(f"Recovered {recovered} job(s) that were running when SeerrBridge stopped.")
+        logger.info(f"{pending} job(s) waiting in the queue.")
+
+    def counts(self) -> dict:
+        with db_lock:
+            rows = db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return dict(rows)
+
+
+job_store = JobStore(JOB_VISIBILITY_TIMEOUT_MINUTES * 60, JOB_MAX_ATTEMPTS, JOB_RETRY_DELAY_MINUTES * 60, DEDUP_WINDOW_MINUTES * 60)
 
 ### Function to process requests from the queue
 async def process_requests():
     while True:
-        movie_title = await request_queue.get()  # Wait for the next request in the queue
-        logger.info(f"Processing movie request: {movie_title}")
+        job = await job_store.next_job()  # Wait for the next request in the queue
+        movie_title = job["movie_title"]
+        logger.info(f"Processing movie request: {movie_title} (job {job['id']}, attempt {job['attempts']})")
         try:
-            await asyncio.to_thread(search_on_debrid, movie_title, driver)  # Process the request
+            # A movie that is already in the Real-Debrid library needs neither DMM nor a browser
+            owned = rd_library.find(movie_title)
+            if owned:
+                logger.success(f"{movie_title} is already in the Real-Debrid library ({owned['filename']}). Skipping the search.")
+                outcome = SearchOutcome.CONFIRMED
+            else:
+                outcome = await acquisition_backend.acquire(movie_title, job["tmdb_id"], job["imdb_id"])  # Process the request
         except Exception as ex:
             logger.critical(f"Error processing movie request {movie_title}: {ex}")
-        finally:
-            request_queue.task_done()  # Mark the request as done
+            SEARCH_OUTCOMES.labels(SearchOutcome.ERROR.value).inc()
+            job_store.retry_or_fail(job["id"], str(ex))
+            if job["tmdb_id"] is not None:
+                search_backoff.record(job["tmdb_id"], SearchOutcome.ERROR, job_store.get(job["id"])["media_id"])
+            continue
+
+        # Counted here for every backend and for movies found in the library index
+        SEARCH_OUTCOMES.labels(outcome.value).inc()
+        confirmed = outcome is SearchOutcome.CONFIRMED
+        job_store.finish(job["id"], confirmed, None if confirmed else outcome.value)
+        job = job_store.get(job["id"])  # Requests attached while the search ran may have added a media ID
+        if job["tmdb_id"] is not None:
+            search_backoff.record(job["tmdb_id"], outcome, job["media_id"])
+        if confirmed and job["media_id"] is not None:
+            await mark_media_completed(job["media_id"], job["tmdb_id"])
+        elif job["media_id"] is not None:
+            logger.info(f"Media {job['media_id']} was not properly confirmed. Skipping marking as completed.")
+
+async def mark_media_completed(media_id, tmdb_id):
+    if await mark_completed(media_id, tmdb_id):
+        logger.success(f"Marked media {media_id} as completed in overseerr")
+    else:
+        logger.error(f"Failed to mark media {media_id} as completed in overseerr")
 
 ### Function to add requests to the queue
-async def add_request_to_queue(movie_title):
-    if request_queue.full():
-        logger.warning(f"Request queue is full. Cannot add movie: {movie_title}")
-        return False
-    
-    await request_queue.put(movie_title)
-    logger.info(f"Added movie request to queue: {movie_title}")
+async def add_request_to_queue(movie_title, tmdb_id=None, media_id=None, imdb_id=None, retry=False):
+    job, outcome = job_store.enqueue(movie_title, tmdb_id, media_id, imdb_id, retry)
+    if outcome == "created":
+        logger.info(f"Added movie request to queue: {movie_title} (job {job['id']})")
+    elif outcome == "attached":
+        logger.info(f"Movie request {movie_title} is already queued as job {job['id']} ({job['state']}). Attached to it.")
+    else:
+        logger.info(f"Movie request {movie_title} was already handled by job {job['id']} ({job['state']}). Skipping.")
+        # Share the earlier result with a request that arrives with its Overseerr media ID
+        if job["state"] == "succeeded" and media_id is not None and job["media_id"] != media_id:
+            await mark_media_completed(media_id, tmdb_id)
     return True
 
-### Helper function to extract year from a string
-def extract_year(text, ignore_resolution=False):
-    if ignore_resolution:
-        # Remove resolution strings like "2160p"
-        text = re.sub(r'\b\d{3,4}p\b', '', text)
-    
-    # Extract the year using a regular expression
-    match = re.search(r'\b(19\d{2}|20\d{2})\b', text)
-    if match:
-        return int(match.group(0))
-    return None
+class TitleTranslator:
+    """
+    Translates titles to the target language, remembering every translation in memory and on disk.
+    ASCII titles are assumed to already be English and are returned untouched, and translate_many()
+    resolves all uncached titles of a page with a single request.
+    """
+
+    # Google's translate endpoint accepts up to 5000 characters per request
+    MAX_BATCH_CHARS = 4500
+
+    def __init__(self):
+        self._memory: Dict[tuple, str] = {}
+        self._memory_lock = threading.Lock()
+        self._local = threading.local()
+        with db_lock:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS translation_cache (
+                    source TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    translated TEXT NOT NULL,
+                    PRIMARY KEY (source, target_lang)
+                )
+            """)
 
+    @staticmethod
+    def needs_translation(title, target_lang='en'):
+        if not any(char.isalpha() for char in title):
+            return False
+        return not (target_lang == 'en' and title.isascii())
+
+    def _translator(self, target_lang):
+        # GoogleTranslator keeps per-request state, so every thread gets its own instance per language
+        translators = getattr(self._local, 'translators', None)
+        if translators is None:
+            translators = self._local.translators = {}
+        if target_lang not in translators:
+            translators[target_lang] = GoogleTranslator(source='auto', target=target_lang)
+        return translators[target_lang]
+
+    def _lookup(self, titles, target_lang) -> Dict[str, str]:
+        found = {}
+        with self._memory_lock:
+            for title in titles:
+                if (title, target_lang) in self._memory:
+                    found[title] = self._memory[(title, target_lang)]
+
+        missing = [title for title in titles if title not in found]
+        if missing:
+            placeholders = ",".join("?" * len(missing))
+            with db_lock:
+                rows = db.execute(
+                    f"SELECT source, translated FROM translation_cache WHERE target_lang = ? AND source IN ({placeholders})",
+                    (target_lang, *missing)
+                ).fetchall()
+            with self._memory_lock:
+                for source, translated in rows:
+                    self._memory[(source, target_lang)] = translated
+                    found[source] = translated
+        return found
+
+    def _store(self, translations: Dict[str, str], target_lang):
+        with self._memory_lock:
+            for source, translated in translations.items():
+                self._memory[(source, target_lang)] = translated
+        with db_lock:
+            db.executemany(
+                "INSERT OR REPLACE INTO translation_cache (source, target_lang, translated) VALUES (?, ?, ?)",
+                [(source, target_lang, translated) for source, translated in translations.items()]
+            )
 
-# Initialize the inflect engine for number-word conversion
-p = inflect.engine()
+    def _translate_chunk(self, titles, target_lang) -> Dict[str, str]:
+        translator = self._translator(target_lang)
+        if len(titles) > 1:
+            # One title per line; only trust the result if every line comes back
+            translated_lines = (translator.translate("\n".join(titles)) or "").split("\n")
+            if len(translated_lines) == len(titles):
+                return {title: line.strip() or title for title, line in zip(titles, translated_lines)}
+            logger.warning("Batch translation returned a different number of lines. Translating titles one by one.")
+        return {title: translator.translate(title) or title for title in titles}
+
+    def translate_many(self, titles, target_lang='en') -> Dict[str, str]:
+        """
+        Translates a list of titles and returns a mapping of original title to translated title.
+        Titles that fail to translate map to themselves.
+        """
+        results = {}
+        pending = []
+        for title in dict.fromkeys(titles):
+            if self.needs_translation(title, target_lang):
+                pending.append(title)
+            else:
+                results[title] = title
+
+        if pending:
+            cached = self._lookup(pending, target_lang)
+            results.update(cached)
+            pending = [title for title in pending if title not in cached]
+
+        chunk = []
+        for title in pending + [None]:
+            if title is not None and len(chunk) + sum(map(len, chunk)) + len(title) < self.MAX_BATCH_CHARS:
+                chunk.append(title)
+                continue
+            if chunk:
+                try:
+                    translations = self._translate_chunk(chunk, target_lang)
+                    self._store(translations, target_lang)
+                    results.update(translations)
+                    for source, translated in translations.items():
+                        logger.info(f"Translated '{source}' to '{translated}'")
+                except Exception as e:
+                    logger.error(f"Error translating titles {chunk}: {e}")
+                    results.update({source: source for source in chunk})  # Keep the originals if translation fails
+            chunk = [title] if title is not None else []
+
+        return results
+
+    def translate(self, title, target_lang='en'):
+        return self.translate_many([title], target_lang)[title]
+
+
+title_translator = TitleTranslator()
 
 def translate_title(title, target_lang='en'):
     """
     Detects the language of the input title and translates it to the target language.
     """
-    try:
-        translator = GoogleTranslator(source='auto', target=target_lang)
-        translated_title = translator.translate(title)
-        logger.info(f"Translated '{title}' to '{translated_title}'")
-        return translated_title
-    except Exception as e:
-        logger.error(f"Error translating title '{title}': {e}")
-        return title  # Return the original title if translation fails
+    return title_translator.translate(title, target_lang)
+
+
+class TitleVariants(NamedTuple):
+    """Every form of a title the matchers compare, lowercased, plus the year found in it."""
+    cleaned: str
+    normalized: str
+    cleaned_word: str
+    normalized_word: str
+    cleaned_digit: str
+    normalized_digit: str
+    year: Optional[int]
+
+
+class NormalizationEngine:
+    """
+    Title normalization with every pattern compiled once. Results are memoised per distinct string,
+    so the titles DMM repeats across pages and candidates are only normalized the first time.
+    """
+
+    NUMBER_WORDS = {
+        "zero": "0", "one": "1", "two": "2", "three": "3", "four": "4",
+        "five": "5", "six": "6", "seven": "7", "eight": "8", "nine": "9",
+        "ten": "10", "eleven": "11", "twelve": "12", "thirteen": "13",
+        "fourteen": "14", "fifteen": "15", "sixteen": "16", "seventeen": "17",
+        "eighteen": "18", "nineteen": "19", "twenty": "20"
+    }
+
+    PUNCTUATION = re.compile(r"[,:;'-]")
+    WHITESPACE = re.compile(r"\s+")
+    DIGITS = re.compile(r"\b\d+\b")
+    # One alternation for all number words, longest first, instead of a substitution per word
+    WORDS = re.compile(
+        r"\b(" + "|".join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r")\b", re.IGNORECASE
+    )
+    YEAR = re.compile(r"\b(19\d{2}|20\d{2})\b")
+    RESOLUTION = re.compile(r"\b\d{3,4}p\b")
+
+    def __init__(self, translator, cache_size=50000):
+        self._translator = translator
+        self._inflect = inflect.engine()
+        self._number_to_words = lru_cache(maxsize=4096)(self._inflect.number_to_words)
+        self.extract_year = lru_cache(maxsize=cache_size)(self._extract_year)
+        self.clean_translated = lru_cache(maxsize=cache_size)(self._clean_translated)
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+        self._variants = lru_cache(maxsize=cache_size)(self._compute_variants)
+
+    def _extract_year(self, text, ignore_resolution=False):
+        if ignore_resolution:
+            # Remove resolution strings like "2160p"
+            text = self.RESOLUTION.sub('', text)
+        match = self.YEAR.search(text)
+        return int(match.group(0)) if match else None
+
+    def _clean_translated(self, translated_title):
+        # Remove commas, hyphens, colons, semicolons and apostrophes, then join words with dots
+        cleaned_title = self.PUNCTUATION.sub('', translated_title)
+        return self.WHITESPACE.sub('.', cleaned_title).lower()
+
+    @staticmethod
+    def _normalize(title):
+        # Replace ellipsis with three periods and smart apostrophes with regular apostrophes
+        return title.replace('…', '...').replace('’', "'").strip()
+
+    def clean(self, title, target_lang='en'):
+        """Translates the title (translations are cached by the translator) and strips punctuation."""
+        return self.clean_translated(self._translator.translate(title, target_lang))
+
+    def numbers_to_words(self, title):
+        return self.DIGITS.sub(lambda match: self._number_to_words(match.group()), title)
+
+    def words_to_numbers(self, title):
+        return self.WORDS.sub(lambda match: self.NUMBER_WORDS[match.group().lower()], title)
+
+    def _compute_variants(self, title, translated_title):
+        cleaned = self.clean_translated(translated_title)
+        normalized = self.normalize(title)
+        return TitleVariants(
+            cleaned=cleaned,
+            normalized=normalized.lower(),
+            cleaned_word=self.numbers_to_words(cleaned).lower(),
+            normalized_word=self.numbers_to_words(normalized).lower(),
+            cleaned_digit=self.words_to_numbers(cleaned).lower(),
+            normalized_digit=self.words_to_numbers(normalized).lower(),
+            year=self.extract_year(title),
+        )
 
+    def variants(self, title, target_lang='en') -> TitleVariants:
+        """
+        Returns every variant of a title in one call. The cache is keyed on the raw title and its
+        translation, so a title whose translation failed earlier is redone once it succeeds.
+        """
+        return self._variants(title, self._translator.translate(title, target_lang))
+
+    def stats(self):
+        info = self._variants.cache_info()
+        return {"entries": info.currsize, "hits": info.hits, "misses": info.misses}
+
+
+title_normalizer = NormalizationEngine(title_translator)
+
+def extract_year(text, ignore_resolution=False):
+    """Returns the first year (1900-2099) in the text, optionally ignoring resolutions like 2160p."""
+    return title_normalizer.extract_year(text, ignore_resolution)
 
 def clean_title(title, target_lang='en'):
     """
     Cleans the movie title by removing commas, hyphens, colons, semicolons, and apostrophes,
     translating it to the target language, and converting to lowercase.
     """
-    # Translate the title to the target language
-    translated_title = translate_title(title, target_lang)
-
-    # Remove commas, hyphens, colons, semicolons, and apostrophes
-    cleaned_title = re.sub(r"[,:;'-]", '', translated_title)
-    # Replace multiple spaces with a single dot
-    cleaned_title = re.sub(r'\s+', '.', cleaned_title)
-    # Convert to lowercase for comparison
-    return cleaned_title.lower()
+    return title_normalizer.clean(title, target_lang)
 
 def normalize_title(title, target_lang='en'):
     """
-    Normalizes the title by ensuring there are no unnecessary spaces or dots,
-    translating it to the target language, and converting to lowercase.
+    Normalizes the title by replacing ellipses and smart apostrophes and trimming whitespace.
     """
-    # Replace ellipsis with three periods
-    title = title.replace('…', '...')
-    # Replace smart apostrophes with regular apostrophes
-    title = title.replace('’', "'")
-    # Further normalization can be added here if required
-    return title.strip()
-    # Translate the title to the target language
-    translated_title = translate_title(title, target_lang)
-
-    # Replace multiple spaces with a single space and dots with spaces
-    normalized_title = re.sub(r'\s+', ' ', translated_title)
-    normalized_title = normalized_title.replace('.', ' ')
-    # Convert to lowercase
-    return normalized_title.lower()
-
+    return title_normalizer.normalize(title)
 
 def replace_numbers_with_words(title):
     """
     Replaces digits with their word equivalents (e.g., "3" to "three").
     """
-    return re.sub(r'\b\d+\b', lambda x: p.number_to_words(x.group()), title)
+    return title_normalizer.numbers_to_words(title)
 
 def replace_words_with_numbers(title):
     """
     Replaces number words with their digit equivalents (e.g., "three" to "3").
     """
-    words_to_numbers = {
-        "zero": "0", "one": "1", "two": "2", "three": "3", "four": "4",
-        "five": "5", "six": "6", "seven": "7", "eight": "8", "nine": "9",
-        "ten": "10", "eleven": "11", "twelve": "12", "thirteen": "13",
-        "fourteen": "14", "fifteen": "15", "sixteen": "16", "seventeen": "17",
-        "eighteen": "18", "nineteen": "19", "twenty": "20"
-        # Add more mappings as needed
-    }
+    return title_normalizer.words_to_numbers(title)
 
-    # Replace word numbers with digits
-    for word, digit in words_to_numbers.items():
-        title = re.sub(rf'\b{word}\b', digit, title, flags=re.IGNORECASE)
-    return title
 
+@dataclass
+class TitleMatch:
+    """Score of a single page candidate against the requested movie."""
+    index: int  # Position of the candidate on the page
+    title: str
+    year: Optional[int]
+    score: float  # Best fuzzy score over all title variants (0-100)
+    year_delta: Optional[int]
+    matched: bool
 
-# Function to fetch media requests from Overseerr
-def get_overseerr_media_requests() -> list[dict]:
-    url = f"{OVERSEERR_API_BASE_URL}/request?take=500&filter=approved&sort=added"
+
+class TitleMatcher:
+    """
+    Precomputes every variant of the requested movie title once and scores all candidates of a page
+    against them in a single batched rapidfuzz call. The rank_* methods return the candidates best
+    match first, with mismatches at the end.
+    """
+
+    SEARCH_RESULT_THRESHOLD = 69
+    TORRENT_THRESHOLD = 75
+    VARIANT_KINDS = ("cleaned", "normalized", "cleaned_word", "normalized_word", "cleaned_digit", "normalized_digit")
+
+    def __init__(self, movie_title):
+        self.movie_title = movie_title
+        self.expected_year = extract_year(movie_title)
+        self.base_title = movie_title.split('(')[0].strip()
+        self.variants = title_normalizer.variants(self.base_title)
+        self.normalized = normalize_title(self.base_title)
+
+    @staticmethod
+    def title_variants(title) -> TitleVariants:
+        return title_normalizer.variants(title, target_lang='en')
+
+    def _year_delta(self, year):
+        if self.expected_year is None or year is None:
+            return None
+        return abs(year - self.expected_year)
+
+    def _year_matches(self, year, tolerance):
+        if self.expected_year is None:
+            return True
+        return year is not None and abs(year - self.expected_year) <= tolerance
+
+    def _best_scores(self, candidate_forms: List[tuple], kinds, scorer):
+        """Scores each candidate's forms (one per kind) against the same form of the requested title in one cdist call."""
+        if not candidate_forms:
+            return []
+        queries = [form for forms in candidate_forms for form in forms]
+        choices = [getattr(self.variants, kind) for kind in kinds]
+        matrix = process.cdist(queries, choices, scorer=scorer, workers=-1)
+        best_scores = []
+        for row in range(len(candidate_forms)):
+            best_scores.append(max(
+                float(round(matrix[row * len(kinds) + column][column])) for column in range(len(kinds))
+            ))
+        return best_scores
+
+    @staticmethod
+    def _ranked(matches: List[TitleMatch]) -> List[TitleMatch]:
+        return sorted(matches, key=lambda match: (
+            not match.matched,
+            -match.score,
+            match.year_delta if match.year_delta is not None else 0,
+            match.index
+        ))
+
+    def rank_search_results(self, results: List[tuple]) -> List[TitleMatch]:
+        """Ranks DMM search results given as (title, year text) pairs; titles must match and years be within ±1."""
+        titles = [title.strip() for title, _ in results]
+        candidate_forms = [(normalize_title(title).lower(),) for title in titles]
+        scores = self._best_scores(candidate_forms, ("normalized",), fuzz.ratio)
+
+        matches = []
+        for index, (title, (_, year_text), score) in enumerate(zip(titles, results, scores)):
+            year = extract_year(year_text or '')
+            matches.append(TitleMatch(
+                index=index, title=title, year=year, score=score, year_delta=self._year_delta(year),
+                matched=score >= self.SEARCH_RESULT_THRESHOLD and self._year_matches(year, 1)
+            ))
+        return self._ranked(matches)
+
+    def rank_red_buttons(self, titles: List[str]) -> List[TitleMatch]:
+        """Ranks the titles of boxes already in the RD library; titles must match and years be within ±2."""
+        bases = [title.split('(')[0].strip() for title in titles]
+        title_translator.translate_many(bases)
+        candidate_forms = [(clean_title(base, target_lang='en'),) for base in bases]
+        scores = self._best_scores(candidate_forms, ("cleaned",), fuzz.partial_ratio)
+
+        matches = []
+        for index, (title, base, score) in enumerate(zip(titles, bases, scores)):
+            year = extract_year(title, ignore_resolution=True)
+            normalized = normalize_title(base, target_lang='en')
+            # Backwards title check: the requested title starts with the box title
+            title_matched = score >= self.TORRENT_THRESHOLD or (normalized and self.normalized.startswith(normalized))
+            matches.append(TitleMatch(
+                index=index, title=title, year=year, score=score, year_delta=self._year_delta(year),
+                matched=bool(title_matched) and self._year_matches(year, 2)
+            ))
+        return self._ranked(matches)
+
+    def rank_torrents(self, titles: List[str]) -> List[TitleMatch]:
+        """Ranks torrent box titles; any title variant must match and the year (required) be within ±1."""
+        years = [extract_year(title) for title in titles]
+        bases = [title.split(str(year))[0].strip() if year else title for title, year in zip(titles, years)]
+        title_translator.translate_many([base for base, year in zip(bases, years) if year])
+        candidate_variants = [self.title_variants(base) if year else None for base, year in zip(bases, years)]
+        scored = [variants[:len(self.VARIANT_KINDS)] for variants in candidate_variants if variants is not None]
+        scores = iter(self._best_scores(scored, self.VARIANT_KINDS, fuzz.partial_ratio))
+
+        matches = []
+        for index, (title, year, variants) in enumerate(zip(titles, years, candidate_variants)):
+            score = next(scores) if variants is not None else 0.0
+            matches.append(TitleMatch(
+                index=index, title=title, year=year, score=score, year_delta=self._year_delta(year),
+                matched=year is not None and score >= self.TORRENT_THRESHOLD and self._year_matches(year, 1)
+            ))
+        return self._ranked(matches)
+
+
+# Function to stream approved media requests from Overseerr, most recently modified first
+async def iter_overseerr_requests():
+    """
+    Walks all pages of approved Overseerr requests sorted by last modification, fetching the
+    next page only when the caller has consumed the current one. Raises on a failed page.
+    """
     headers = {
         "X-Api-Key": OVERSEERR_API_KEY
     }
-    response = requests.get(url, headers=headers)
-    
-    if response.status_code != 200:
-        logger.error(f"Failed to fetch requests from Overseerr: {response.status_code}")
-        return []
-    
-    data = response.json()
-    logger.info(f"Fetched {len(data.get('results', []))} requests from Overseerr")
-    
-    if not data.get('results'):
-        return []
-    
-    # Filter requests that are in processing state (status 3)
-    processing_requests = [item for item in data['results'] if item['status'] == 2 and item['media']['status'] == 3]
+    skip = 0
+    while True:
+        url = f"{OVERSEERR_API_BASE_URL}/request?take={OVERSEERR_PAGE_SIZE}&skip={skip}&filter=approved&sort=modified"
+        response = await http_request("overseerr", "GET", url, headers=headers)
+        if response.status_code != 200:
+            raise httpx.HTTPStatusError(f"Overseerr returned {response.status_code}", request=response.request, response=response)
+
+        data = response.json()
+        results = data.get('results') or []
+        for item in results:
+            yield item
+
+        skip += len(results)
+        total = data.get('pageInfo', {}).get('results', 0)
+        if not results or skip >= total:
+            return
+
+class OverseerrSync(NamedTuple):
+    """Result of a pass over Overseerr's approved requests."""
+    requests: List[dict]  # The approved requests whose media is still processing
+    updated: List[str]  # updatedAt of every fetched request, newest first
+    full_sync: bool
+    complete: bool  # False if a page could not be fetched
+
+
+# Function to fetch media requests from Overseerr
+async def get_overseerr_media_requests() -> OverseerrSync:
+    """
+    Returns the approved requests whose media is still processing. Only requests modified since the
+    stored watermark are fetched, except for a periodic full reconciliation pass. The watermark is
+    moved by advance_overseerr_watermark() once the requests have been queued.
+    """
+    watermark = get_sync_state("overseerr_watermark")
+    last_full_sync = float(get_sync_state("overseerr_last_full_sync", 0))
+    full_sync = watermark is None or time.time() - last_full_sync >= OVERSEERR_FULL_SYNC_HOURS * 3600
+    logger.info("Running full Overseerr sync." if full_sync else f"Fetching Overseerr requests modified after {watermark}.")
+
+    updated = []
+    processing_requests = []
+    try:
+        async with aclosing(iter_overseerr_requests()) as overseerr_requests:
+            async for item in overseerr_requests:
+                updated_at = item.get('updatedAt') or ''
+                if not full_sync and updated_at <= watermark:
+                    break  # Everything from here on was seen by an earlier sync
+                updated.append(updated_at)
+
+                # Filter requests that are in processing state (status 3)
+                if item['status'] == 2 and item['media']['status'] == 3:
+                    processing_requests.append(item)
+    except (httpx.HTTPError, ValueError) as e:
+        # Keep the watermark so the next run fetches the missing pages again
+        logger.error(f"Failed to fetch requests from Overseerr: {e!r}")
+        return OverseerrSync(processing_requests, updated, full_sync, complete=False)
+
+    logger.info(f"Fetched {len(updated)} requests from Overseerr")
     logger.info(f"Filtered {len(processing_requests)} processing requests")
-    return processing_requests
+    return OverseerrSync(processing_requests, updated, full_sync, complete=True)
+
+def advance_overseerr_watermark(sync: OverseerrSync):
+    """
+    Moves the watermark past the fetched requests. Requests that could not be queued (backing off, or
+    their Trakt lookup failed) have a search_attempts entry, so queue_due_retries() picks them up again.
+    """
+    if sync.updated and max(sync.updated) > (get_sync_state("overseerr_watermark") or ""):
+        set_sync_state("overseerr_watermark", max(sync.updated))
+    if sync.full_sync:
+        set_sync_state("overseerr_last_full_sync", time.time())
 
 # Trakt API rate limit: 1000 calls every 5 minutes
 TRAKT_RATE_LIMIT = 1000
 TRAKT_RATE_LIMIT_PERIOD = 5 * 60  # 5 minutes in seconds
 
-trakt_api_calls = 0
-last_reset_time = time.time()
+class AsyncRateLimiter:
+    """
+    Allows at most `limit` calls in any `period` seconds. Callers that are over budget wait
+    with asyncio.sleep (never blocking the event loop) and are served in arrival order. The
+    upstream's Retry-After and X-Ratelimit headers can pause the limiter until its window resets.
+    """
+
+    def __init__(self, limit, period, name="Trakt API"):
+        self.limit = limit
+        self.period = period
+        self.name = name
+        self.waiting = 0
+        self._calls = deque()  # Monotonic timestamps of the calls in the current window
+        self._lock = asyncio.Lock()  # asyncio.Lock wakes its waiters in FIFO order
+        self._paused_until = 0.0
+
+    def _prune(self, now):
+        while self._calls and now - self._calls[0] >= self.period:
+            self._calls.popleft()
+
+    @property
+    def remaining(self):
+        now = time.monotonic()
+        if now < self._paused_until:
+            return 0
+        self._prune(now)
+        return max(0, self.limit - len(self._calls))
+
+    async def acquire(self):
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._prune(now)
+                    delay = self._paused_until - now
+                    if delay <= 0 and len(self._calls) >= self.limit:
+                        delay = self._calls[0] + self.period - now
+                    if delay <= 0:
+                        break
+                    logger.warning(f"{self.name} rate limit reached. Waiting {delay:.1f} seconds for the next slot.")
+                    await asyncio.sleep(delay)
+                self._calls.append(now)
+        finally:
+            self.waiting -= 1
+
+    def pause(self, seconds):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers):
+        """Pauses the limiter when the upstream reports an exhausted budget."""
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            try:
+                self.pause(float(retry_after))
+            except ValueError:
+                logger.warning(f"Ignoring invalid Retry-After header: {retry_after}")
+
+        rate_limit = headers.get("X-Ratelimit")
+        if rate_limit:
+            try:
+                rate_limit = json.loads(rate_limit)
+                if int(rate_limit.get("remaining", 1)) <= 0 and rate_limit.get("until"):
+                    until = datetime.fromisoformat(rate_limit["until"].replace("Z", "+00:00"))
+                    self.pause((until - datetime.now(timezone.utc)).total_seconds())
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.warning(f"Ignoring invalid X-Ratelimit header {rate_limit}: {e}")
+
+    def status(self) -> dict:
+        return {
+            "limit": self.limit,
+            "period_seconds": self.period,
+            "remaining": self.remaining,
+            "waiting": self.waiting,
+            "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 1),
+        }
+
+
+trakt_rate_limiter = AsyncRateLimiter(TRAKT_RATE_LIMIT, TRAKT_RATE_LIMIT_PERIOD)
+
+class TraktCache:
+    """
+    On-disk cache of Trakt movie details keyed by TMDB ID, with a TTL and least-recently-used
+    eviction once more than max_entries rows are stored.
+    """
+
+    def __init__(self, ttl_seconds, max_entries):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with db_lock:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS trakt_cache (
+                    tmdb_id TEXT PRIMARY KEY,
+                    details TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS trakt_cache_last_access ON trakt_cache (last_access)")
+
+    def get(self, tmdb_id) -> Optional[dict]:
+        now = time.time()
+        with db_lock:
+            row = db.execute(
+                "SELECT details, fetched_at FROM trakt_cache WHERE tmdb_id = ?", (str(tmdb_id),)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                TRAKT_CACHE_LOOKUPS.labels("miss").inc()
+                return None
+            db.execute("UPDATE trakt_cache SET last_access = ? WHERE tmdb_id = ?", (now, str(tmdb_id)))
+        self.hits += 1
+        TRAKT_CACHE_LOOKUPS.labels("hit").inc()
+        return json.loads(row[0])
+
+    def set(self, tmdb_id, details: dict):
+        now = time.time()
+        with db_lock:
+            db.execute(
+                "INSERT OR REPLACE INTO trakt_cache (tmdb_id, details, fetched_at, last_access) VALUES (?, ?, ?, ?)",
+                (str(tmdb_id), json.dumps(details, ensure_ascii=False), now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        count = db.execute("SELECT COUNT(*) FROM trakt_cache").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            db.execute(
+                "DELETE FROM trakt_cache WHERE tmdb_id IN (SELECT tmdb_id FROM trakt_cache ORDER BY last_access LIMIT ?)",
+                (excess,)
+            )
+            self.evictions += excess
+
+    def stats(self) -> dict:
+        with db_lock:
+            size = db.execute("SELECT COUNT(*) FROM trakt_cache").fetchone()[0]
+        return {"size": size, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
 
-def get_movie_details_from_trakt(tmdb_id: str) -> Optional[dict]:
-    global trakt_api_calls, last_reset_time
 
-    # Check if the rate limit period has elapsed
-    current_time = time.time()
-    if current_time - last_reset_time >= TRAKT_RATE_LIMIT_PERIOD:
-        trakt_api_calls = 0
-        last_reset_time = current_time
+trakt_cache = TraktCache(TRAKT_CACHE_TTL_HOURS * 3600, TRAKT_CACHE_MAX_ENTRIES)
 
-    # Check if we have reached the rate limit
-    if trakt_api_calls >= TRAKT_RATE_LIMIT:
-        logger.warning("Trakt API rate limit reached. Waiting for the next period.")
-        time.sleep(TRAKT_RATE_LIMIT_PERIOD - (current_time - last_reset_time))
-        trakt_api_calls = 0
-        last_reset_time = time.time()
+async def get_movie_details_from_trakt(tmdb_id: str) -> Optional[dict]:
+    cached_details = trakt_cache.get(tmdb_id)
+    if cached_details and "ids" in cached_details:  # Entries cached before the IDs were kept are fetched again
+        logger.info(f"Using cached Trakt details for TMDB ID {tmdb_id}")
+        return cached_details
 
     url = f"https://api.trakt.tv/search/tmdb/{tmdb_id}?type=movie"
     headers = {
@@ -555,62 +2198,100 @@ def get_movie_details_from_trakt(tmdb_id: str) -> Optional[dict]:
     }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        trakt_api_calls += 1
-        
+        for attempt in range(2):
+            await trakt_rate_limiter.acquire()
+            response = await http_request("trakt", "GET", url, headers=headers)
+            trakt_rate_limiter.update_from_headers(response.headers)
+            if response.status_code != 429:
+                break
+            # The limiter is now paused until Trakt's window resets, so one retry is enough
+            logger.warning(f"Trakt API returned 429 for TMDB ID {tmdb_id}.")
+
         if response.status_code == 200:
             data = response.json()
             if data and isinstance(data, list) and data:
                 movie_info = data[0]['movie']
-                return {
+                movie_details = {
                     "title": movie_info['title'],
-                    "year": movie_info['year']
+                    "year": movie_info['year'],
+                    "ids": movie_info.get('ids', {})  # trakt, slug, imdb and tmdb
                 }
+                trakt_cache.set(tmdb_id, movie_details)
+                return movie_details
             else:
                 logger.error("Movie details for ID not found in Trakt API response.")
                 return None
         else:
             logger.error(f"Trakt API request failed with status code {response.status_code}")
             return None
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching movie details from Trakt API: {e}")
+    except httpx.HTTPError as e:
+        logger.error(f"Error fetching movie details from Trakt API: {e!r}")
         return None
 
 ### Process the fetched messages (newest to oldest)
+overseerr_check_lock = asyncio.Lock()
+
 async def process_movie_requests():
-    requests = get_overseerr_media_requests()
-    if not requests:
-        logger.info("No requests to process")
+    # The initial check, the scheduled rechecks and manual runs only enqueue jobs, so one at a time is enough
+    if overseerr_check_lock.locked():
+        logger.info("A check of Overseerr requests is already running. Skipping this one.")
         return
-    
-    for request in requests:
+    async with overseerr_check_lock:
+        await queue_overseerr_requests()
+
+async def queue_overseerr_requests():
+    sync = await get_overseerr_media_requests()
+    if not sync.requests:
+        logger.info("No requests to process")
+
+    for request in sync.requests:
         tmdb_id = request['media']['tmdbId']
         media_id = request['media']['id']
         logger.info(f"Processing request with TMDB ID {tmdb_id} and media ID {media_id}")
+
+        next_attempt_at = search_backoff.next_attempt_at(tmdb_id)
+        if next_attempt_at:
+            logger.info(f"Skipping TMDB ID {tmdb_id} until {datetime.fromtimestamp(next_attempt_at):%Y-%m-%d %H:%M} (backing off).")
+            continue
         
-        movie_details = get_movie_details_from_trakt(tmdb_id)
+        movie_details = await get_movie_details_from_trakt(tmdb_id)
         if not movie_details:
             logger.error(f"Failed to get movie details for TMDB ID {tmdb_id}")
+            search_backoff.record(tmdb_id, SearchOutcome.NO_DETAILS, media_id)  # Looked up again by queue_due_retries()
             continue
         
         movie_title = f"{movie_details['title']} ({movie_details['year']})"
-        logger.info(f"Processing movie request: {movie_title}")
-        
-        try:
-            confirmation_flag = await asyncio.to_thread(search_on_debrid, movie_title, driver)  # Process the request and get the confirmation flag
-            if confirmation_flag:
-                if mark_completed(media_id, tmdb_id):
-                    logger.success(f"Marked media {media_id} as completed in overseerr")
-                else:
-                    logger.error(f"Failed to mark media {media_id} as completed in overseerr")
-            else:
-                logger.info(f"Media {media_id} was not properly confirmed. Skipping marking as completed.")
-        except Exception as ex:
-            logger.critical(f"Error processing movie request {movie_title}: {ex}")
 
-    logger.info("Finished processing all current requests. Waiting for new requests.")
+        # The queue workers run the search and mark the media completed once it is confirmed
+        await add_request_to_queue(movie_title, tmdb_id, media_id, movie_details['ids'].get('imdb'))
+
+    if sync.complete:
+        advance_overseerr_watermark(sync)
+        if sync.full_sync:
+            # Movies whose request is no longer processing are not retried any more
+            search_backoff.prune(request['media']['tmdbId'] for request in sync.requests)
+
+    await queue_due_retries()
+    logger.info("Queued all current requests. Waiting for new requests.")
 
-def mark_completed(media_id: int, tmdb_id: int) -> bool:
+async def queue_due_retries():
+    """
+    Queues every movie whose search backoff has run out. Incremental syncs only fetch requests that
+    changed, so a request that is still processing after a failed search is retried from here.
+    """
+    for tmdb_id, media_id in search_backoff.due():
+        if job_store.has_active_job(tmdb_id):
+            continue  # Already waiting in the queue or being searched
+        movie_details = await get_movie_details_from_trakt(tmdb_id)
+        if not movie_details:
+            logger.error(f"Failed to get movie details for TMDB ID {tmdb_id}")
+            search_backoff.record(tmdb_id, SearchOutcome.NO_DETAILS, media_id)
+            continue
+        movie_title = f"{movie_details['title']} ({movie_details['year']})"
+        logger.info(f"Retrying {movie_title} (TMDB ID {tmdb_id}); its search backoff has run out.")
+        await add_request_to_queue(movie_title, tmdb_id, media_id, movie_details['ids'].get('imdb'), retry=True)
+
+async def mark_completed(media_id: int, tmdb_id: int) -> bool:
     """Mark item as completed in overseerr"""
     url = f"{OVERSEERR_API_BASE_URL}/media/{media_id}/available"
     headers = {
@@ -620,7 +2301,8 @@ def mark_completed(media_id: int, tmdb_id: int) -> bool:
     data = {"is4k": False}
     
     try:
-        response = requests.post(url, headers=headers, json=data)
+        # Marking media available twice is harmless, so this POST is retried like a GET
+        response = await http_request("overseerr", "POST", url, retry=True, headers=headers, json=data)
         response_data = response.json()  # Parse the JSON response
         
         if response.status_code == 200:
@@ -634,71 +2316,351 @@ def mark_completed(media_id: int, tmdb_id: int) -> bool:
         else:
             logger.error(f"Failed to mark media as completed in overseerr with id {media_id}: Status code {response.status_code}, Response: {response_data}")
             return False
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to mark media as completed in overseerr with id {media_id}: {str(e)}")
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to mark media as completed in overseerr with id {media_id}: {e!r}")
         return False
     except json.JSONDecodeError as e:
         logger.error(f"Failed to decode JSON response for media {media_id}: {str(e)}")
         return False
 
 
-def prioritize_buttons_in_box(result_box):
+### Page snapshots: read everything the matching logic needs in a single WebDriver round trip.
+# Every element is tagged with a data-sb-* index so it can be located again for clicking.
+SEARCH_RESULTS_SNAPSHOT_SCRIPT = """
+const text = (element) => element ? element.innerText.trim() : null;
+return Array.from(document.querySelectorAll("a[href*='/movie/']")).map((link, index) => {
+    link.setAttribute('data-sb-result', index);
+    return {
+        index: index,
+        href: link.getAttribute('href'),
+        title: text(link.querySelector('h3')),
+        year_text: text(link.querySelector("div[class*='text-gray-600']"))
+    };
+});
+"""
+
+MOVIE_PAGE_SNAPSHOT_SCRIPT = """
+const text = (element) => element ? element.innerText.trim() : null;
+const statuses = Array.from(document.querySelectorAll("div[role='status'][aria-live*='polite']")).map(text);
+const redButtonTitles = Array.from(document.querySelectorAll("button[class*='bg-red-900/30']")).map((button) => {
+    const container = button.closest("div[class*='border-2']");
+    return container ? text(container.querySelector('h2')) : null;
+});
+const boxes = Array.from(document.querySelectorAll("div[class*='border-black']")).map((box, index) => {
+    box.setAttribute('data-sb-box', index);
+    return {
+        index: index,
+        title: text(box.querySelector('h2')),
+        text: text(box),
+        buttons: Array.from(box.querySelectorAll('button')).map((button, buttonIndex) => {
+            button.setAttribute('data-sb-button', buttonIndex);
+            return {index: buttonIndex, text: text(button), class: button.className};
+        })
+    };
+});
+// The movie's own heading: the h1, or the first h2 that is not a torrent box title
+const heading = document.querySelector('h1') || Array.from(document.querySelectorAll('h2')).find((h2) => !h2.closest("div[class*='border-black']"));
+return {statuses: statuses, red_button_titles: redButtonTitles, boxes: boxes, heading: text(heading)};
+"""
+
+def snapshot_search_results(driver) -> list[dict]:
+    """Returns index, href, title and year text of every movie link on a DMM search page."""
+    return driver.execute_script(SEARCH_RESULTS_SNAPSHOT_SCRIPT) or []
+
+def snapshot_movie_page(driver) -> dict:
+    """Returns the status messages, red button titles, result boxes (with their buttons) and heading of a DMM movie page."""
+    return driver.execute_script(MOVIE_PAGE_SNAPSHOT_SCRIPT) or {"statuses": [], "red_button_titles": [], "boxes": [], "heading": None}
+
+MOVIE_HEADING = re.compile(r"^(.*?)\s*\((\d{4})\)\s*$")
+
+def movie_page_matches(matcher: "TitleMatcher", page) -> Optional[bool]:
     """
-    Prioritize buttons within a result box. Clicks the 'Instant RD' or 'DL with RD' button
-    if available. Handles stale element references by retrying the operation once.
+    Whether the heading of a DMM movie page ("Title (Year)") is the requested movie, judged like a
+    search result; None if the page shows no heading.
+    """
+    heading = page.get("heading")
+    if not heading:
+        return None
+    parts = MOVIE_HEADING.match(heading)
+    title, year_text = parts.groups() if parts else (heading, heading)
+    return matcher.rank_search_results([(title, year_text)])[0].matched
+
+### Page state monitor: one polling condition that returns as soon as DMM settles into a terminal state
+PAGE_STATE_SCRIPT = """
+const statuses = Array.from(document.querySelectorAll("div[role='status'][aria-live*='polite']")).map((element) => element.innerText.trim());
+return {
+    statuses: statuses,
+    movie_links: document.querySelectorAll("a[href*='/movie/']").length,
+    red_buttons: document.querySelectorAll("button[class*='bg-red-900/30']").length,
+    boxes: document.querySelectorAll("div[class*='border-black']").length
+};
+"""
+
+class PageState(str, Enum):
+    SEARCH_RESULTS = "search_results"
+    NO_RESULTS = "no_results"
+    RD_IN_LIBRARY = "rd_in_library"
+    AVAILABILITY_CHECKED = "availability_checked"
+    TIMEOUT = "timeout"
+
+@dataclass
+class PageStatus:
+    """The terminal state a DMM page settled into, with what was seen on it at that moment."""
+    state: PageState
+    torrents_count: Optional[int] = None
+    boxes: int = 0
+    elapsed: float = 0.0
+
+def classify_page_state(snapshot, expect, stop_on_red_buttons=True) -> Optional[PageStatus]:
+    """
+    Maps a PAGE_STATE_SCRIPT snapshot to a terminal state, or None while the page is still loading.
+
+    Args:
+        snapshot (dict): Result of PAGE_STATE_SCRIPT.
+        expect (str): "search" for a DMM search page, "movie" for a movie page.
+        stop_on_red_buttons (bool): Settle as soon as a red 'RD (100%)' button shows up on a movie page.
+    """
+    statuses = [status for status in snapshot.get("statuses") or [] if status]
+    if any("No results found" in status for status in statuses):
+        return PageStatus(PageState.NO_RESULTS, boxes=snapshot.get("boxes", 0))
+
+    if expect == "search":
+        if snapshot.get("movie_links"):
+            return PageStatus(PageState.SEARCH_RESULTS)
+        return None
+
+    if not any("Checking RD availability" in status for status in statuses):
+        for status in statuses:
+            torrents_match = re.search(r"Found (\d+) available torrents in RD", status)
+            if torrents_match:
+                return PageStatus(PageState.AVAILABILITY_CHECKED, int(torrents_match.group(1)), snapshot.get("boxes", 0))
+
+    if stop_on_red_buttons and snapshot.get("red_buttons"):
+        return PageStatus(PageState.RD_IN_LIBRARY, boxes=snapshot.get("boxes", 0))
+    return None
+
+def wait_for_page_state(driver, expect, timeout=None, stop_on_red_buttons=True) -> PageStatus:
+    """
+    Polls the page with a single script per tick and returns the first terminal state DMM reaches,
+    so a fast page is never held up by the timeouts meant for a slow one.
 
     Args:
-        result_box (WebElement): The result box element.
+        driver (WebDriver): The browser showing the DMM page.
+        expect (str): "search" for a DMM search page, "movie" for a movie page.
+        timeout (float): Seconds to wait at most, PAGE_STATE_TIMEOUT_SECONDS by default.
+        stop_on_red_buttons (bool): Settle as soon as a red 'RD (100%)' button shows up on a movie page.
 
     Returns:
-        bool: True if a button was successfully clicked and handled, False otherwise.
+        PageStatus: The settled state, or PageState.TIMEOUT if DMM did not settle in time.
     """
+    started = time.perf_counter()
+    last_snapshot = {}
+
+    def settled(driver):
+        nonlocal last_snapshot
+        last_snapshot = driver.execute_script(PAGE_STATE_SCRIPT) or {}
+        return classify_page_state(last_snapshot, expect, stop_on_red_buttons) or False
+
     try:
-        # Attempt to locate the 'Instant RD' button
-        instant_rd_button = result_box.find_element(By.XPATH, ".//button[contains(@class, 'bg-green-900/30')]")
-        logger.info("Located 'Instant RD' button.")
+        status = WebDriverWait(driver, timeout or PAGE_STATE_TIMEOUT_SECONDS, poll_frequency=0.25).until(settled)
+    except TimeoutException:
+        status = PageStatus(PageState.TIMEOUT, boxes=last_snapshot.get("boxes", 0))
+    status.elapsed = time.perf_counter() - started
+    return status
+
+### DMM network capture (DMM_CANDIDATE_SOURCE=network)
+# DMM loads a movie's torrents from its own API and asks which of them Real-Debrid has cached before it
+# renders anything; these are the responses the capture reads. Older DMM versions asked Real-Debrid directly.
+DMM_TORRENTS_API_PATHS = ("/api/torrents/movie",)
+DMM_AVAILABILITY_API_PATHS = ("/api/availability/check", "/torrents/instantAvailability/")
+
+@dataclass
+class TorrentCandidate:
+    """A torrent DMM listed for the movie; cached stays None until the availability response arrived."""
+    hash: str
+    title: str
+    size_bytes: Optional[int] = None
+    cached: Optional[bool] = None
+
+def parse_dmm_torrents(data) -> List[TorrentCandidate]:
+    """The torrents of a DMM torrent list response ({"results": [{"hash", "title", "fileSize"}]}, sizes in MB)."""
+    results = data.get("results") if isinstance(data, dict) else data
+    candidates = []
+    for result in results or []:
+        if not isinstance(result, dict) or not result.get("hash"):
+            continue
+        size_mb = result.get("fileSize")
+        size_bytes = int(size_mb * 1024 * 1024) if isinstance(size_mb, (int, float)) else None
+        candidates.append(TorrentCandidate(result["hash"].lower(), result.get("title") or "", size_bytes))
+    return candidates
 
-        # Attempt to click the button and wait for a state change
-        if attempt_button_click_with_state_check(instant_rd_button, result_box):
-            return True
+class DmmNetworkCapture:
+    """
+    Turns the torrent and availability API responses of one DMM movie page into TorrentCandidates,
+    so the search knows what is cached as soon as the responses arrive instead of once DMM rendered them.
+    DMM does not always ask about every torrent, so the page also counts as settled once no availability
+    request is in flight and none has answered for AVAILABILITY_QUIET_SECONDS.
+    """
 
-    except NoSuchElementException:
-        logger.info("'Instant RD' button not found. Checking for 'DL with RD' button.")
+    AVAILABILITY_QUIET_SECONDS = 1.5
+
+    def __init__(self):
+        self.candidates: Dict[str, TorrentCandidate] = {}
+        self.torrents_loaded = False
+        self.availability_checked = False
+        self.last_availability_at = None  # time.monotonic() of the latest availability response
+        self._requests: Dict[str, tuple] = {}  # requestId -> (kind, hashes asked about)
+
+    def start(self, driver):
+        """Forgets earlier network activity; call right before navigating to the movie page."""
+        read_performance_log(driver)
+
+    def read(self, driver):
+        for message in read_performance_log(driver):
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                kind = self._kind(params.get("request", {}).get("url", ""))
+                if kind:
+                    self._requests[params["requestId"]] = (kind, self._asked_hashes(params["request"]))
+            elif method == "Network.loadingFinished" and params.get("requestId") in self._requests:
+                kind, hashes = self._requests.pop(params["requestId"])
+                try:
+                    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                    data = json.loads(body.get("body") or "null")
+                except (WebDriverException, ValueError) as e:
+                    logger.warning(f"Could not read DMM's {kind} response: {e}")
+                    continue
+                if kind == "torrents":
+                    self._add_torrents(data)
+                else:
+                    self._add_availability(data, hashes)
+                    self.last_availability_at = time.monotonic()
+
+    @staticmethod
+    def _kind(url) -> Optional[str]:
+        if any(path in url for path in DMM_TORRENTS_API_PATHS):
+            return "torrents"
+        if any(path in url for path in DMM_AVAILABILITY_API_PATHS):
+            return "availability"
+        return None
 
-    except StaleElementReferenceException:
-        logger.warning("Stale element reference encountered for 'Instant RD' button. Retrying...")
-        # Retry once by re-locating the button
+    @staticmethod
+    def _asked_hashes(request) -> Optional[set]:
+        """The hashes an availability request asked about (POST body or URL path), None if unknown."""
         try:
-            instant_rd_button = result_box.find_element(By.XPATH, ".//button[contains(@class, 'bg-green-900/30')]")
-            if attempt_button_click_with_state_check(instant_rd_button, result_box):
-                return True
-        except Exception as e:
-            logger.error(f"Retry failed for 'Instant RD' button due to: {e}")
-
-    try:
-        # If the 'Instant RD' button is not found, try to locate the 'DL with RD' button
-        dl_with_rd_button = result_box.find_element(By.XPATH, ".//button[contains(text(), 'DL with RD')]")
-        logger.info("Located 'DL with RD' button.")
+            hashes = json.loads(request.get("postData") or "{}").get("hashes")
+        except (ValueError, AttributeError):
+            hashes = None
+        if not hashes and "/instantAvailability/" in request.get("url", ""):
+            hashes = urllib.parse.urlsplit(request["url"]).path.split("/instantAvailability/", 1)[1].split("/")
+        return {str(value).lower() for value in hashes if value} if hashes else None
+
+    def _add_torrents(self, data):
+        for candidate in parse_dmm_torrents(data):
+            known = self.candidates.setdefault(candidate.hash, candidate)
+            known.title, known.size_bytes = candidate.title or known.title, candidate.size_bytes or known.size_bytes
+        self.torrents_loaded = True
+
+    def _add_availability(self, data, asked):
+        if isinstance(data, dict) and isinstance(data.get("available"), list):
+            cached = {str(item.get("hash", "")).lower() for item in data["available"] if isinstance(item, dict)}
+        elif isinstance(data, dict):
+            # Real-Debrid's instantAvailability: {hash: {"rd": [file variants]}}; no variants means not cached
+            cached = {torrent_hash.lower() for torrent_hash, value in data.items() if isinstance(value, dict) and value.get("rd")}
+            asked = asked or {torrent_hash.lower() for torrent_hash in data}
+        else:
+            return
+        for torrent_hash, candidate in self.candidates.items():
+            if torrent_hash in cached:
+                candidate.cached = True
+            elif asked is None or torrent_hash in asked:
+                candidate.cached = False
+        self.availability_checked = True
+
+    def is_cached(self, title) -> Optional[bool]:
+        """Whether the torrent with this title is cached, or None if the responses did not say."""
+        states = [candidate.cached for candidate in self.candidates.values() if candidate.title == title]
+        return True if True in states else (False if False in states else None)
+
+    def settled(self) -> Optional[PageStatus]:
+        if not self.torrents_loaded:
+            return None
+        if not self.candidates:
+            return PageStatus(PageState.NO_RESULTS)
+        if not self.availability_checked:
+            return None
+        quiet = (
+            not any(kind == "availability" for kind, _ in self._requests.values())
+            and time.monotonic() - self.last_availability_at >= self.AVAILABILITY_QUIET_SECONDS
+        )
+        if quiet or all(candidate.cached is not None for candidate in self.candidates.values()):
+            return PageStatus(PageState.AVAILABILITY_CHECKED, sum(candidate.cached is True for candidate in self.candidates.values()))
+        return None
 
-        # Attempt to click the button and wait for a state change
-        if attempt_button_click_with_state_check(dl_with_rd_button, result_box):
-            return True
+    def wait(self, driver, timeout=None) -> PageStatus:
+        """Reads the network log until the torrents and their availability are known; the counterpart of wait_for_page_state."""
+        started = time.perf_counter()
 
-    except NoSuchElementException:
-        logger.warning("Neither 'Instant RD' nor 'DL with RD' button found in this box.")
+        def settled(driver):
+            self.read(driver)
+            return self.settled() or False
 
-    except StaleElementReferenceException:
-        logger.warning("Stale element reference encountered for 'DL with RD' button. Retrying...")
-        # Retry once by re-locating the button
         try:
-            dl_with_rd_button = result_box.find_element(By.XPATH, ".//button[contains(text(), 'DL with RD')]")
-            if attempt_button_click_with_state_check(dl_with_rd_button, result_box):
-                return True
-        except Exception as e:
-            logger.error(f"Retry failed for 'DL with RD' button due to: {e}")
+            status = WebDriverWait(driver, timeout or PAGE_STATE_TIMEOUT_SECONDS, poll_frequency=0.25).until(settled)
+        except TimeoutException:
+            status = PageStatus(PageState.TIMEOUT)
+        status.elapsed = time.perf_counter() - started
+        return status
 
-    except Exception as e:
-        logger.error(f"An unexpected error occurred while prioritizing buttons: {e}")
+def find_search_result(driver, index):
+    return driver.find_element(By.CSS_SELECTOR, f"a[data-sb-result='{index}']")
+
+def find_result_box(driver, index):
+    return driver.find_element(By.CSS_SELECTOR, f"div[data-sb-box='{index}']")
+
+
+def prioritize_buttons_in_box(driver, box):
+    """
+    Prioritize buttons within a result box. Clicks the 'Instant RD' or 'DL with RD' button
+    if available. Handles stale element references by retrying the operation once.
+
+    Args:
+        driver (WebDriver): The browser showing the movie page.
+        box (dict): The result box from snapshot_movie_page().
+
+    Returns:
+        bool: True if a button was successfully clicked and handled, False otherwise.
+    """
+    instant_rd_button = next((button for button in box["buttons"] if "bg-green-900/30" in (button["class"] or "")), None)
+    dl_with_rd_button = next((button for button in box["buttons"] if "DL with RD" in (button["text"] or "")), None)
+
+    if instant_rd_button is None:
+        logger.info("'Instant RD' button not found. Checking for 'DL with RD' button.")
+    if instant_rd_button is None and dl_with_rd_button is None:
+        logger.warning("Neither 'Instant RD' nor 'DL with RD' button found in this box.")
+        return False
+
+    for name, button in (("Instant RD", instant_rd_button), ("DL with RD", dl_with_rd_button)):
+        if button is None:
+            continue
+        logger.info(f"Located '{name}' button.")
+        for attempt in range(2):
+            try:
+                result_box = find_result_box(driver, box["index"])
+                button_element = result_box.find_element(By.CSS_SELECTOR, f"button[data-sb-button='{button['index']}']")
+                # Attempt to click the button and wait for a state change
+                if attempt_button_click_with_state_check(button_element, result_box):
+                    return True
+                break
+            except StaleElementReferenceException:
+                # Retry once by re-locating the button
+                logger.warning(f"Stale element reference encountered for '{name}' button. Retrying...")
+            except NoSuchElementException as e:
+                logger.error(f"Could not locate the '{name}' button again: {e}")
+                break
+            except Exception as e:
+                logger.error(f"An unexpected error occurred while prioritizing buttons: {e}")
+                break
 
     return False
 
@@ -739,361 +2701,368 @@ def attempt_button_click_with_state_check(button, result_box):
     return False
 
 
+def has_matching_red_button(matcher, page):
+    """
+    Checks whether any red 'RD (100%)' button on the page belongs to the requested movie,
+    meaning it is already in the Real-Debrid library.
 
+    Args:
+        matcher (TitleMatcher): Matcher for the requested movie.
+        page (dict): Snapshot of the movie page from snapshot_movie_page().
 
-### Search Function to Reuse Browser
-def search_on_debrid(movie_title, driver):
-    logger.info(f"Starting Selenium automation for movie: {movie_title}")
-
-    # Check if the driver is None before proceeding to avoid NoneType errors
-    if not driver:
-        logger.error("Selenium WebDriver is not initialized. Attempting to reinitialize.")
-        driver = initialize_browser()
-
-    debrid_media_manager_base_url = "https://debridmediamanager.com/search?query="
-    
-    # Use urllib to encode the movie title safely, handling all special characters including '&', ':', '(', ')'
-    encoded_movie_title = urllib.parse.quote(movie_title)
-    
-    url = debrid_media_manager_base_url + encoded_movie_title
-    logger.info(f"Search URL: {url}")
-
-    try:
-        # Directly jump to the search results page after login
-        driver.get(url)
-        logger.success(f"Navigated to search results page for {movie_title}.")
-        
-        # Wait for the results page to load dynamically
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.XPATH, "//a[contains(@href, '/movie/')]"))
-        )
-
-        # Clean and normalize the movie title (remove year in parentheses)
-        movie_title_cleaned = movie_title.split('(')[0].strip()
-        movie_title_normalized = normalize_title(movie_title_cleaned)
-        logger.info(f"Searching for normalized movie title: {movie_title_normalized}")
-
-        # Find the movie result elements
-        try:
-            movie_elements = WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located((By.XPATH, f"//a[contains(@href, '/movie/')]"))
-            )
-
-            # Iterate over the movie elements to find the correct one
-            for movie_element in movie_elements:
-                movie_title_element = movie_element.find_element(By.XPATH, ".//h3")
-                movie_year_element = movie_element.find_element(By.XPATH, ".//div[contains(@class, 'text-gray-600')]")
-                
-                search_title_cleaned = movie_title_element.text.strip()
-                search_title_normalized = normalize_title(search_title_cleaned)
-                search_year = extract_year(movie_year_element.text)
-
-                # Extract the expected year from the provided movie title (if it exists)
-                expected_year = extract_year(movie_title)
-
-                # Use fuzzy matching to allow for minor differences in titles
-                title_match_ratio = fuzz.ratio(search_title_normalized.lower(), movie_title_normalized.lower())
-                logger.info(f"Comparing '{search_title_normalized}' with '{movie_title_normalized}' (Match Ratio: {title_match_ratio})")
-
-                # Check if the titles match (with a threshold) and if the years are within ±1 year range
-                if title_match_ratio >= 69 and (expected_year is None or abs(search_year - expected_year) <= 1):
-                    logger.info(f"Found matching movie: {search_title_cleaned} ({search_year})")
-                    
-                    # Click on the parent <a> tag (which is the clickable link)
-                    parent_link = movie_element
-                    parent_link.click()
-                    logger.success(f"Clicked on the movie link for {search_title_cleaned}")
-                    break
-            else:
-                logger.error(f"No matching movie found for {movie_title_cleaned} ({expected_year})")
-                return
-        except (TimeoutException, NoSuchElementException) as e:
-            logger.critical(f"Failed to find or click on the search result: {movie_title}")
-            return
-
-        confirmation_flag = False  # Initialize the confirmation flag
-
-        # Wait for the movie's details page to load by listening for the status message
-        try:
-            # Step 1: Check for Status Message
-            try:
-                no_results_element = WebDriverWait(driver, 2).until(
-                    EC.text_to_be_present_in_element(
-                        (By.XPATH, "//div[@role='status' and contains(@aria-live, 'polite')]"),
-                        "No results found"
-                    )
-                )
-                logger.warning("'No results found' message detected. Skipping further checks.")
-                return  # Skip further checks if "No results found" is detected
-            except TimeoutException:
-                logger.warning("'No results found' message not detected. Proceeding to check for available torrents.")
-
-            try:
-                status_element = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located(
-                        (By.XPATH, "//div[@role='status' and contains(@aria-live, 'polite') and contains(text(), 'available torrents in RD')]")
-                    )
-                )
-                status_text = status_element.text
-                logger.info(f"Status message: {status_text}")
-
-                # Extract the number of available torrents from the status message (look for the number)
-                torrents_match = re.search(r"Found (\d+) available torrents in RD", status_text)
-                if torrents_match:
-                    torrents_count = int(torrents_match.group(1))
-                    logger.info(f"Found {torrents_count} available torrents in RD.")
-                else:
-                    logger.warning("Could not find the expected 'Found X available torrents in RD' message. Proceeding to check for 'Checking RD availability...'.")
-            except TimeoutException:
-                logger.warning("Timeout waiting for the RD status message. Proceeding with the next steps.")
-                status_text = None  # No status message found, but continue
-
-            logger.info("Waiting for 'Checking RD availability...' to appear.")
-            
-            # Step 2: Check if any red buttons (RD 100%) exist and verify the title for each
-            try:
-                red_buttons_elements = driver.find_elements(By.XPATH, "//button[contains(@class, 'bg-red-900/30')]")
-                logger.info(f"Found {len(red_buttons_elements)} red button(s) (100% RD). Verifying titles before deciding to skip.")
-
-                for i, red_button_element in enumerate(red_buttons_elements, start=1):
-                    logger.info(f"Checking red button {i}...")
+    Returns:
+        bool: True if a red button's title and year match the requested movie.
+    """
+    red_button_titles = page["red_button_titles"]
+    logger.info(f"Found {len(red_button_titles)} red button(s) (100% RD). Verifying titles before deciding to skip.")
+    for i, title in enumerate(red_button_titles, start=1):
+        if title is None:
+            logger.warning(f"Could not find title associated with red button {i}.")
+
+    for match in matcher.rank_red_buttons([title for title in red_button_titles if title is not None]):
+        if match.matched:
+            logger.info(f"Found a match on red button - {match.title} (Score: {match.score}, Year: {match.year}). Skipping...")
+            return True
+        logger.warning(f"No match for red button: Title - {match.title}, Year - {match.year}, Score - {match.score}.")
 
-                    try:
-                        # Adjusted XPath to find the <h2> element within the same parent container as the red button
-                        red_button_title_element = red_button_element.find_element(By.XPATH, ".//ancestor::div[contains(@class, 'border-2')]//h2")
-                        red_button_title_text = red_button_title_element.text.strip()
+    return False
 
-                        # Clean the title for comparison
-                        red_button_title_cleaned = clean_title(red_button_title_text.split('(')[0].strip(), target_lang='en')
-                        red_button_title_normalized = normalize_title(red_button_title_text.split('(')[0].strip(), target_lang='en')
 
-                        # Clean and normalize the movie title once outside the loop
-                        movie_title_cleaned = clean_title(movie_title.split('(')[0].strip(), target_lang='en')
-                        movie_title_normalized = normalize_title(movie_title.split('(')[0].strip(), target_lang='en')
+### Candidate ranking: every matching torrent is scored, and only the best cached one is added
+@dataclass(frozen=True)
+class RankingWeights:
+    cached: float = 50  # Added for a cached torrent, taken for one known not to be cached
+    year_delta: float = 10  # Taken per year between the torrent and the movie
+    resolution: float = 20  # For the profile's first resolution...
+    resolution_step: float = 8  # ...minus this for every later one
+    ideal_size: float = 10  # Within the profile's ideal size range
+    size_penalty: float = 20  # Most taken (1 per GB) outside the ideal size range
+    preferred_term: float = 5  # Per preferred term in the title
+    avoided_term: float = 60  # Taken per avoided term in the title
+
+@dataclass(frozen=True)
+class RankingProfile:
+    resolutions: tuple  # Most preferred first
+    ideal_size_gb: tuple  # (min, max) that earns the full size bonus
+    max_size_gb: float  # Larger torrents are never added (0 for no limit)
+    preferred_terms: tuple = ()
+    avoided_terms: tuple = ("cam", "hdcam", "camrip", "telesync", "hdts", "telecine")
+    weights: RankingWeights = RankingWeights()
+
+RANKING_PROFILES = {
+    "balanced": RankingProfile(("1080p", "2160p", "720p"), (4, 20), 40, ("bluray", "web-dl")),
+    "quality": RankingProfile(("2160p", "1080p", "720p"), (15, 80), 0, ("remux", "bluray", "atmos")),
+    "compact": RankingProfile(("1080p", "720p", "2160p"), (1, 6), 15, ("web-dl", "webrip", "x265")),
+}
+ranking_profile = RANKING_PROFILES[TORRENT_RANKING_PROFILE]
+if TORRENT_MAX_SIZE_GB:
+    ranking_profile = replace(ranking_profile, max_size_gb=TORRENT_MAX_SIZE_GB)
+try:
+    ranking_profile = replace(ranking_profile, weights=replace(ranking_profile.weights, **TORRENT_RANKING_WEIGHTS))
+except TypeError:
+    logger.error(f"TORRENT_RANKING_WEIGHTS names must be among: {', '.join(RankingWeights.__dataclass_fields__)}.")
+    exit(1)
 
-                        logger.info(f"Red button {i} title: {red_button_title_cleaned}, Expected movie title: {movie_title_cleaned}")
+# TORRENT_FILTER_REGEX is also set in DMM's settings, but DMM only applies it to what it renders; evaluating it
+# here keeps it in force for the network capture and the http backend. DMM matches it case-insensitively.
+try:
+    TORRENT_FILTER_PATTERN = re.compile(TORRENT_FILTER_REGEX, re.IGNORECASE) if TORRENT_FILTER_REGEX else None
+except re.error as e:
+    logger.warning(f"TORRENT_FILTER_REGEX cannot be evaluated locally ({e}); it is only applied by DMM.")
+    TORRENT_FILTER_PATTERN = None
 
-                        # Extract the year from the red button title, ignoring resolution strings
-                        red_button_year = extract_year(red_button_title_text, ignore_resolution=True)
+MAX_CANDIDATE_ATTEMPTS = 3  # Candidates tried per movie before giving up
 
-                        # Extract the expected year from the provided movie title (if it exists)
-                        expected_year = extract_year(movie_title)
+RESOLUTION_PATTERN = re.compile(r"\b(2160p|4k|uhd|1080p|720p|576p|480p)\b", re.IGNORECASE)
+SIZE_PATTERN = re.compile(r"([\d.]+)\s*(TB|GB|MB|KB)\b", re.IGNORECASE)
 
-                        # Use fuzzy matching instead of startswith (also allow partial matching for more relaxed comparisons)
-                        title_match_ratio = fuzz.partial_ratio(red_button_title_cleaned.lower(), movie_title_cleaned.lower())
-                        title_match_threshold = 75  # You can lower or raise this based on how aggressive you want it to be.
+def parse_size(text) -> Optional[int]:
+    """Bytes of the first size in text ('Total size: 10.9 GB'), or None."""
+    size = SIZE_PATTERN.search(text or "")
+    if not size:
+        return None
+    return int(float(size.group(1)) * 1024 ** ("KMGT".index(size.group(2)[0].upper()) + 1))
 
-                        # Additional title comparison logic with fuzzy matching and threshold
-                        title_matched = False
-                        if (
-                            title_match_ratio >= title_match_threshold or  # Fuzzy match title (relaxed match)
-                            movie_title_normalized.startswith(red_button_title_normalized)  # Backwards title check
-                        ):
-                            # Titles match within boundaries.
-                            title_matched = True  # Consider this a valid match.
+def detect_resolution(title) -> Optional[str]:
+    resolution = RESOLUTION_PATTERN.search(title)
+    if not resolution:
+        return None
+    resolution = resolution.group(1).lower()
+    return "2160p" if resolution in ("4k", "uhd") else resolution
+
+@dataclass
+class RankedCandidate:
+    """A torrent with its title match and ranking score; reason says why it may not be added."""
+    index: int  # Position in the list that was ranked
+    candidate: TorrentCandidate
+    match: TitleMatch
+    score: float
+    resolution: Optional[str]
+    reason: Optional[str] = None
+
+    @property
+    def eligible(self) -> bool:
+        return self.reason is None
+
+def rank_candidates(matcher: TitleMatcher, candidates: List[TorrentCandidate], profile: RankingProfile = None) -> List[RankedCandidate]:
+    """
+    Scores every torrent on title score, year distance, cached status, resolution, size and the
+    profile's preferred and avoided terms. Torrents that do not match the movie, fail
+    TORRENT_FILTER_REGEX, are known not to be cached or exceed the size limit are not eligible.
+    Returns eligible torrents first, best score first.
+    """
+    profile = profile or ranking_profile
+    matches = sorted(matcher.rank_torrents([candidate.title for candidate in candidates]), key=lambda match: match.index)
+    ranked = []
+    for candidate, match in zip(candidates, matches):
+        title = candidate.title.lower()
+        resolution = detect_resolution(candidate.title)
+        size_gb = candidate.size_bytes / 1024 ** 3 if candidate.size_bytes else None
+
+        weights = profile.weights
+        score = match.score - weights.year_delta * (match.year_delta or 0)
+        score += {True: weights.cached, None: 0, False: -weights.cached}[candidate.cached]
+        if resolution in profile.resolutions:
+            score += weights.resolution - weights.resolution_step * profile.resolutions.index(resolution)
+        if size_gb is not None:
+            low, high = profile.ideal_size_gb
+            score += weights.ideal_size if low <= size_gb <= high else -min(weights.size_penalty, abs(size_gb - (low if size_gb < low else high)))
+        score += weights.preferred_term * sum(term in title for term in profile.preferred_terms)
+        score -= weights.avoided_term * sum(re.search(rf"\b{re.escape(term)}\b", title) is not None for term in profile.avoided_terms)
+
+        reason = None
+        if not match.matched:
+            reason = "title or year mismatch"
+        elif TORRENT_FILTER_PATTERN and not TORRENT_FILTER_PATTERN.search(candidate.title):
+            reason = "excluded by TORRENT_FILTER_REGEX"
+        elif candidate.cached is False:
+            reason = "not cached in RD"
+        elif profile.max_size_gb and size_gb is not None and size_gb > profile.max_size_gb:
+            reason = f"larger than {profile.max_size_gb:g} GB"
+        ranked.append(RankedCandidate(match.index, candidate, match, round(score, 1), resolution, reason))
+    return sorted(ranked, key=lambda item: (not item.eligible, -item.score, item.index))
+
+def box_candidate(box, capture: Optional[DmmNetworkCapture] = None, availability_known=True) -> TorrentCandidate:
+    """
+    The TorrentCandidate of a rendered result box. DMM shows cached torrents with a green 'Instant RD'
+    button; a 'DL with RD' button only means uncached once the availability check has finished.
+    The captured availability response, when there is one, has the final say.
+    """
+    buttons = box["buttons"]
+    cached = None
+    if any("bg-green-900/30" in (button["class"] or "") for button in buttons):
+        cached = True
+    elif availability_known and any("DL with RD" in (button["text"] or "") for button in buttons):
+        cached = False
+    title = box["title"] or ""
+    if capture and capture.is_cached(title) is not None:
+        cached = capture.is_cached(title)
+    return TorrentCandidate("", title, parse_size(box["text"]), cached)
+
+def log_ranking(ranked: List[RankedCandidate], limit=5):
+    for position, item in enumerate(ranked[:limit], 1):
+        size = f"{item.candidate.size_bytes / 1024 ** 3:.1f} GB" if item.candidate.size_bytes else "size unknown"
+        cached = {True: "cached", False: "not cached", None: "cache unknown"}[item.candidate.cached]
+        verdict = "eligible" if item.eligible else item.reason
+        logger.info(f"#{position} {item.candidate.title} (score {item.score}, title {item.match.score}, {item.resolution or 'resolution unknown'}, {size}, {cached}): {verdict}")
 
-                        # Expanded year match check with more leeway (±2 years to avoid overly strict checks)
-                        year_matched = (expected_year is None or abs(red_button_year - expected_year) <= 2)
+### Search Function to Reuse Browser
+def open_movie_from_search(driver, movie_title, matcher: "TitleMatcher", stage_timer: StageTimer):
+    """
+    Searches DMM for the title and clicks the best matching result.
+    Returns the path of the opened movie page, or the SearchOutcome explaining why none was opened.
+    """
+    # Use urllib to encode the movie title safely, handling all special characters including '&', ':', '(', ')'
+    url = f"{DMM_BASE_URL}/search?query={urllib.parse.quote(movie_title)}"
+    logger.info(f"Search URL: {url}")
 
-                        if title_matched and year_matched:
-                            logger.info(f"Found a match on red button {i} - {red_button_title_cleaned}. Skipping...")
-                            # Handle the RD button selection or matching action here
-                            confirmation_flag = True  # Mark as confirmed match.
-                            return confirmation_flag  # Once we click a matching button, we stop further checks.
+    # Directly jump to the search results page after login
+    driver.get(url)
+    logger.success(f"Navigated to search results page for {movie_title}.")
+    stage_timer.lap("navigate")
 
-                        else:
-                            # If no match, continue with the next available RD red button.
-                            logger.warning(f"No match for red button {i}: Title - {red_button_title_cleaned}, Year - {red_button_year}. Moving to next red button.")
+    # Wait for the results page to load dynamically (or to report that there is nothing to load)
+    search_page = wait_for_page_state(driver, "search")
+    stage_timer.lap("search_results_wait")
+    if search_page.state == PageState.NO_RESULTS:
+        logger.warning(f"DMM found no results for {movie_title}.")
+        return SearchOutcome.NO_SEARCH_HIT
+    if search_page.state == PageState.TIMEOUT:
+        logger.warning(f"Search results for {movie_title} did not load within {PAGE_STATE_TIMEOUT_SECONDS:g} seconds.")
+        return SearchOutcome.TIMEOUT
 
-                    except NoSuchElementException as e:
-                        logger.warning(f"Could not find title associated with red button {i}: {e}")
-                        continue  # If a title is not found for a red button, continue to the next one
-            except NoSuchElementException:
-                logger.info("No red buttons (100% RD) detected. Proceeding with optional fallback.")
+    logger.info(f"Searching for normalized movie title: {matcher.normalized}")
 
+    # Find the movie result elements
+    try:
+        search_results = [result for result in snapshot_search_results(driver) if result["title"] is not None]
+
+        # Score all search results at once and click the best one that matches the title and year (±1)
+        ranked_results = matcher.rank_search_results([(result["title"], result["year_text"]) for result in search_results])
+        for match in ranked_results:
+            logger.info(f"Comparing '{match.title}' ({match.year}) with '{matcher.normalized}' (Match Ratio: {match.score})")
+
+        stage_timer.lap("title_match")
+        if not ranked_results or not ranked_results[0].matched:
+            logger.error(f"No matching movie found for {matcher.base_title} ({matcher.expected_year})")
+            return SearchOutcome.NO_SEARCH_HIT
+
+        best_result = ranked_results[0]
+        logger.info(f"Found matching movie: {best_result.title} ({best_result.year})")
+        find_search_result(driver, search_results[best_result.index]["index"]).click()
+        logger.success(f"Clicked on the movie link for {best_result.title}")
+        stage_timer.lap("navigate")
+        return urllib.parse.urlsplit(search_results[best_result.index]["href"]).path
+    except (TimeoutException, NoSuchElementException) as e:
+        logger.critical(f"Failed to find or click on the search result: {movie_title}")
+        return SearchOutcome.NO_SEARCH_HIT
+
+def search_on_debrid(movie_title, driver, tmdb_id=None, imdb_id=None) -> "SearchOutcome":
+    """
+    Opens the movie's DMM page (directly by IMDb ID or a remembered page, otherwise through the title
+    search) and adds the best matching cached torrent to Real-Debrid.
+    Returns SearchOutcome.CONFIRMED if the movie is (now) in Real-Debrid, otherwise the reason it is not.
+    """
+    logger.info(f"Starting Selenium automation for movie: {movie_title}")
 
-            # Step 3: Wait for the "Checking RD availability..." message to disappear
-            try:
-                WebDriverWait(driver, 15).until_not(
-                    EC.text_to_be_present_in_element(
-                        (By.XPATH, "//div[@role='status' and contains(@aria-live, 'polite')]"),
-                        "Checking RD availability"
-                    )
-                )
-                logger.info("'Checking RD availability...' has disappeared. Now waiting for RD results.")
-            except TimeoutException:
-                logger.warning("'Checking RD availability...' did not disappear within 15 seconds. Proceeding to the next steps.")
+    # The pool restarts a worker whose session is gone; raising here lets it count the failure
+    if not driver:
+        logger.error("Selenium WebDriver is not initialized.")
+        raise WebDriverException("No browser session is available for this search.")
 
-            # Step 4: Wait for the "Found X available torrents in RD" message
-            try:
-                status_element = WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located(
-                        (By.XPATH, "//div[@role='status' and contains(@aria-live, 'polite') and contains(text(), 'available torrents in RD')]")
-                    )
-                )
+    stage_timer = StageTimer()
+    try:
+        # Precompute every variant of the requested title once for all comparisons on this movie
+        matcher = TitleMatcher(movie_title)
+
+        # Open the movie's DMM page directly when it is known (DMM keys movie pages by IMDb ID, so that
+        # is used whenever there is one); otherwise search DMM for the title and follow the best matching result
+        remembered = False
+        if imdb_id:
+            movie_path = f"/movie/{imdb_id}"
+        else:
+            movie_path = dmm_movie_pages.get(tmdb_id) if tmdb_id is not None else None
+            remembered = movie_path is not None
+        capture = DmmNetworkCapture() if DMM_CANDIDATE_SOURCE == "network" else None
+        if capture:
+            capture.start(driver)
+        if movie_path:
+            driver.get(f"{DMM_BASE_URL}{movie_path}")
+            logger.success(f"Navigated directly to the DMM page of {movie_title}: {movie_path}")
+            stage_timer.lap("navigate")
+        else:
+            result = open_movie_from_search(driver, movie_title, matcher, stage_timer)
+            if isinstance(result, SearchOutcome):
+                return result
+            movie_path = result
 
-                status_text = status_element.text
-                logger.info(f"Status message: {status_text}")
-            except TimeoutException:
-                logger.warning("Timeout waiting for the RD status message. Proceeding with the next steps.")
-                status_text = None  # No status message found, but continue
+        confirmation_flag = False  # Initialize the confirmation flag
 
-            # Step 5: Extract the number of available torrents from the status message (look for the number)
-            if status_text:
-                torrents_match = re.search(r"Found (\d+) available torrents in RD", status_text)
+        # Wait for the movie's details page to settle: whichever of "No results found", a red button
+        # (already in RD) or the finished RD availability check shows up first
+        try:
+            deadline = time.monotonic() + PAGE_STATE_TIMEOUT_SECONDS
+            movie_page = capture.wait(driver) if capture else wait_for_page_state(driver, "movie")
+            stage_timer.lap("rd_availability_wait")
+            if capture and movie_page.state == PageState.AVAILABILITY_CHECKED:
+                logger.info(f"DMM listed {len(capture.candidates)} torrents for {movie_title}, {movie_page.torrents_count} of them cached in RD.")
 
-                if torrents_match:
-                    torrents_count = int(torrents_match.group(1))
-                    logger.success(f"Found {torrents_count} available torrents in RD.")
+            if movie_page.state == PageState.NO_RESULTS:
+                logger.warning("'No results found' message detected. Skipping further checks.")
+                if remembered:
+                    dmm_movie_pages.delete(tmdb_id)
+                return SearchOutcome.NO_SEARCH_HIT
+
+            # A page found by title (now or by an earlier search) may be another film, e.g. a remake
+            if not imdb_id and movie_page.state != PageState.TIMEOUT:
+                page_matches = movie_page_matches(matcher, snapshot_movie_page(driver))
+                if page_matches is False:
+                    logger.warning(f"The DMM page {movie_path} is not {movie_title}. Skipping it.")
+                    if remembered:
+                        dmm_movie_pages.delete(tmdb_id)
+                    return SearchOutcome.NO_SEARCH_HIT
+                if page_matches and not remembered and tmdb_id is not None:
+                    dmm_movie_pages.set(tmdb_id, movie_path)
+
+            if movie_page.state == PageState.RD_IN_LIBRARY:
+                # Step 2: Verify the title of every red button (RD 100%) before deciding to skip
+                red_button_matched = has_matching_red_button(matcher, snapshot_movie_page(driver))
+                stage_timer.lap("red_button_scan")
+                if red_button_matched:
+                    return SearchOutcome.CONFIRMED  # The movie is already in RD, stop further checks.
+
+                # The red buttons belong to other releases, so let the availability check finish
+                remaining = deadline - time.monotonic()
+                movie_page = wait_for_page_state(driver, "movie", timeout=max(remaining, 1), stop_on_red_buttons=False)
+                stage_timer.lap("rd_availability_wait")
+                if movie_page.state == PageState.NO_RESULTS:
+                    logger.warning("'No results found' message detected. Skipping further checks.")
+                    return SearchOutcome.NO_SEARCH_HIT
+
+            if movie_page.state == PageState.AVAILABILITY_CHECKED:
+                torrents_count = movie_page.torrents_count
+                logger.info(f"RD availability check finished after {movie_page.elapsed:.2f}s.")
+                if torrents_count == 0:
+                    logger.warning("No torrents found in RD according to status, but checking for Instant RD buttons.")
                 else:
-                    logger.warning("Could not find the expected 'Found X available torrents in RD' message. Proceeding to check for Instant RD.")
-                    torrents_count = 0  # Default to 0 torrents if no match found
+                    logger.success(f"{torrents_count} torrents found in RD. Proceeding with RD checks.")
             else:
-                logger.warning("No status text available. Proceeding to check for Instant RD.")
-                torrents_count = 0  # Default to 0 torrents if no status text
+                logger.warning(f"DMM did not finish the RD availability check within {PAGE_STATE_TIMEOUT_SECONDS:g} seconds. Proceeding to check for Instant RD.")
 
-            # Step 6: If the status says "0 torrents", check if there's still an Instant RD button
-            if torrents_count == 0:
-                logger.warning("No torrents found in RD according to status, but checking for Instant RD buttons.")
-            else:
-                logger.success(f"{torrents_count} torrents found in RD. Proceeding with RD checks.")
-            
             # Step 7: Check if any red button (RD 100%) exists again before continuing
-            try:
-                red_buttons_elements = driver.find_elements(By.XPATH, "//button[contains(@class, 'bg-red-900/30')]")
-                logger.info(f"Found {len(red_buttons_elements)} red button(s) (100% RD). Verifying titles before deciding to skip.")
-
-                for i, red_button_element in enumerate(red_buttons_elements, start=1):
-                    logger.info(f"Checking red button {i}...")
-
-                    try:
-                        # Adjusted XPath to find the <h2> element within the same parent container as the red button
-                        red_button_title_element = red_button_element.find_element(By.XPATH, ".//ancestor::div[contains(@class, 'border-2')]//h2")
-                        red_button_title_text = red_button_title_element.text.strip()
-
-                        # Clean the title for comparison
-                        red_button_title_cleaned = clean_title(red_button_title_text.split('(')[0].strip(), target_lang='en')
-                        red_button_title_normalized = normalize_title(red_button_title_text.split('(')[0].strip(), target_lang='en')
-
-                        # Clean and normalize the movie title once outside the loop
-                        movie_title_cleaned = clean_title(movie_title.split('(')[0].strip(), target_lang='en')
-                        movie_title_normalized = normalize_title(movie_title.split('(')[0].strip(), target_lang='en')
-
-                        logger.info(f"Red button {i} title: {red_button_title_cleaned}, Expected movie title: {movie_title_cleaned}")
-
-                        # Extract the year from the red button title, ignoring resolution strings
-                        red_button_year = extract_year(red_button_title_text, ignore_resolution=True)
-
-                        # Extract the expected year from the provided movie title (if it exists)
-                        expected_year = extract_year(movie_title)
-
-                        # Use fuzzy matching instead of startswith (also allow partial matching for more relaxed comparisons)
-                        title_match_ratio = fuzz.partial_ratio(red_button_title_cleaned.lower(), movie_title_cleaned.lower())
-                        title_match_threshold = 75  # You can lower or raise this based on how aggressive you want it to be.
-
-                        # Additional title comparison logic with fuzzy matching and threshold
-                        title_matched = False
-                        if (
-                            title_match_ratio >= title_match_threshold or  # Fuzzy match title (relaxed match)
-                            movie_title_normalized.startswith(red_button_title_normalized)  # Backwards title check
-                        ):
-                            # Titles match within boundaries.
-                            title_matched = True  # Consider this a valid match.
-
-                        # Expanded year match check with more leeway (±2 years to avoid overly strict checks)
-                        year_matched = (expected_year is None or abs(red_button_year - expected_year) <= 2)
-
-                        if title_matched and year_matched:
-                            logger.info(f"Found a match on red button {i} - {red_button_title_cleaned}. Skipping...")
-                            # Handle the RD button selection or matching action here
-                            confirmation_flag = True  # Mark as confirmed match.
-                            return confirmation_flag  # Once we click a matching button, we stop further checks.
-
-                        else:
-                            # If no match, continue with the next available RD red button.
-                            logger.warning(f"No match for red button {i}: Title - {red_button_title_cleaned}, Year - {red_button_year}. Moving to next red button.")
-
-                    except NoSuchElementException as e:
-                        logger.warning(f"Could not find title associated with red button {i}: {e}")
-                        continue  # If a title is not found for a red button, continue to the next one
-            except NoSuchElementException:
-                logger.info("No red buttons (100% RD) detected. Proceeding with optional fallback.")
-
+            page = snapshot_movie_page(driver)
+            red_button_matched = has_matching_red_button(matcher, page)
+            stage_timer.lap("red_button_scan")
+            if red_button_matched:
+                return SearchOutcome.CONFIRMED  # The movie is already in RD, stop further checks.
 
             # After clicking the matched movie title, we now check the popup boxes for Instant RD buttons
             # Step 8: Check the result boxes with the specified class for "Instant RD"
             try:
-                result_boxes = WebDriverWait(driver, 10).until(
-                    EC.presence_of_all_elements_located((By.XPATH, "//div[contains(@class, 'border-black')]"))
-                )
-
-                for i, result_box in enumerate(result_boxes, start=1):
+                # Boxes normally render together with the status; only wait when DMM is still catching up
+                if not page["boxes"] and (movie_page.state == PageState.TIMEOUT or movie_page.torrents_count):
+                    WebDriverWait(driver, 10).until(
+                        EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'border-black')]"))
+                    )
+                if not page["boxes"]:
+                    page = snapshot_movie_page(driver)
+                    # The Step 7 check ran before these boxes rendered (e.g. the network capture finished first)
+                    red_button_matched = has_matching_red_button(matcher, page)
+                    stage_timer.lap("red_button_scan")
+                    if red_button_matched:
+                        return SearchOutcome.CONFIRMED
+                result_boxes = page["boxes"]
+
+                # Rank every box at once and click only the best cached candidates
+                availability_known = movie_page.state == PageState.AVAILABILITY_CHECKED
+                ranked_boxes = rank_candidates(matcher, [box_candidate(box, capture, availability_known) for box in result_boxes])
+                log_ranking(ranked_boxes)
+                stage_timer.lap("box_scan")
+
+                eligible = [item for item in ranked_boxes if item.eligible]
+                # Known cached boxes only; boxes of unknown status only when DMM could not tell which are cached
+                attempts = ([item for item in eligible if item.candidate.cached] or eligible)[:MAX_CANDIDATE_ATTEMPTS]
+                if not attempts:
+                    logger.warning(f"None of the {len(result_boxes)} boxes is a cached match for {movie_title}.")
+
+                for item in attempts:
+                    i = item.index + 1
+                    result_box = result_boxes[item.index]
+                    title_text = item.candidate.title
                     try:
-                        # Extract the title from the result box
-                        title_element = result_box.find_element(By.XPATH, ".//h2")
-                        title_text = title_element.text.strip()
-                        logger.info(f"Box {i} title: {title_text}")
-
-                        # Extract the year from the title
-                        box_year = extract_year(title_text)
-                        if box_year is None:
-                            logger.warning(f"Could not extract year from '{title_text}'. Skipping box {i}.")
-                            continue
-
-                        # Clean both the movie title and the box title for comparison
-                        movie_title_cleaned = clean_title(movie_title.split('(')[0].strip(), target_lang='en')
-                        title_text_cleaned = clean_title(title_text.split(str(box_year))[0].strip(), target_lang='en')
-
-                        movie_title_normalized = normalize_title(movie_title.split('(')[0].strip(), target_lang='en')
-                        title_text_normalized = normalize_title(title_text.split(str(box_year))[0].strip(), target_lang='en')
-
-
-                        # Convert digits to words for comparison
-                        movie_title_cleaned_word = replace_numbers_with_words(movie_title_cleaned)
-                        title_text_cleaned_word = replace_numbers_with_words(title_text_cleaned)
-                        movie_title_normalized_word = replace_numbers_with_words(movie_title_normalized)
-                        title_text_normalized_word = replace_numbers_with_words(title_text_normalized)
-
-                        # Convert words to digits for comparison
-                        movie_title_cleaned_digit = replace_words_with_numbers(movie_title_cleaned)
-                        title_text_cleaned_digit = replace_words_with_numbers(title_text_cleaned)
-                        movie_title_normalized_digit = replace_words_with_numbers(movie_title_normalized)
-                        title_text_normalized_digit = replace_words_with_numbers(title_text_normalized)
-
-                        # Log all variations for debugging
-                        logger.info(f"Cleaned movie title: {movie_title_cleaned}, Cleaned box title: {title_text_cleaned}")
-                        logger.info(f"Normalized movie title: {movie_title_normalized}, Normalized box title: {title_text_normalized}")
-                        logger.info(f"Movie title (digits to words): {movie_title_cleaned_word}, Box title (digits to words): {title_text_cleaned_word}")
-                        logger.info(f"Movie title (words to digits): {movie_title_cleaned_digit}, Box title (words to digits): {title_text_cleaned_digit}")
-
-                        # Compare the title in all variations
-                        if not (
-                            fuzz.partial_ratio(title_text_cleaned.lower(), movie_title_cleaned.lower()) >= 75 or
-                            fuzz.partial_ratio(title_text_normalized.lower(), movie_title_normalized.lower()) >= 75 or
-                            fuzz.partial_ratio(title_text_cleaned_word.lower(), movie_title_cleaned_word.lower()) >= 75 or
-                            fuzz.partial_ratio(title_text_normalized_word.lower(), movie_title_normalized_word.lower()) >= 75 or
-                            fuzz.partial_ratio(title_text_cleaned_digit.lower(), movie_title_cleaned_digit.lower()) >= 75 or
-                            fuzz.partial_ratio(title_text_normalized_digit.lower(), movie_title_normalized_digit.lower()) >= 75
-                        ):
-                            logger.warning(f"Title mismatch for box {i}: {title_text_cleaned} or {title_text_normalized} (Expected: {movie_title_cleaned} or {movie_title_normalized}). Skipping.")
-                            continue  # Skip this box if none of the variations match
-
-                        # Compare the year with the expected year (allow ±1 year)
-                        expected_year = extract_year(movie_title)
-                        if expected_year is not None and abs(box_year - expected_year) > 1:
-                            logger.warning(f"Year mismatch for box {i}: {box_year} (Expected: {expected_year}). Skipping.")
-                            continue  # Skip this box if the year doesn't match
+                        logger.info(f"Box {i} title: {title_text} (Score: {item.score}, Title score: {item.match.score}, Year: {item.match.year})")
 
                         # After navigating to the movie details page and verifying the title/year
-                        if prioritize_buttons_in_box(result_box):
+                        if prioritize_buttons_in_box(driver, result_box):
                             logger.info(f"Successfully handled buttons in box {i}.")
                             confirmation_flag = True  # Mark confirmation as successful
                         else:
                             logger.warning(f"Failed to handle buttons in box {i}. Skipping.")
                         # After clicking, check if the button has changed to "RD (0%)" or "RD (100%)"
                         try:
+                            box_element = find_result_box(driver, result_box["index"])
                             rd_button = WebDriverWait(driver, 10).until(
-                                EC.presence_of_element_located((By.XPATH, ".//button[contains(text(), 'RD (')]"))
+                                lambda _: box_element.find_element(By.XPATH, ".//button[contains(text(), 'RD (')]")
                             )
                             rd_button_text = rd_button.text
                             logger.info(f"RD button text after clicking: {rd_button_text}")
@@ -1102,35 +3071,496 @@ def search_on_debrid(movie_title, driver):
                             if "RD (0%)" in rd_button_text:
                                 logger.warning(f"RD (0%) button detected after clicking Instant RD in box {i} {title_text}. Undoing the click and moving to the next box.")
                                 rd_button.click()  # Undo the click by clicking the RD (0%) button
+                                confirmation_flag = False  # The torrent is not cached, so nothing was added
                                 continue  # Move to the next box
 
                             # If it's "RD (100%)", we are done with this entry
                             if "RD (100%)" in rd_button_text:
                                 logger.success(f"RD (100%) button detected. {i} {title_text}. This entry is complete.")
-                                confirmation_flag = True
-                                return confirmation_flag  # Exit the function as we've found a matching red button
-                                break  # Break out of the loop since the task is complete
+                                return SearchOutcome.CONFIRMED  # Exit the function as the entry is complete
+
+                            logger.info(f"Box {i} {title_text} was added and is still downloading ({rd_button_text}).")
 
                         except TimeoutException:
                             logger.warning(f"Timeout waiting for RD button status change in box {i}.")
-                            continue  # Move to the next box if a timeout occurs
 
                     except NoSuchElementException as e:
                         logger.warning(f"Could not find 'Instant RD' button in box {i}: {e}")
                     except TimeoutException as e:
                         logger.warning(f"Timeout when processing box {i}: {e}")
+                    finally:
+                        stage_timer.lap("click_confirm")
+
+                    # Only a removed 'RD (0%)' torrent frees the way for the next box; after any other click the
+                    # torrent is (or may be) in RD, and clicking another box would add a second copy
+                    if confirmation_flag:
+                        break
 
             except TimeoutException:
                 logger.warning("Timeout waiting for result boxes to appear.")
+                stage_timer.lap("box_scan")
+                if not confirmation_flag:
+                    return SearchOutcome.TIMEOUT
 
-            return confirmation_flag  # Return the confirmation flag
+            if confirmation_flag:
+                return SearchOutcome.CONFIRMED
+            # A movie page that never settled says little about the movie, so it backs off like a timeout
+            return SearchOutcome.TIMEOUT if movie_page.state == PageState.TIMEOUT else SearchOutcome.NO_CACHED_TORRENT
 
         except TimeoutException:
             logger.warning("Timeout waiting for the RD status message.")
-            return
+            return SearchOutcome.TIMEOUT
 
     except Exception as ex:
         logger.critical(f"Error during Selenium automation: {ex}")
+        if isinstance(ex, WebDriverException) and not isinstance(ex, TimeoutException):
+            raise  # Let the browser pool count this against the session's health
+        return SearchOutcome.TIMEOUT if isinstance(ex, TimeoutException) else SearchOutcome.ERROR
+
+### Real-Debrid API and the local index of the account's library
+rd_rate_limiter = AsyncRateLimiter(250, 60, "Real-Debrid API")  # Real-Debrid allows 250 calls a minute
+
+async def rd_api_request(method, path, retry=None, **kwargs) -> httpx.Response:
+    """Calls the Real-Debrid API with the current access token, within the account's rate limit."""
+    await rd_rate_limiter.acquire()
+    headers = {"Authorization": f"Bearer {json.loads(RD_ACCESS_TOKEN)['value']}"}
+    response = await http_request("real-debrid", method, f"{RD_API_BASE_URL}{path}", retry=retry, headers=headers, **kwargs)
+    rd_rate_limiter.update_from_headers(response.headers)
+    return response
+
+
+class RealDebridLibrary:
+    """
+    Local index of the torrents in the Real-Debrid account, with the title and year parsed from each
+    filename, so a movie that is already in the library is recognised without opening DMM. refresh()
+    only fetches the torrents added since the last refresh (the API lists the newest first); a periodic
+    full pass also drops the torrents deleted since. Only finished ('downloaded') torrents count, like
+    the 'RD (100%)' buttons on DMM; torrents indexed while still in progress are looked up again on
+    every incremental refresh until they finish.
+    """
+
+    PAGE_SIZE = 500
+    UNFINISHED_PER_REFRESH = 25  # Unfinished torrents looked up per incremental refresh; the full sync covers the rest
+    FAILED_STATUSES = ("magnet_error", "error", "virus", "dead")  # Torrents that will never finish
+    YEAR_TOLERANCE = 1  # Like rank_torrents: release years are often off by one
+    # Release group and site tags some filenames start with, e.g. "[YTS.MX] " or "www.site.org - "
+    LEADING_TAGS = re.compile(r"^(?:\s*\[[^\]]*\]\s*|\s*www\.\S+\s+-\s+)+", re.IGNORECASE)
+    NON_WORD = re.compile(r"[\W_]+")
+
+    def __init__(self, refresh_minutes, full_sync_hours):
+        self.refresh_minutes = refresh_minutes
+        self.full_sync_seconds = full_sync_hours * 3600
+        self.hits = 0
+        self.misses = 0
+        with db_lock:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS rd_library (
+                    id TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    title_key TEXT,
+                    year INTEGER,
+                    status TEXT,
+                    added TEXT,
+                    seen_at REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS rd_library_title ON rd_library (title_key, year)")
+            db.execute("CREATE INDEX IF NOT EXISTS rd_library_hash ON rd_library (hash)")
+
+    @property
+    def enabled(self) -> bool:
+        return self.refresh_minutes > 0
+
+    @classmethod
+    def title_key(cls, title) -> str:
+        """'Ocean's Eleven' and 'Oceans.11' both become 'oceans11': number words as digits, only letters and digits."""
+        title = title_normalizer.words_to_numbers(normalize_title(title).replace("&", " and "))
+        return cls.NON_WORD.sub("", title.casefold())
+
+    @classmethod
+    def parse_filename(cls, filename) -> tuple[Optional[str], Optional[int]]:
+        """
+        Title key and year of a release name. The last year in the name is taken as the release year, so
+        titles that contain a year themselves ('Blade.Runner.2049.2017.1080p') keep it.
+        """
+        name = title_normalizer.RESOLUTION.sub("", cls.LEADING_TAGS.sub("", filename))
+        for match in reversed(list(title_normalizer.YEAR.finditer(name))):
+            key = cls.title_key(name[:match.start()])
+            if key:
+                return key, int(match.group(0))
+        return None, None
+
+    def _store(self, torrents: List[dict], seen_at):
+        rows = []
+        for torrent in torrents:
+            filename = torrent.get("filename") or ""
+            title_key, year = self.parse_filename(filename)
+            rows.append((
+                torrent["id"], (torrent.get("hash") or "").lower(), filename, title_key, year,
+                torrent.get("status"), torrent.get("added"), seen_at
+            ))
+        with db_lock:
+            db.executemany(
+                "INSERT OR REPLACE INTO rd_library (id, hash, filename, title_key, year, status, added, seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def remember(self, torrent: dict):
+        """Adds a torrent SeerrBridge just added itself (a /torrents/info response) ahead of the next refresh."""
+        self._store([torrent], time.time())
+
+    async def refresh(self):
+        watermark = get_sync_state("rd_library_watermark")
+        last_full_sync = float(get_sync_state("rd_library_last_full_sync", 0))
+        full_sync = watermark is None or time.time() - last_full_sync >= self.full_sync_seconds
+        logger.info("Rebuilding the Real-Debrid library index." if full_sync else f"Indexing Real-Debrid torrents added after {watermark}.")
+
+        started = time.time()
+        newest = watermark
+        fetched = 0
+        page = 1
+        try:
+            while True:
+                response = await rd_api_request("GET", "/torrents", params={"page": page, "limit": self.PAGE_SIZE})
+                if response.status_code == 204:
+                    break  # Past the last page
+                if response.status_code != 200:
+                    raise httpx.HTTPStatusError(f"Real-Debrid returned {response.status_code}", request=response.request, response=response)
+
+                torrents = response.json() or []
+                # The torrent at the watermark is fetched again, in case others were added in the same millisecond
+                new = [torrent for torrent in torrents if full_sync or (torrent.get("added") or "") >= watermark]
+                self._store(new, started)
+                fetched += len(new)
+                newest = max([newest or ""] + [torrent.get("added") or "" for torrent in new]) or None
+                if len(new) < len(torrents) or len(torrents) < self.PAGE_SIZE:
+                    break  # Everything from here on was seen by an earlier refresh, or this was the last page
+                page += 1
+        except (httpx.HTTPError, ValueError, TypeError) as e:
+            # Keep the watermark so the next refresh fetches the missing pages again
+            logger.error(f"Failed to refresh the Real-Debrid library index: {e!r}")
+            return
+
+        if not full_sync:
+            await self._refresh_unfinished(started)
+        if full_sync:
+            with db_lock:
+                removed = db.execute("DELETE FROM rd_library WHERE seen_at < ?", (started,)).rowcount
+            if removed:
+                logger.info(f"Removed {removed} torrent(s) that are no longer in Real-Debrid from the library index.")
+            set_sync_state("rd_library_last_full_sync", started)
+        if newest:
+            set_sync_state("rd_library_watermark", newest)
+        set_sync_state("rd_library_refreshed_at", started)
+        logger.info(f"Indexed {fetched} Real-Debrid torrent(s).")
+
+    async def _refresh_unfinished(self, seen_at):
+        """
+        Updates the torrents indexed before they finished downloading, which an incremental refresh does not
+        fetch again. Failed torrents are left to the full sync, and at most UNFINISHED_PER_REFRESH are looked
+        up per pass, least recently seen first, so stalled downloads cost a bounded number of calls.
+        """
+        with db_lock:
+            rows = db.execute(
+                f"SELECT id FROM rd_library WHERE status != 'downloaded' AND status NOT IN ({', '.join('?' * len(self.FAILED_STATUSES))}) "
+                "AND seen_at < ? ORDER BY seen_at LIMIT ?",
+                (*self.FAILED_STATUSES, seen_at, self.UNFINISHED_PER_REFRESH)
+            ).fetchall()
+        for (torrent_id,) in rows:
+            try:
+                response = await rd_api_request("GET", f"/torrents/info/{torrent_id}")
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not update Real-Debrid torrent {torrent_id} in the library index: {e!r}")
+                continue
+            if response.status_code == 404:
+                with db_lock:
+                    db.execute("DELETE FROM rd_library WHERE id = ?", (torrent_id,))
+            elif response.status_code == 200:
+                self._store([response.json()], seen_at)
+
+    def find(self, movie_title) -> Optional[dict]:
+        """Returns the downloaded torrent whose title and year (within ±1) match the requested movie, if any."""
+        if not self.enabled:
+            return None
+        # Parsed like a filename, so "Blade Runner 2049 (2017)" is looked up with its release year
+        title_key, year = self.parse_filename(movie_title)
+        if title_key is None:
+            title_key = self.title_key(movie_title.split('(')[0].strip())
+        if not title_key:
+            return None
+
+        query = "SELECT id, hash, filename, year FROM rd_library WHERE title_key = ? AND status = 'downloaded'"
+        params = [title_key]
+        if year is not None:
+            query += " AND year BETWEEN ? AND ? ORDER BY ABS(year - ?)"
+            params += [year - self.YEAR_TOLERANCE, year + self.YEAR_TOLERANCE, year]
+        with db_lock:
+            cursor = db.execute(query + " LIMIT 1", params)
+            row = cursor.fetchone()
+        if row is None:
+            self.misses += 1
+            RD_LIBRARY_LOOKUPS.labels("miss").inc()
+            return None
+        self.hits += 1
+        RD_LIBRARY_LOOKUPS.labels("hit").inc()
+        return {column[0]: value for column, value in zip(cursor.description, row)}
+
+    def owned_hashes(self, hashes) -> set:
+        """The given torrent hashes that are downloaded in the library already."""
+        hashes = [torrent_hash.lower() for torrent_hash in hashes]
+        if not self.enabled or not hashes:
+            return set()
+        with db_lock:
+            rows = db.execute(
+                f"SELECT hash FROM rd_library WHERE status = 'downloaded' AND hash IN ({', '.join('?' * len(hashes))})",
+                hashes
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def stats(self) -> dict:
+        with db_lock:
+            rows = db.execute("SELECT status, COUNT(*) FROM rd_library GROUP BY status").fetchall()
+        refreshed_at = get_sync_state("rd_library_refreshed_at")
+        return {
+            "enabled": self.enabled,
+            "torrents": dict(rows),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshed_at": datetime.fromtimestamp(float(refreshed_at)).isoformat(timespec="seconds") if refreshed_at else None,
+        }
+
+
+rd_library = RealDebridLibrary(RD_LIBRARY_REFRESH_MINUTES, RD_LIBRARY_FULL_SYNC_HOURS)
+
+### Acquisition backends: how a queued movie ends up in Real-Debrid
+class AcquisitionBackend(ABC):
+    """
+    Adds a requested movie to Real-Debrid. acquire() returns a SearchOutcome; unexpected errors are
+    raised, so the queue retries the job. concurrency is the number of queue workers it can keep busy.
+    """
+
+    name = "base"
+
+    @property
+    def concurrency(self) -> int:
+        return 1
+
+    @abstractmethod
+    async def acquire(self, movie_title, tmdb_id=None, imdb_id=None) -> SearchOutcome:
+        ...
+
+    def status(self) -> dict:
+        return {"name": self.name, "concurrency": self.concurrency}
+
+
+class SeleniumBackend(AcquisitionBackend):
+    """Drives Debrid Media Manager in a browser of the pool (search_on_debrid)."""
+
+    name = "selenium"
+
+    @property
+    def concurrency(self) -> int:
+        return BROWSER_POOL_SIZE
+
+    async def acquire(self, movie_title, tmdb_id=None, imdb_id=None) -> SearchOutcome:
+        return await run_search(movie_title, tmdb_id, imdb_id)
+
+
+# DMM's API only answers requests that carry the proof of work its web client computes: a random token
+# with a timestamp (dmmProblemKey) and a solution derived from it and DMM's salt. Ported from DMM's client.
+DMM_PROBLEM_SALT = "debridmediamanager.com%%fe7#td00rA3vHz%VmI"
+
+def dmm_hash(text) -> str:
+    """cyrb53, the 53-bit string hash DMM's client uses, as lowercase hex."""
+    mask = 0xFFFFFFFF
+    h1, h2 = 0xDEADBEEF, 0x41C6CE57
+    for char in text:
+        code = ord(char)
+        h1 = ((h1 ^ code) * 2654435761) & mask
+        h2 = ((h2 ^ code) * 1597334677) & mask
+    h1 = (((h1 ^ (h1 >> 16)) * 2246822507) & mask) ^ (((h2 ^ (h2 >> 13)) * 3266489909) & mask)
+    h2 = (((h2 ^ (h2 >> 16)) * 2246822507) & mask) ^ (((h1 ^ (h1 >> 13)) * 3266489909) & mask)
+    return format(4294967296 * (0x1FFFFF & h2) + h1, "x")
+
+def dmm_solution(problem_key) -> str:
+    """Interleaves the first halves of the two hashes and appends their second halves reversed."""
+    token = problem_key.rsplit("-", 1)[0]
+    first, second = dmm_hash(problem_key), dmm_hash(f"{DMM_PROBLEM_SALT}-{token}")
+    half = len(first) // 2
+    interleaved = "".join(a + b for a, b in zip(first[:half], second[:half]))
+    return interleaved + second[half:][::-1] + first[half:][::-1]
+
+def dmm_proof_of_work() -> Dict[str, str]:
+    """The dmmProblemKey and solution query parameters for one call to DMM's API."""
+    problem_key = f"{os.urandom(6).hex()}-{int(time.time())}"
+    return {"dmmProblemKey": problem_key, "solution": dmm_solution(problem_key)}
+
+
+class RealDebridHttpBackend(AcquisitionBackend):
+    """
+    Acquires without a browser: reads the movie's torrents from DMM's torrent list, asks Real-Debrid
+    which of the eligible ones are cached, then adds the best ranked one with addMagnet/selectFiles and keeps it
+    only if Real-Debrid reports it downloaded (a cached torrent is finished at once; others are deleted
+    again, like undoing an 'RD (0%)' click). Movies it cannot resolve over HTTP (no IMDb ID, DMM's list
+    unavailable) go to the fallback backend when there is one.
+    """
+
+    name = "http"
+    AVAILABILITY_BATCH = 50  # Hashes per instantAvailability call
+    INFO_POLL_SECONDS = 0.5
+    INFO_TIMEOUT_SECONDS = 15  # How long a just added torrent may stay in one of the statuses waited for
+    TRANSITIONAL_STATUSES = ("magnet_conversion", "waiting_files_selection", "queued")
+
+    def __init__(self, fallback: Optional[AcquisitionBackend] = None):
+        self.fallback = fallback
+        self.dmm_rejections = 0
+        self.added = 0
+        self.deleted = 0
+        self.fallbacks = 0
+
+    @property
+    def concurrency(self) -> int:
+        return RD_API_CONCURRENCY + (self.fallback.concurrency if self.fallback else 0)
+
+    async def _dmm_torrents(self, imdb_id) -> Optional[List[TorrentCandidate]]:
+        params = {"imdbId": imdb_id, **dmm_proof_of_work()}
+        try:
+            response = await http_request("dmm", "GET", f"{DMM_BASE_URL}/api/torrents/movie", params=params)
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not load DMM's torrent list for {imdb_id}: {e!r}")
+            return None
+        if response.status_code in (401, 403):
+            # DMM changed its proof of work; every movie goes to the fallback until dmm_proof_of_work() is updated
+            self.dmm_rejections += 1
+            logger.error(f"DMM rejected the torrent list request for {imdb_id} (status {response.status_code}): {response.text[:200]}")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"DMM's torrent list for {imdb_id} returned status {response.status_code}.")
+            return None
+        return parse_dmm_torrents(response.json())
+
+    async def _instant_availability(self, hashes) -> Dict[str, bool]:
+        """Cached flag per hash; hashes Real-Debrid did not answer for are left out."""
+        availability = {}
+        for start in range(0, len(hashes), self.AVAILABILITY_BATCH):
+            batch = hashes[start:start + self.AVAILABILITY_BATCH]
+            response = await rd_api_request("GET", "/torrents/instantAvailability/" + "/".join(batch))
+            if response.status_code != 200:
+                logger.warning(f"Real-Debrid instantAvailability returned status {response.status_code}.")
+                continue
+            for torrent_hash, value in (response.json() or {}).items():
+                availability[torrent_hash.lower()] = bool(isinstance(value, dict) and value.get("rd"))
+        return availability
+
+    async def _poll_info(self, torrent_id, statuses) -> dict:
+        """The torrent's info once its status is none of statuses, or the last info after INFO_TIMEOUT_SECONDS."""
+        deadline = time.monotonic() + self.INFO_TIMEOUT_SECONDS
+        while True:
+            info = await rd_api_request("GET", f"/torrents/info/{torrent_id}")
+            try:
+                torrent = info.json() if info.status_code == 200 else {}
+            except ValueError:
+                torrent = {}
+            if torrent.get("status") not in statuses or time.monotonic() >= deadline:
+                return torrent
+            await asyncio.sleep(self.INFO_POLL_SECONDS)
+
+    async def _add_if_cached(self, candidate: TorrentCandidate) -> bool:
+        # Never retried: a request that reached Real-Debrid but failed to answer may have added the torrent already
+        response = await rd_api_request("POST", "/torrents/addMagnet", retry=False, data={"magnet": f"magnet:?xt=urn:btih:{candidate.hash}"})
+        try:
+            torrent_id = response.json().get("id") if response.status_code == 201 else None
+        except ValueError:
+            torrent_id = None
+        if not torrent_id:
+            logger.warning(f"Real-Debrid did not add {candidate.title} (addMagnet status {response.status_code}).")
+            return False
+        self.added += 1
+
+        # The files can only be selected once Real-Debrid has converted the magnet
+        torrent = await self._poll_info(torrent_id, ("magnet_conversion",))
+        if torrent.get("status") == "waiting_files_selection":
+            selected = await rd_api_request("POST", f"/torrents/selectFiles/{torrent_id}", data={"files": "all"})
+            if selected.status_code in (202, 204):  # 202: the files were selected already
+                torrent = await self._poll_info(torrent_id, self.TRANSITIONAL_STATUSES)
+            else:
+                logger.warning(f"Real-Debrid selectFiles returned status {selected.status_code} for {candidate.title}.")
+        status = torrent.get("status")
+        if status == "downloaded":
+            rd_library.remember(torrent)
+            return True
+
+        logger.warning(f"{candidate.title} is not cached in RD (status {status}). Removing it again.")
+        await rd_api_request("DELETE", f"/torrents/delete/{torrent_id}")
+        self.deleted += 1
+        return False
+
+    async def _fall_back(self, movie_title, tmdb_id, imdb_id, reason) -> SearchOutcome:
+        if self.fallback is None:
+            logger.warning(f"Cannot acquire {movie_title} over HTTP ({reason}) and no fallback backend is configured.")
+            return SearchOutcome.NO_SEARCH_HIT
+        logger.info(f"Acquiring {movie_title} with the {self.fallback.name} backend instead ({reason}).")
+        self.fallbacks += 1
+        return await self.fallback.acquire(movie_title, tmdb_id, imdb_id)
+
+    async def acquire(self, movie_title, tmdb_id=None, imdb_id=None) -> SearchOutcome:
+        if not imdb_id:
+            return await self._fall_back(movie_title, tmdb_id, imdb_id, "no IMDb ID")
+        candidates = await self._dmm_torrents(imdb_id)
+        if candidates is None:
+            return await self._fall_back(movie_title, tmdb_id, imdb_id, "DMM torrent list unavailable")
+        if not candidates:
+            logger.warning(f"DMM lists no torrents for {movie_title}.")
+            return SearchOutcome.NO_SEARCH_HIT
+
+        matcher = await asyncio.to_thread(TitleMatcher, movie_title)
+        # Availability is only asked for the torrents that can be added at all
+        eligible = [item.candidate for item in await asyncio.to_thread(rank_candidates, matcher, candidates) if item.eligible]
+        if not eligible:
+            logger.warning(f"None of the {len(candidates)} torrents DMM lists matches {movie_title}.")
+            return SearchOutcome.NO_CACHED_TORRENT
+        owned = rd_library.owned_hashes([candidate.hash for candidate in eligible])
+        if owned:
+            title = next(candidate.title for candidate in eligible if candidate.hash in owned)
+            logger.success(f"{title} is already in the Real-Debrid library. Nothing to add for {movie_title}.")
+            return SearchOutcome.CONFIRMED
+
+        availability = await self._instant_availability([candidate.hash for candidate in eligible])
+        for candidate in eligible:
+            candidate.cached = availability.get(candidate.hash)
+        ranked = await asyncio.to_thread(rank_candidates, matcher, eligible)
+        log_ranking(ranked)
+        eligible = [item.candidate for item in ranked if item.eligible]
+        # Known cached torrents first, then the ones Real-Debrid did not answer for; known uncached ones are skipped
+        attempts = ([candidate for candidate in eligible if candidate.cached] or eligible)[:MAX_CANDIDATE_ATTEMPTS]
+        for candidate in attempts:
+            if await self._add_if_cached(candidate):
+                logger.success(f"Added {candidate.title} to Real-Debrid for {movie_title}.")
+                return SearchOutcome.CONFIRMED
+        logger.warning(f"No cached torrent found for {movie_title} ({len(eligible)} eligible, {len(attempts)} tried).")
+        return SearchOutcome.NO_CACHED_TORRENT
+
+    def status(self) -> dict:
+        return {
+            **super().status(),
+            "fallback": self.fallback.name if self.fallback else None,
+            "added": self.added,
+            "deleted": self.deleted,
+            "fallbacks": self.fallbacks,
+            "dmm_rejections": self.dmm_rejections,
+            "rate_limit": rd_rate_limiter.status(),
+        }
+
+
+def create_acquisition_backend() -> AcquisitionBackend:
+    if ACQUISITION_BACKEND == "http":
+        return RealDebridHttpBackend(SeleniumBackend() if BROWSER_POOL_SIZE else None)
+    return SeleniumBackend()
+
+
+acquisition_backend = create_acquisition_backend()
 
 async def get_user_input():
     try:
@@ -1183,7 +3613,7 @@ async def jellyseer_webhook(request: Request, background_tasks: BackgroundTasks)
     logger.info(f"Extracted tmdbId: {tmdb_id}")
 
     # Fetch movie details from Trakt using tmdb_id
-    movie_details = get_movie_details_from_trakt(tmdb_id)
+    movie_details = await get_movie_details_from_trakt(tmdb_id)
     if not movie_details:
         logger.error("Failed to fetch movie details from Trakt")
         raise HTTPException(status_code=500, detail="Failed to fetch movie details from Trakt")
@@ -1193,42 +3623,105 @@ async def jellyseer_webhook(request: Request, background_tasks: BackgroundTasks)
     logger.info(f"Fetched movie details: {movie_title}")
 
     # Add movie request to background processing queue
-    background_tasks.add_task(add_request_to_queue, movie_title)
+    background_tasks.add_task(add_request_to_queue, movie_title, tmdb_id, imdb_id=movie_details['ids'].get('imdb'))
     
     # Log the response before returning
     logger.info(f"Returning response: {movie_details['title']} ({movie_details['year']})")
     
     return {"status": "success", "movie_title": movie_details['title'], "movie_year": movie_details['year']}
 
+@app.get("/health")
+async def health():
+    return {
+        "jobs": job_store.counts(),
+        "acquisition": acquisition_backend.status(),
+        "browsers": browser_pool.status(),
+        "trakt_cache": trakt_cache.stats(),
+        "dmm_movie_pages": dmm_movie_pages.stats(),
+        "rd_library": rd_library.stats(),
+        "title_normalization_cache": title_normalizer.stats(),
+        "trakt_rate_limit": trakt_rate_limiter.status(),
+        "search_backoff": search_backoff.stats(),
+        "startup": startup_report.summary(),
+    }
+
+@app.get("/metrics")
+async def metrics():
+    job_counts = job_store.counts()
+    for state in ("pending", "retry", "running", "succeeded", "failed"):
+        QUEUE_DEPTH.labels(state).set(job_counts.get(state, 0))
+    BROWSERS_BUSY.set(sum(worker.busy for worker in browser_pool.workers))
+    TRAKT_RATE_LIMIT_REMAINING.set(trakt_rate_limiter.remaining)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 def schedule_token_refresh():
     """Schedule the token refresh every 10 minutes."""
-    scheduler.add_job(check_and_refresh_access_token, 'interval', minutes=10)
+    scheduler.add_job(check_and_refresh_access_token, 'interval', minutes=10, id="token_refresh", replace_existing=True, max_instances=1, coalesce=True)
     logger.info("Scheduled token refresh every 10 minutes.")
 
+def schedule_rd_library_refresh():
+    """Schedule the Real-Debrid library index refresh every RD_LIBRARY_REFRESH_MINUTES."""
+    scheduler.add_job(
+        rd_library.refresh, 'interval', minutes=RD_LIBRARY_REFRESH_MINUTES,
+        id="rd_library_refresh", replace_existing=True, max_instances=1, coalesce=True
+    )
+    logger.info(f"Scheduled Real-Debrid library index refresh every {RD_LIBRARY_REFRESH_MINUTES} minute(s).")
+
 ### Background Task to Process Overseerr Requests Periodically ###
 @app.on_event("startup")
 async def startup_event():
-    global processing_task
     logger.info('Starting SeerrBridge...')
 
-    # Check and refresh access token before any other initialization
-    check_and_refresh_access_token()
+    # Check and refresh the access token while the browsers launch; they only need it to log in to DMM
+    async def check_access_token():
+        with startup_report.measure("token_check"):
+            await check_and_refresh_access_token()
+    token_check = asyncio.create_task(check_access_token())
+
+    # Schedule the token refresh
+    schedule_token_refresh()
+    scheduler.start()
+
+    # The browsers warm up in the background, so FastAPI accepts webhooks right away; their requests
+    # wait in the queue until a browser is ready
+    track_task(asyncio.create_task(warm_up(token_check)), startup_tasks, "Startup")
+
+async def warm_up(token_check):
+    """Starts the browser pool, the queue workers, the library index and the initial check."""
+    global processing_tasks
 
     # Always initialize the browser when the bot is ready
+    browser_startup = asyncio.create_task(initialize_browser(token_check))
+    try:
+        await token_check
+    except Exception as e:
+        logger.error(f"Failed to check the Real-Debrid access token: {e}")
+        await asyncio.gather(browser_startup, return_exceptions=True)  # The pool gives up without credentials
+        return
+
+    # Start as many request processing tasks as the acquisition backend can keep busy, if not already started.
+    # Browser searches wait for the first session that is ready.
+    if not processing_tasks:
+        job_store.recover()
+        processing_tasks = [asyncio.create_task(process_requests()) for _ in range(acquisition_backend.concurrency)]
+        logger.info(f"Started {len(processing_tasks)} request processing task(s).")
+
+    # Index the Real-Debrid library in the background (the token is checked by now); the initial check waits for it
+    library_indexed = None
+    if rd_library.enabled:
+        library_indexed = asyncio.create_task(rd_library.refresh())
+        schedule_rd_library_refresh()
+
     try:
-        await initialize_browser()
+        await browser_startup
     except Exception as e:
         logger.error(f"Failed to initialize browser: {e}")
         return
+    startup_report.finish()
 
-    # Start the request processing task if not already started
-    if processing_task is None:
-        processing_task = asyncio.create_task(process_requests())
-        logger.info("Started request processing task.")
+    await start_initial_check(library_indexed)
 
-    # Schedule the token refresh
-    schedule_token_refresh()
-    scheduler.start()
+async def start_initial_check(library_indexed=None):
     # Ask user if they want to proceed with the initial check and recurring task
     if ENABLE_AUTOMATIC_BACKGROUND_TASK:
         user_input = 'y'
@@ -1237,6 +3730,9 @@ async def startup_event():
     
     if user_input == 'y':
         try:
+            # Movies already in the Real-Debrid library are only recognised once it is indexed
+            if library_indexed is not None:
+                await library_indexed
             # Run the initial check immediately
             await process_movie_requests()
             logger.info("Completed initial check of movie requests.")
@@ -1256,13 +3752,19 @@ async def startup_event():
 
 def schedule_recheck_movie_requests():
     # Correctly schedule the job with the REFRESH_INTERVAL_MINUTES configured interval.
-    scheduler.add_job(process_movie_requests, 'interval', minutes=REFRESH_INTERVAL_MINUTES)
+    # One check at a time; runs missed while one was still going are merged into a single run
+    scheduler.add_job(
+        process_movie_requests, 'interval', minutes=REFRESH_INTERVAL_MINUTES,
+        id="recheck_movie_requests", replace_existing=True, max_instances=1, coalesce=True
+    )
     logger.info(f"Scheduled rechecking movie requests every {REFRESH_INTERVAL_MINUTES} minute(s).")
 
 
 
+@app.on_event("shutdown")
 async def on_close():
     await shutdown_browser()  # Ensure browser is closed when the bot closes
+    await http_clients.close()
 
 # Main entry point for running the FastAPI server
 if __name__ == "__main__":
@@ -0,0 +1,31 @@
+"""Imports seerrbridge once for the tests, with a throwaway database and placeholder credentials."""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session")
+def seerrbridge():
+    workdir = tempfile.mkdtemp(prefix="seerrbridge-test-")
+    os.environ.update({
+        "DATABASE_PATH": os.path.join(workdir, "seerrbridge.db"),
+        "RD_ACCESS_TOKEN": json.dumps({"value": "test", "expiry": 4102444800}),
+        "OVERSEERR_BASE": "http://127.0.0.1:9",
+        "OVERSEERR_API_KEY": "test",
+        "TRAKT_API_KEY": "test",
+        "REFRESH_INTERVAL_MINUTES": "120",
+    })
+    sys.path.insert(0, str(REPO_ROOT))
+    cwd = os.getcwd()
+    os.chdir(workdir)  # seerbridge.log and .env lookups stay out of the repository
+    try:
+        import seerrbridge
+    finally:
+        os.chdir(cwd)
+    return seerrbridge
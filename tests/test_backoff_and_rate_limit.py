@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+
+TMDB_ID = 27205
+
+
+@pytest.fixture
+def backoff(seerrbridge):
+    """A SearchBackoff starting at 100 s and capped at 1000 s."""
+    with seerrbridge.db_lock:
+        seerrbridge.db.execute("DELETE FROM search_attempts")
+    return seerrbridge.SearchBackoff(100, 1000)
+
+
+def delay(seerrbridge, tmdb_id):
+    with seerrbridge.db_lock:
+        return seerrbridge.db.execute(
+            "SELECT next_attempt_at - last_attempt_at FROM search_attempts WHERE tmdb_id = ?", (tmdb_id,)
+        ).fetchone()[0]
+
+
+def set_next_attempt(seerrbridge, tmdb_id, seconds_from_now):
+    with seerrbridge.db_lock:
+        seerrbridge.db.execute(
+            "UPDATE search_attempts SET next_attempt_at = ? WHERE tmdb_id = ?", (time.time() + seconds_from_now, tmdb_id)
+        )
+
+
+def test_backoff_doubles_with_jitter_up_to_the_cap(seerrbridge, backoff):
+    for attempt, expected in enumerate([100, 200, 400, 800, 1000, 1000], start=1):
+        backoff.record(TMDB_ID, seerrbridge.SearchOutcome.NO_CACHED_TORRENT)
+        assert expected * 0.8 <= delay(seerrbridge, TMDB_ID) <= expected * 1.2, f"attempt {attempt}"
+    assert backoff.next_attempt_at(TMDB_ID) > time.time()
+
+    backoff.record(TMDB_ID, seerrbridge.SearchOutcome.CONFIRMED)
+    assert backoff.next_attempt_at(TMDB_ID) is None
+    assert backoff.due() == []
+
+
+def test_transient_failures_back_off_a_quarter_as_long(seerrbridge, backoff):
+    for outcome in (seerrbridge.SearchOutcome.TIMEOUT, seerrbridge.SearchOutcome.ERROR, seerrbridge.SearchOutcome.NO_DETAILS):
+        backoff.record(TMDB_ID, outcome)
+        assert 25 * 0.8 <= delay(seerrbridge, TMDB_ID) <= 25 * 1.2
+        backoff.record(TMDB_ID, seerrbridge.SearchOutcome.CONFIRMED)
+
+
+def test_due_returns_overdue_movies_oldest_first_and_prune_forgets_others(seerrbridge, backoff):
+    for tmdb_id, media_id, seconds_from_now in [(1, 11, -10), (2, 12, -100), (3, 13, 100)]:
+        backoff.record(tmdb_id, seerrbridge.SearchOutcome.NO_SEARCH_HIT, media_id)
+        set_next_attempt(seerrbridge, tmdb_id, seconds_from_now)
+    assert backoff.due() == [(2, 12), (1, 11)]
+
+    # A later record without a media ID keeps the known one
+    backoff.record(1, seerrbridge.SearchOutcome.TIMEOUT)
+    set_next_attempt(seerrbridge, 1, -1)
+    assert (1, 11) in backoff.due()
+
+    backoff.prune([1, 3])
+    assert backoff.due() == [(1, 11)]
+    assert backoff.next_attempt_at(3) is not None
+    backoff.prune([])
+    assert backoff.next_attempt_at(3) is None
+
+
+def test_rate_limiter_spaces_calls_over_the_period(seerrbridge):
+    limiter = seerrbridge.AsyncRateLimiter(3, 0.3, "test")
+
+    async def run():
+        started = time.monotonic()
+
+        async def call():
+            await limiter.acquire()
+            return time.monotonic() - started
+
+        return sorted(await asyncio.gather(*(call() for _ in range(7))))
+
+    times = asyncio.run(run())
+    assert times[2] < 0.1  # The first three go through at once
+    for earlier, later in zip(times, times[3:]):
+        assert later - earlier >= 0.29  # No more than three calls in any 0.3 s
+    assert times[-1] < 0.9
+    assert limiter.remaining <= 3
+
+
+def test_rate_limiter_honours_retry_after(seerrbridge):
+    limiter = seerrbridge.AsyncRateLimiter(100, 60, "test")
+    limiter.update_from_headers({"Retry-After": "0.2"})
+    assert limiter.remaining == 0
+
+    async def run():
+        started = time.monotonic()
+        await limiter.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.19
+    assert limiter.remaining == 99
@@ -0,0 +1,76 @@
+import asyncio
+
+import httpx
+import pytest
+
+CANDIDATE_HASH = "c" * 40
+
+
+@pytest.fixture
+def real_debrid(seerrbridge, monkeypatch):
+    """Answers rd_api_request from `answers` (method and path prefix -> list of (status, body)), recording every call."""
+    answers = {}
+    calls = []
+
+    async def rd_api_request(method, path, retry=None, **kwargs):
+        calls.append(f"{method} {path}")
+        for (answer_method, prefix), responses in answers.items():
+            if method == answer_method and path.startswith(prefix):
+                status, body = responses.pop(0) if len(responses) > 1 else responses[0]
+                if isinstance(body, str):
+                    return httpx.Response(status, text=body)
+                return httpx.Response(status, json=body) if body is not None else httpx.Response(status)
+        raise AssertionError(f"Unexpected call {method} {path}")
+
+    monkeypatch.setattr(seerrbridge, "rd_api_request", rd_api_request)
+    monkeypatch.setattr(seerrbridge.RealDebridHttpBackend, "INFO_POLL_SECONDS", 0)
+    answers[("DELETE", "/torrents/delete/")] = [(204, None)]
+    return answers, calls
+
+
+def add_if_cached(seerrbridge):
+    backend = seerrbridge.RealDebridHttpBackend()
+    candidate = seerrbridge.TorrentCandidate(CANDIDATE_HASH, "Inception.2010.1080p.BluRay.x264", None, True)
+    return backend, asyncio.run(backend._add_if_cached(candidate))
+
+
+def info(status):
+    return 200, {"id": "T1", "hash": CANDIDATE_HASH, "filename": "Inception.2010.1080p.BluRay.x264", "status": status}
+
+
+def test_waits_for_conversion_and_queue_before_judging(seerrbridge, real_debrid):
+    answers, calls = real_debrid
+    answers[("POST", "/torrents/addMagnet")] = [(201, {"id": "T1"})]
+    answers[("POST", "/torrents/selectFiles/")] = [(204, None)]
+    answers[("GET", "/torrents/info/")] = [
+        info("magnet_conversion"), info("magnet_conversion"), info("waiting_files_selection"),
+        info("queued"), info("queued"), info("queued"), info("downloaded"),
+    ]
+
+    backend, added = add_if_cached(seerrbridge)
+    assert added
+    assert backend.deleted == 0
+    assert calls.count("GET /torrents/info/T1") == 7
+
+
+def test_failed_file_selection_removes_the_torrent(seerrbridge, real_debrid):
+    answers, calls = real_debrid
+    answers[("POST", "/torrents/addMagnet")] = [(201, {"id": "T1"})]
+    answers[("POST", "/torrents/selectFiles/")] = [(503, {"error": "service_unavailable", "error_code": 25})]
+    answers[("GET", "/torrents/info/")] = [info("waiting_files_selection")]
+
+    backend, added = add_if_cached(seerrbridge)
+    assert not added
+    assert calls[-1] == "DELETE /torrents/delete/T1"
+    assert backend.deleted == 1
+
+
+@pytest.mark.parametrize("response", [(201, {"error": "infringing_file", "error_code": 35}), (201, "<html>"), (503, None)])
+def test_add_magnet_without_an_id_is_a_rejection(seerrbridge, real_debrid, response):
+    answers, calls = real_debrid
+    answers[("POST", "/torrents/addMagnet")] = [response]
+
+    backend, added = add_if_cached(seerrbridge)
+    assert not added
+    assert calls == ["POST /torrents/addMagnet"]
+    assert backend.added == 0
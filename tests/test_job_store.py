@@ -0,0 +1,85 @@
+import pytest
+
+TMDB_ID = 27205
+
+
+@pytest.fixture
+def store(seerrbridge):
+    """A JobStore with a 60 s visibility timeout, 2 attempts, a 60 s retry delay and a 1 h dedup window."""
+    with seerrbridge.db_lock:
+        seerrbridge.db.execute("DELETE FROM jobs")
+    return seerrbridge.JobStore(60, 2, 60, 3600)
+
+
+def age(seerrbridge, job_id, column, seconds):
+    """Moves a timestamp of the job `seconds` into the past."""
+    with seerrbridge.db_lock:
+        seerrbridge.db.execute(f"UPDATE jobs SET {column} = {column} - ? WHERE id = ?", (seconds, job_id))
+
+
+def test_requests_for_the_same_movie_are_deduplicated(seerrbridge, store):
+    job, how = store.enqueue("Inception (2010)", TMDB_ID)
+    assert how == "created"
+
+    attached, how = store.enqueue("Inception (2010)", TMDB_ID, media_id=7, imdb_id="tt1375666")
+    assert (how, attached["id"]) == ("attached", job["id"])
+    assert (store.get(job["id"])["media_id"], store.get(job["id"])["imdb_id"]) == (7, "tt1375666")
+
+    store.finish(store.claim()["id"], True)
+    recent, how = store.enqueue("Inception (2010)", TMDB_ID)
+    assert (how, recent["id"]) == ("recent", job["id"])
+
+    # A retry is not held back by the dedup window, and neither is a request once the window has passed
+    retried, how = store.enqueue("Inception (2010)", TMDB_ID, retry=True)
+    assert how == "created" and retried["id"] != job["id"]
+    store.finish(store.claim()["id"], False, "no_cached_torrent")
+    age(seerrbridge, retried["id"], "updated_at", 3601)
+    age(seerrbridge, job["id"], "updated_at", 3601)
+    assert store.enqueue("Inception (2010)", TMDB_ID)[1] == "created"
+
+
+def test_jobs_without_tmdb_id_are_never_deduplicated(store):
+    assert store.enqueue("Inception (2010)")[1] == "created"
+    assert store.enqueue("Inception (2010)")[1] == "created"
+
+
+def test_expired_lease_hands_the_job_out_again_until_attempts_run_out(seerrbridge, store):
+    job, _ = store.enqueue("Inception (2010)", TMDB_ID)
+    claimed = store.claim()
+    assert (claimed["id"], claimed["state"], claimed["attempts"]) == (job["id"], "running", 1)
+    assert store.claim() is None  # Leased to the first worker
+
+    age(seerrbridge, job["id"], "lease_expires_at", 61)
+    claimed = store.claim()
+    assert (claimed["id"], claimed["attempts"]) == (job["id"], 2)
+
+    age(seerrbridge, job["id"], "lease_expires_at", 61)
+    assert store.claim() is None
+    assert store.get(job["id"])["state"] == "failed"
+    assert store.get(job["id"])["last_error"] == "Visibility timeout expired"
+
+
+def test_failed_attempts_are_retried_after_the_delay_then_fail(seerrbridge, store):
+    job, _ = store.enqueue("Inception (2010)", TMDB_ID)
+    store.retry_or_fail(store.claim()["id"], "WebDriverException")
+    assert store.get(job["id"])["state"] == "retry"
+    assert store.claim() is None  # Not due before the retry delay
+    assert store.has_active_job(TMDB_ID)
+
+    age(seerrbridge, job["id"], "available_at", 61)
+    store.retry_or_fail(store.claim()["id"], "WebDriverException")
+    assert store.get(job["id"])["state"] == "failed"
+    assert not store.has_active_job(TMDB_ID)
+
+
+def test_recover_requeues_running_jobs_and_prunes_old_history(seerrbridge, store):
+    running, _ = store.enqueue("Inception (2010)", TMDB_ID)
+    store.claim()
+    old, _ = store.enqueue("Heat (1995)", 949)
+    store.finish(store.claim()["id"], True)
+    age(seerrbridge, old["id"], "updated_at", store.HISTORY_RETENTION_SECONDS + 1)
+
+    store.recover()
+    assert store.get(running["id"])["state"] == "pending"
+    assert store.get(old["id"]) is None
+    assert store.claim()["id"] == running["id"]
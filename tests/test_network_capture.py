@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import pytest
+
+# A DMM movie page's performance log in the format ChromeDriver returns it (a torrent list, a blocked poster,
+# an availability check that only asks about two of the three torrents) and the response bodies DevTools hands out
+SAMPLE = json.loads((Path(__file__).parent / "fixtures" / "dmm_performance_log.json").read_text(encoding="utf-8"))
+CACHED, UNCACHED, NOT_ASKED = (result["hash"].lower() for result in json.loads(SAMPLE["bodies"]["1200.41"]["body"])["results"])
+
+
+class RecordedDriver:
+    """Hands out the recorded log in chunks, one per get_log call."""
+
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        return self.chunks.pop(0) if self.chunks else []
+
+    def execute_cdp_cmd(self, command, params):
+        assert command == "Network.getResponseBody"
+        return SAMPLE["bodies"][params["requestId"]]
+
+
+@pytest.fixture
+def capture(seerrbridge):
+    return seerrbridge.DmmNetworkCapture()
+
+
+def test_reads_torrents_and_availability_from_the_log(seerrbridge, capture):
+    capture.read(RecordedDriver(SAMPLE["log"]))
+
+    assert capture.torrents_loaded and capture.availability_checked
+    assert {torrent_hash: candidate.cached for torrent_hash, candidate in capture.candidates.items()} == {
+        CACHED: True, UNCACHED: False, NOT_ASKED: None,
+    }
+    assert capture.candidates[CACHED].size_bytes == int(11161.6 * 1024 * 1024)
+    assert capture.is_cached("Inception.2010.1080p.BluRay.x264-SPARKS") is True
+    assert capture.is_cached("Inception.2010.720p.BluRay.x264-CROSSBOW") is None
+
+
+def test_settles_after_a_quiet_period_when_dmm_checks_a_subset(seerrbridge, capture):
+    capture.read(RecordedDriver(SAMPLE["log"]))
+    assert capture.settled() is None  # The torrent DMM did not ask about yet may still be checked
+
+    capture.last_availability_at -= capture.AVAILABILITY_QUIET_SECONDS
+    status = capture.settled()
+    assert (status.state, status.torrents_count) == (seerrbridge.PageState.AVAILABILITY_CHECKED, 1)
+
+
+def test_does_not_settle_while_an_availability_check_is_in_flight(seerrbridge, capture):
+    # DMM asks again (about the third torrent) and has not had an answer yet
+    asked = next(entry for entry in SAMPLE["log"] if '"requestId": "1200.43"' in entry["message"] and "requestWillBeSent" in entry["message"])
+    asked_again = dict(asked, message=asked["message"].replace("1200.43", "1200.44"))
+    capture.read(RecordedDriver(SAMPLE["log"] + [asked_again]))
+    capture.last_availability_at -= capture.AVAILABILITY_QUIET_SECONDS
+    assert capture.settled() is None
+
+
+def test_settles_at_once_when_every_torrent_is_known(seerrbridge, capture):
+    capture.read(RecordedDriver(SAMPLE["log"]))
+    capture.candidates[NOT_ASKED].cached = False
+    assert capture.settled().state == seerrbridge.PageState.AVAILABILITY_CHECKED
+
+
+def test_empty_torrent_list_means_no_results(seerrbridge, capture, monkeypatch):
+    monkeypatch.setitem(SAMPLE["bodies"], "1200.41", {"body": json.dumps({"results": [], "errorMessage": ""})})
+    capture.read(RecordedDriver(SAMPLE["log"][:4]))
+    assert capture.settled().state == seerrbridge.PageState.NO_RESULTS
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+
+TMDB_ID = 27205
+MEDIA_ID = 7
+DETAILS = {"title": "Inception", "year": 2010, "ids": {"imdb": "tt1375666"}}
+UNKNOWN_TO_TRAKT = set()  # TMDB IDs the stubbed Trakt lookup fails for
+
+
+@pytest.fixture
+def sync(seerrbridge, monkeypatch):
+    """An incremental Overseerr sync (the watermark is set and the full sync is recent) over `requests`."""
+    requests = []
+
+    async def iter_overseerr_requests():
+        for item in requests:
+            yield item
+
+    async def get_movie_details_from_trakt(tmdb_id):
+        return None if tmdb_id in UNKNOWN_TO_TRAKT else DETAILS
+
+    monkeypatch.setattr(seerrbridge, "iter_overseerr_requests", iter_overseerr_requests)
+    monkeypatch.setattr(seerrbridge, "get_movie_details_from_trakt", get_movie_details_from_trakt)
+    with seerrbridge.db_lock:
+        for table in ("jobs", "search_attempts"):
+            seerrbridge.db.execute(f"DELETE FROM {table}")
+    seerrbridge.set_sync_state("overseerr_watermark", "2026-01-01T00:00:00.000Z")
+    seerrbridge.set_sync_state("overseerr_last_full_sync", time.time())
+    UNKNOWN_TO_TRAKT.clear()
+    return requests
+
+
+def request(tmdb_id, media_id, updated_at):
+    return {"status": 2, "updatedAt": updated_at, "media": {"tmdbId": tmdb_id, "id": media_id, "status": 3}}
+
+
+def make_due(seerrbridge, tmdb_id):
+    with seerrbridge.db_lock:
+        seerrbridge.db.execute("UPDATE search_attempts SET next_attempt_at = ? WHERE tmdb_id = ?", (time.time() - 1, tmdb_id))
+
+
+def active_jobs(seerrbridge):
+    with seerrbridge.db_lock:
+        return seerrbridge.db.execute(
+            "SELECT tmdb_id, media_id FROM jobs WHERE state IN ('pending', 'retry')"
+        ).fetchall()
+
+
+def test_due_backoff_entry_is_requeued_by_incremental_sync(seerrbridge, sync):
+    # The search failed a moment ago (well within the dedup window) and the request did not change since
+    job, _ = seerrbridge.job_store.enqueue("Inception (2010)", TMDB_ID, MEDIA_ID, "tt1375666")
+    seerrbridge.job_store.finish(job["id"], False, "no_cached_torrent")
+    seerrbridge.search_backoff.record(TMDB_ID, seerrbridge.SearchOutcome.NO_CACHED_TORRENT, MEDIA_ID)
+
+    asyncio.run(seerrbridge.queue_overseerr_requests())
+    assert active_jobs(seerrbridge) == []  # Still backing off
+
+    make_due(seerrbridge, TMDB_ID)
+    asyncio.run(seerrbridge.queue_overseerr_requests())
+    assert active_jobs(seerrbridge) == [(TMDB_ID, MEDIA_ID)]
+
+
+def test_unqueued_requests_do_not_hold_back_the_watermark(seerrbridge, sync):
+    seerrbridge.search_backoff.record(TMDB_ID, seerrbridge.SearchOutcome.TIMEOUT, MEDIA_ID)
+    UNKNOWN_TO_TRAKT.add(680)
+    sync.extend([
+        request(550, 8, "2026-01-04T00:00:00.000Z"),
+        request(680, 9, "2026-01-03T00:00:00.000Z"),  # Trakt lookup fails
+        request(TMDB_ID, MEDIA_ID, "2026-01-02T00:00:00.000Z"),  # Backing off
+    ])
+
+    asyncio.run(seerrbridge.queue_overseerr_requests())
+    assert active_jobs(seerrbridge) == [(550, 8)]
+    assert seerrbridge.get_sync_state("overseerr_watermark") == "2026-01-04T00:00:00.000Z"
+    # The failed lookup backs off like a search instead, and is retried from there
+    assert seerrbridge.search_backoff.next_attempt_at(680) is not None
+
+    sync.clear()
+    UNKNOWN_TO_TRAKT.clear()
+    make_due(seerrbridge, 680)
+    make_due(seerrbridge, TMDB_ID)
+    asyncio.run(seerrbridge.queue_overseerr_requests())
+    assert sorted(active_jobs(seerrbridge)) == [(550, 8), (680, 9), (TMDB_ID, MEDIA_ID)]
@@ -0,0 +1,21 @@
+from dataclasses import replace
+
+GB = 1024 ** 3
+
+
+def test_ranking_weights_change_the_order(seerrbridge):
+    matcher = seerrbridge.TitleMatcher("Inception (2010)")
+    candidates = [
+        seerrbridge.TorrentCandidate("a" * 40, "Inception.2010.1080p.BluRay.x264", 25 * GB, True),
+        seerrbridge.TorrentCandidate("b" * 40, "Inception.2010.2160p.BluRay.x265", 10 * GB, True),
+    ]
+    profile = seerrbridge.RANKING_PROFILES["balanced"]
+
+    # The 2160p torrent is within the ideal size, the preferred 1080p one is 5 GB above it
+    ranked = seerrbridge.rank_candidates(matcher, candidates, profile)
+    assert [item.candidate.hash[0] for item in ranked] == ["b", "a"]
+
+    # Weighing the resolution preference more than the size puts the 1080p torrent first
+    weights = replace(profile.weights, resolution_step=20)
+    ranked = seerrbridge.rank_candidates(matcher, candidates, replace(profile, weights=weights))
+    assert [item.candidate.hash[0] for item in ranked] == ["a", "b"]
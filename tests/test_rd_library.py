@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def library(seerrbridge):
+    with seerrbridge.db_lock:
+        seerrbridge.db.execute("DELETE FROM rd_library")
+    return seerrbridge.rd_library
+
+
+def torrent(torrent_id, filename, status="downloaded"):
+    return {"id": torrent_id, "hash": torrent_id.lower().ljust(40, "0"), "filename": filename, "status": status, "added": "2026-01-01T00:00:00.000Z"}
+
+
+def test_unfinished_torrents_are_rechecked_in_bounded_batches(seerrbridge, library, monkeypatch):
+    stalled = [torrent(f"S{number:02d}", f"Stalled.Movie.{number}.2001.1080p", "downloading") for number in range(30)]
+    library._store(stalled, time.time() - 3600)
+    library._store([torrent("DEAD", "Dead.Movie.2001.1080p", "dead")], time.time() - 3600)
+    looked_up = []
+
+    async def rd_api_request(method, path, retry=None, **kwargs):
+        torrent_id = path.rsplit("/", 1)[-1]
+        looked_up.append(torrent_id)
+        return httpx.Response(200, json=torrent(torrent_id, f"Stalled.Movie.{torrent_id}.2001.1080p", "downloading"))
+
+    monkeypatch.setattr(seerrbridge, "rd_api_request", rd_api_request)
+    asyncio.run(library._refresh_unfinished(time.time()))
+    assert len(looked_up) == library.UNFINISHED_PER_REFRESH
+
+    # The next pass starts with the torrents the previous one did not get to; failed ones are never looked up
+    first_pass = set(looked_up)
+    looked_up.clear()
+    asyncio.run(library._refresh_unfinished(time.time() + 1))
+    assert set(looked_up[:30 - len(first_pass)]) == {item["id"] for item in stalled} - first_pass
+    assert "DEAD" not in first_pass | set(looked_up)
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("[YTS.MX] Inception (2010) [1080p]", ("inception", 2010)),
+    ("www.Torrenting.com - Oceans.Eleven.2001.720p", ("oceans11", 2001)),
+    ("Ocean's Eleven (2001)", ("oceans11", 2001)),
+    ("Blade.Runner.2049.2017.1080p.BluRay.x264-SPARKS", ("bladerunner2049", 2017)),
+    ("1917.2019.2160p.WEB-DL", ("1917", 2019)),
+    ("2001.A.Space.Odyssey.1968.1080p", ("2001aspaceodyssey", 1968)),
+    ("Fast & Furious 2009 720p", ("fastandfurious", 2009)),
+    ("Some.Show.S01E01.1080p", (None, None)),
+])
+def test_parse_filename(seerrbridge, filename, expected):
+    assert seerrbridge.RealDebridLibrary.parse_filename(filename) == expected
+
+
+def test_find_matches_title_and_year_of_downloaded_torrents(library):
+    library._store([
+        torrent("INC", "Inception.2010.1080p.BluRay.x264"),
+        torrent("BR", "Blade.Runner.2049.2017.2160p.REMUX"),
+        torrent("HEAT", "Heat.1995.1080p", "downloading"),
+        torrent("OCEAN", "Oceans.Eleven.2001.720p"),
+    ], time.time())
+
+    assert library.find("Inception (2010)")["id"] == "INC"
+    assert library.find("Inception (2011)")["id"] == "INC"  # Release years are often off by one
+    assert library.find("Blade Runner 2049 (2017)")["id"] == "BR"
+    assert library.find("Ocean's Eleven (2001)")["id"] == "OCEAN"
+    assert library.find("Inception")["id"] == "INC"  # No year to compare
+
+
+@pytest.mark.parametrize("movie_title", [
+    "Inception (2012)",  # Two years off
+    "Inception 2 (2010)",  # Another title
+    "Blade Runner (1982)",  # Only a prefix of the indexed title
+    "Heat (1995)",  # Not downloaded yet
+    "Tenet (2020)",  # Not in the library
+])
+def test_find_misses(library, movie_title):
+    library._store([
+        torrent("INC", "Inception.2010.1080p.BluRay.x264"),
+        torrent("BR", "Blade.Runner.2049.2017.2160p.REMUX"),
+        torrent("HEAT", "Heat.1995.1080p", "downloading"),
+    ], time.time())
+    misses = library.misses
+    assert library.find(movie_title) is None
+    assert library.misses == misses + 1
@@ -0,0 +1,41 @@
+import pytest
+
+INCEPTION = {"title": "Inception", "year": 2010, "ids": {"imdb": "tt1375666"}}
+
+
+@pytest.fixture
+def cache(seerrbridge):
+    """A TraktCache with a one-hour TTL and room for two movies."""
+    with seerrbridge.db_lock:
+        seerrbridge.db.execute("DELETE FROM trakt_cache")
+    return seerrbridge.TraktCache(3600, 2)
+
+
+def shift(seerrbridge, tmdb_id, column, seconds):
+    with seerrbridge.db_lock:
+        seerrbridge.db.execute(f"UPDATE trakt_cache SET {column} = {column} - ? WHERE tmdb_id = ?", (seconds, str(tmdb_id)))
+
+
+def test_entries_expire_after_the_ttl(seerrbridge, cache):
+    cache.set(27205, INCEPTION)
+    assert cache.get(27205) == INCEPTION
+    assert cache.get("27205") == INCEPTION  # Overseerr and Trakt IDs may arrive as strings
+
+    shift(seerrbridge, 27205, "fetched_at", 3601)
+    assert cache.get(27205) is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_least_recently_used_entry_is_evicted(seerrbridge, cache):
+    cache.set(1, {"title": "One"})
+    cache.set(2, {"title": "Two"})
+    shift(seerrbridge, 1, "last_access", 20)
+    shift(seerrbridge, 2, "last_access", 10)
+    assert cache.get(1) == {"title": "One"}  # Now the most recently used
+
+    cache.set(3, {"title": "Three"})
+    assert cache.get(2) is None
+    assert cache.get(1) == {"title": "One"}
+    assert cache.get(3) == {"title": "Three"}
+    assert cache.stats()["size"] == 2
+    assert cache.evictions == 1